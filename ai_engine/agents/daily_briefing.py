@@ -1,12 +1,13 @@
 
 from typing import Dict, List
-from langchain_upstage import ChatUpstage
+from ai_engine.database.connector import get_chat_model
+from ai_engine.rag.model_router import get_site_model
 from langchain.prompts import ChatPromptTemplate
 from datetime import datetime
 
 class BriefingAgent:
     def __init__(self):
-        self.llm = ChatUpstage(model="solar-pro3", temperature=0.5)
+        self.llm = get_chat_model(get_site_model("briefing_agent", "solar-pro3"), temperature=0.5)
 
     def fetch_news(self) -> List[Dict]:
         """Fetch news from external sources (Mock for pilot)"""
@@ -1,11 +1,16 @@
 
-from typing import TypedDict, Dict, Annotated
+import asyncio
+from typing import TypedDict, Dict, Annotated, Optional, Tuple
 from langgraph.graph import StateGraph, END
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
 import operator
 
-from ai_engine.rag.retriever import HybridRetriever
+from ai_engine.rag.retriever import get_retriever
+from ai_engine.rag.async_retriever import get_async_retriever
 from ai_engine.rag.generator import IDRAGGenerator
+from ai_engine.rag.persona_cache import PersonaCache, CompiledPersona
+from ai_engine.rag.response_cache import get_response_cache
+from ai_engine.rag.conversation_memory import MemoryBlock, get_conversation_memory
 
 class AgentState(TypedDict):
     """Agent State Definition"""
@@ -19,8 +24,13 @@ class AgentState(TypedDict):
     next_agent: str
 
 # Initialize Components
-retriever = HybridRetriever()
+retriever = get_retriever()
+async_retriever = get_async_retriever()
 generator = IDRAGGenerator()
+# Semantic answer cache (Redis, or in-process); None when RESPONSE_CACHE_BACKEND=off
+response_cache = get_response_cache()
+# Bounded per-conversation history (recent turns + rolling summary)
+conversation_memory = get_conversation_memory()
 
 def concierge_agent(state: AgentState) -> Dict:
     """Concierge Agent: Routes based on intent"""
@@ -37,33 +47,121 @@ def operations_agent(state: AgentState) -> Dict:
     """Operations Agent: Mock booking logic"""
     return {"response": "일정 확인 후 예약을 도와드리겠습니다. (Operations Agent)"}
 
-def intelligence_agent(state: AgentState) -> Dict:
-    """Intelligence Agent: Real RAG execution"""
-    query = state['user_query']
-    # 0. Fetch Speaker & Persona
+# Used when no documents are found (e.g. empty DB)
+FALLBACK_CONTEXT = [{"content": "현재 지식 베이스에 관련 내용이 없습니다. 일반적인 AI 지식으로 답변합니다.", "metadata": {}}]
+
+def fetch_speaker(speaker_id) -> Optional[Tuple[str, Dict]]:
+    """Read Speaker name & persona config from the DB (None if the speaker does not exist)"""
     # Lazy import to avoid circular dep
     from backend.database.session import SessionLocal
     from backend.database.models import Speaker
     
     db = SessionLocal()
-    persona_config = {}
-    speaker_name = "Expert"
-    
     try:
-        speaker_id = state.get("speaker_id")
         speaker = db.query(Speaker).filter(Speaker.id == int(speaker_id)).first()
-        if speaker:
-            speaker_name = speaker.name
-            persona_config = speaker.persona_model or {} 
-            # Fallback if persona_model is empty but we know the name? 
-            # ideally the seeder fixes this.
-            if not persona_config:
-                 persona_config = {"name": speaker.name}
-    except Exception as e:
-        print(f"[Intelligence] DB Lookup failed: {e}")
+        if not speaker:
+            return None
+        persona_config = speaker.persona_model or {} 
+        # Fallback if persona_model is empty but we know the name? 
+        # ideally the seeder fixes this.
+        if not persona_config:
+             persona_config = {"name": speaker.name}
+        return speaker.name, persona_config
     finally:
         db.close()
 
+# Speaker row + rendered system prompt per speaker; invalidated on persona edits
+persona_cache = PersonaCache(fetch_speaker, generator.compile_persona)
+
+def load_speaker(speaker_id) -> CompiledPersona:
+    """Compiled persona for a speaker (DB lookup only on a cache miss)"""
+    return persona_cache.get(speaker_id)
+
+async def aload_speaker(speaker_id) -> CompiledPersona:
+    # Cache hits stay on the loop; misses run the sync SQLAlchemy lookup in a thread
+    return persona_cache.peek(speaker_id) or await asyncio.to_thread(persona_cache.get, speaker_id)
+
+def _log_cache_hit(persona: CompiledPersona, cached: Dict):
+    print(f"[ResponseCache] Hit for {persona.speaker_name} (similarity {cached['similarity']:.3f}): {cached['query']}")
+
+def knowledge_version(speaker_name: str) -> int:
+    """Version of the speaker's knowledge base (from the BM25 index ingest rewrites); part of the cache key"""
+    index = retriever.sparse_index.get()
+    return index.kb_version(speaker_name) if index is not None else 0
+
+async def aknowledge_version(speaker_name: str) -> int:
+    # Reloading the index after an ingest reads it from disk: off the loop
+    if retriever.sparse_index.needs_reload():
+        return await asyncio.to_thread(knowledge_version, speaker_name)
+    return knowledge_version(speaker_name)
+
+def lookup_cached_answer(query: str, persona: CompiledPersona) -> Optional[Dict]:
+    """Previously generated answer of this speaker to a near-identical question"""
+    if response_cache is None:
+        return None
+    try:
+        # Same cached query embedding the vector branch uses
+        vector = retriever.embed_query(query)
+    except Exception as e:
+        print(f"[ResponseCache] Embedding failed, skipping cache: {e}")
+        return None
+    cached = response_cache.lookup(persona.speaker_name, vector, knowledge_version(persona.speaker_name))
+    if cached:
+        _log_cache_hit(persona, cached)
+    return cached
+
+def remember_answer(query: str, persona: CompiledPersona, sources: list, response_text: str):
+    # Answers built on the empty-KB fallback are not worth replaying
+    if response_cache is None or sources == FALLBACK_CONTEXT:
+        return
+    try:
+        vector = retriever.embed_query(query)
+    except Exception as e:
+        print(f"[ResponseCache] Embedding failed, not caching: {e}")
+        return
+    response_cache.store(
+        persona.speaker_name, query, vector, response_text, sources, knowledge_version(persona.speaker_name)
+    )
+
+async def alookup_cached_answer(query: str, persona: CompiledPersona) -> Optional[Dict]:
+    if response_cache is None:
+        return None
+    try:
+        vector = await async_retriever.embed_query(query)
+    except Exception as e:
+        print(f"[ResponseCache] Embedding failed, skipping cache: {e}")
+        return None
+    kb_version = await aknowledge_version(persona.speaker_name)
+    cached = await response_cache.alookup(persona.speaker_name, vector, kb_version)
+    if cached:
+        _log_cache_hit(persona, cached)
+    return cached
+
+async def aremember_answer(query: str, persona: CompiledPersona, sources: list, response_text: str):
+    if response_cache is None or sources == FALLBACK_CONTEXT:
+        return
+    try:
+        vector = await async_retriever.embed_query(query)
+    except Exception as e:
+        print(f"[ResponseCache] Embedding failed, not caching: {e}")
+        return
+    kb_version = await aknowledge_version(persona.speaker_name)
+    await response_cache.astore(persona.speaker_name, query, vector, response_text, sources, kb_version)
+
+def intelligence_agent(state: AgentState) -> Dict:
+    """Intelligence Agent: Real RAG execution"""
+    query = state['user_query']
+    # Rolling summary + latest turns of this conversation (None for a first question)
+    memory = (state.get("context") or {}).get("memory")
+    # 0. Fetch Speaker & Persona
+    persona = load_speaker(state.get("speaker_id"))
+    speaker_name = persona.speaker_name
+
+    # Follow-ups depend on the conversation, so only first questions use the answer cache
+    cached = lookup_cached_answer(query, persona) if memory is None else None
+    if cached:
+        return {"response": cached["response"], "sources": cached["sources"]}
+
     print(f"[Intelligence] RAG for {speaker_name}...")
     
     # 1. Retrieve
@@ -77,19 +175,64 @@ def intelligence_agent(state: AgentState) -> Dict:
 
     # If no docs found (e.g. empty DB), provide fallback context
     if not retrieved_docs:
-        retrieved_docs = [{"content": "현재 지식 베이스에 관련 내용이 없습니다. 일반적인 AI 지식으로 답변합니다.", "metadata": {}}]
+        retrieved_docs = list(FALLBACK_CONTEXT)
 
     # 2. Generate
-    response_text = generator.generate_response(query, retrieved_docs, persona_config)
+    response_text = generator.generate_response(query, retrieved_docs, persona, memory)
+    if memory is None:
+        remember_answer(query, persona, retrieved_docs, response_text)
     
     return {"response": response_text, "sources": retrieved_docs}
 
-def create_workflow():
+async def aretrieve_context(query: str, speaker_id, memory: Optional[MemoryBlock] = None) -> Tuple[CompiledPersona, list, Optional[Dict]]:
+    """
+    Speaker persona + retrieved documents, without blocking the event loop.
+    On a response-cache hit, returns the cached sources and the cached entry
+    (whose "response" can be served as is); otherwise the entry is None.
+    The cache is skipped for follow-ups (memory is not None).
+    """
+    # 0. Fetch Speaker & Persona
+    persona = await aload_speaker(speaker_id)
+    speaker_name = persona.speaker_name
+
+    cached = await alookup_cached_answer(query, persona) if memory is None else None
+    if cached:
+        return persona, cached["sources"], cached
+
+    print(f"[Intelligence] Async RAG for {speaker_name}...")
+
+    # 1. Retrieve
+    try:
+        retrieved_docs = await async_retriever.hybrid_search(query, top_k=3, speaker_name=speaker_name)
+    except Exception as e:
+        print(f"Retrieval failed: {e}")
+        retrieved_docs = []
+
+    if not retrieved_docs:
+        retrieved_docs = list(FALLBACK_CONTEXT)
+    return persona, retrieved_docs, None
+
+async def async_intelligence_agent(state: AgentState) -> Dict:
+    """Intelligence Agent for ainvoke: retrieval and generation never block the event loop"""
+    query = state['user_query']
+    memory = (state.get("context") or {}).get("memory")
+    persona, retrieved_docs, cached = await aretrieve_context(query, state.get("speaker_id"), memory)
+    if cached:
+        return {"response": cached["response"], "sources": retrieved_docs}
+
+    # 2. Generate
+    response_text = await generator.agenerate_response(query, retrieved_docs, persona, memory)
+    if memory is None:
+        await aremember_answer(query, persona, retrieved_docs, response_text)
+
+    return {"response": response_text, "sources": retrieved_docs}
+
+def create_workflow(use_async: bool = False):
     workflow = StateGraph(AgentState)
 
     workflow.add_node("concierge", concierge_agent)
     workflow.add_node("operations", operations_agent)
-    workflow.add_node("intelligence", intelligence_agent)
+    workflow.add_node("intelligence", async_intelligence_agent if use_async else intelligence_agent)
 
     workflow.set_entry_point("concierge")
 
@@ -110,3 +253,5 @@ def create_workflow():
 
 # Global App Instance
 app = create_workflow()
+# Same graph for the FastAPI event loop (use with ainvoke)
+async_app = create_workflow(use_async=True)
@@ -2,7 +2,8 @@
 import os
 import json
 from typing import List, Dict, Any
-from langchain_upstage import ChatUpstage
+from ai_engine.database.connector import get_chat_model
+from ai_engine.rag.model_router import get_site_model
 from langchain_core.documents import Document
 from langchain.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
@@ -24,7 +25,7 @@ class GraphData(BaseModel):
 
 class GraphExtractor:
     def __init__(self):
-        self.llm = ChatUpstage(model="solar-pro3", temperature=0.0)
+        self.llm = get_chat_model(get_site_model("graph_extractor", "solar-pro3"), temperature=0.0)
         
     def extract_graph_from_chunk(self, chunk: Document) -> Dict[str, Any]:
         """
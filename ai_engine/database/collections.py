@@ -0,0 +1,143 @@
+import os
+from typing import Dict
+from qdrant_client.http import models
+
+SPEAKER_COLLECTION = "speaker_knowledge"
+EMBEDDING_DIM = 4096  # solar-embedding-1-large
+TENANT_FIELD = "speaker_name"  # every speaker is a tenant of the shared collection
+DEFAULT_TENANT = "General"  # ingest.py default speaker
+
+# Storage/search profiles for the 4096-d speaker_knowledge vectors.
+# float : originals in RAM, no quantization (~16 KB per chunk)
+# scalar: int8 copy in RAM (~4 KB per chunk), float originals on disk for rescoring
+# binary: 1-bit copy in RAM (~0.5 KB per chunk), float originals on disk for rescoring
+COLLECTION_PROFILES: Dict[str, Dict] = {
+    "float": {
+        "on_disk": False,
+        "quantization": None,
+        "oversampling": None,
+    },
+    "scalar": {
+        "on_disk": True,
+        "quantization": models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8,
+                quantile=0.99,
+                always_ram=True
+            )
+        ),
+        "oversampling": 2.0,
+    },
+    "binary": {
+        "on_disk": True,
+        "quantization": models.BinaryQuantization(
+            binary=models.BinaryQuantizationConfig(always_ram=True)
+        ),
+        "oversampling": 3.0,
+    },
+}
+
+# payload_m builds extra per-speaker HNSW links on top of the global graph,
+# so speaker-filtered searches stay fast while unfiltered ones (briefings) still work
+HNSW_CONFIG = models.HnswConfigDiff(m=16, ef_construct=100, payload_m=16, on_disk=False)
+HNSW_EF = int(os.getenv("QDRANT_HNSW_EF", "128"))
+
+def get_profile_name(profile: str = None) -> str:
+    name = (profile or os.getenv("QDRANT_COLLECTION_PROFILE", "scalar")).lower()
+    if name not in COLLECTION_PROFILES:
+        raise ValueError(f"Unknown collection profile '{name}'. Choose from {list(COLLECTION_PROFILES)}")
+    return name
+
+def create_collection(client, collection_name: str = SPEAKER_COLLECTION, profile: str = None):
+    """Create the collection with the given storage profile"""
+    config = COLLECTION_PROFILES[get_profile_name(profile)]
+    client.create_collection(
+        collection_name=collection_name,
+        vectors_config=models.VectorParams(
+            size=EMBEDDING_DIM,
+            distance=models.Distance.COSINE,
+            on_disk=config["on_disk"]
+        ),
+        hnsw_config=HNSW_CONFIG,
+        quantization_config=config["quantization"]
+    )
+
+def ensure_collection(client, collection_name: str = SPEAKER_COLLECTION, profile: str = None) -> bool:
+    """Create the collection if missing. Returns True if it was created."""
+    if client.collection_exists(collection_name):
+        return False
+    create_collection(client, collection_name, profile)
+    ensure_speaker_index(client, collection_name)
+    return True
+
+def ensure_speaker_index(client, collection_name: str = SPEAKER_COLLECTION):
+    """Keyword payload index on speaker_name, marked as the tenant key (idempotent)"""
+    try:
+        schema = models.KeywordIndexParams(type=models.KeywordIndexType.KEYWORD, is_tenant=True)
+        client.create_payload_index(collection_name, field_name=TENANT_FIELD, field_schema=schema, wait=True)
+    except Exception as e:
+        # Servers older than 1.11 reject is_tenant; a plain keyword index still avoids full scans
+        print(f"[Collections] Tenant index unavailable ({e}), using plain keyword index.")
+        client.create_payload_index(
+            collection_name, field_name=TENANT_FIELD, field_schema=models.PayloadSchemaType.KEYWORD, wait=True
+        )
+
+def migrate_speaker_partitioning(client, collection_name: str = SPEAKER_COLLECTION, batch_size: int = 256) -> int:
+    """
+    Bring an existing collection onto speaker partitioning:
+    assign legacy points without speaker_name to the default tenant,
+    build the tenant index and enable per-speaker HNSW links.
+    Returns the number of points that were backfilled.
+    """
+    missing = models.Filter(must=[models.IsEmptyCondition(is_empty=models.PayloadField(key=TENANT_FIELD))])
+    backfilled = 0
+    while True:
+        points, _ = client.scroll(
+            collection_name=collection_name,
+            scroll_filter=missing,
+            limit=batch_size,
+            with_payload=False,
+            with_vectors=False
+        )
+        if not points:
+            break
+        client.set_payload(
+            collection_name=collection_name,
+            payload={TENANT_FIELD: DEFAULT_TENANT},
+            points=[p.id for p in points],
+            wait=True
+        )
+        backfilled += len(points)
+
+    ensure_speaker_index(client, collection_name)
+    client.update_collection(collection_name=collection_name, hnsw_config=HNSW_CONFIG)
+    print(f"[Collections] '{collection_name}' partitioned by {TENANT_FIELD} ({backfilled} points backfilled).")
+    return backfilled
+
+def rebuild_collection(client, collection_name: str = SPEAKER_COLLECTION, profile: str = None):
+    """
+    Convert an existing collection to a profile in place.
+    Qdrant re-quantizes and moves vector storage in the background; points
+    stay searchable while the optimizer runs.
+    """
+    name = get_profile_name(profile)
+    config = COLLECTION_PROFILES[name]
+    client.update_collection(
+        collection_name=collection_name,
+        vectors_config={"": models.VectorParamsDiff(on_disk=config["on_disk"])},
+        hnsw_config=HNSW_CONFIG,
+        quantization_config=config["quantization"] or models.Disabled.DISABLED
+    )
+    print(f"[Collections] '{collection_name}' rebuild to profile '{name}' scheduled.")
+
+def search_params(profile: str = None) -> models.SearchParams:
+    """Search-time parameters: oversample the quantized index, then rescore with originals"""
+    config = COLLECTION_PROFILES[get_profile_name(profile)]
+    quantization = None
+    if config["quantization"] is not None:
+        quantization = models.QuantizationSearchParams(
+            ignore=False,
+            rescore=True,
+            oversampling=config["oversampling"]
+        )
+    return models.SearchParams(hnsw_ef=HNSW_EF, quantization=quantization)
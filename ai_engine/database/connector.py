@@ -1,20 +1,200 @@
-
 import os
-from qdrant_client import QdrantClient
-from neo4j import GraphDatabase
+import atexit
+import asyncio
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+import httpx
+from qdrant_client import QdrantClient, AsyncQdrantClient
+from neo4j import GraphDatabase, AsyncGraphDatabase
 from dotenv import load_dotenv
 
 load_dotenv()
 
-def get_qdrant_client():
-    """Get Qdrant Client"""
-    url = os.getenv("QDRANT_URL", "http://localhost:6333")
-    api_key = os.getenv("QDRANT_API_KEY", None)
-    return QdrantClient(url=url, api_key=api_key)
+# Process-wide registry: one pooled client per backend, created lazily.
+_clients: Dict[Hashable, Any] = {}
+_lock = threading.Lock()
 
-def get_neo4j_driver():
-    """Get Neo4j Driver"""
-    uri = os.getenv("NEO4J_URI", "bolt://localhost:7687")
+def _reset_after_fork():
+    """Forked workers must not reuse the parent's sockets; start with an empty registry."""
+    global _lock
+    _lock = threading.Lock()
+    _clients.clear()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+def _get_or_create(key: Hashable, factory: Callable[[], Any]) -> Any:
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = factory()
+                _clients[key] = client
+    return client
+
+def qdrant_prefers_grpc() -> bool:
+    """QDRANT_PREFER_GRPC=1 sends points/search traffic over gRPC (port 6334) instead of REST/JSON"""
+    return os.getenv("QDRANT_PREFER_GRPC", "false").lower() in ("1", "true", "yes")
+
+def fake_backends_enabled() -> bool:
+    """AI_FAKE_BACKENDS=1 swaps Upstage chat/embeddings for the offline stand-ins in fakes.py"""
+    return os.getenv("AI_FAKE_BACKENDS", "false").lower() in ("1", "true", "yes")
+
+def qdrant_in_memory() -> bool:
+    """QDRANT_URL=:memory: runs Qdrant embedded in this process (no server, no network)"""
+    return os.getenv("QDRANT_URL") == ":memory:"
+
+def _qdrant_params(prefer_grpc: bool = None) -> Dict[str, Any]:
+    if qdrant_in_memory():
+        return {"location": ":memory:"}
+    if prefer_grpc is None:
+        prefer_grpc = qdrant_prefers_grpc()
+    # Keep-alive pool: qdrant-client disables keep-alive for localhost by default
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("QDRANT_MAX_CONNECTIONS", "50")),
+        max_keepalive_connections=int(os.getenv("QDRANT_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("QDRANT_KEEPALIVE_EXPIRY", "30")),
+    )
+    return {
+        "url": os.getenv("QDRANT_URL", "http://localhost:6333"),
+        "api_key": os.getenv("QDRANT_API_KEY", None),
+        "timeout": int(os.getenv("QDRANT_TIMEOUT", "10")),
+        "prefer_grpc": prefer_grpc,
+        "grpc_port": int(os.getenv("QDRANT_GRPC_PORT", "6334")),
+        "limits": limits,
+    }
+
+def create_qdrant_client(prefer_grpc: bool = None) -> QdrantClient:
+    """Build a new Qdrant Client (prefer get_qdrant_client for the shared one)"""
+    return QdrantClient(**_qdrant_params(prefer_grpc))
+
+def get_qdrant_client(prefer_grpc: bool = None) -> QdrantClient:
+    """Get the shared Qdrant Client (transport from QDRANT_PREFER_GRPC unless given)"""
+    if qdrant_in_memory():
+        # One embedded store per process, whatever the transport preference
+        return _get_or_create(("qdrant", ":memory:"), create_qdrant_client)
+    if prefer_grpc is None:
+        prefer_grpc = qdrant_prefers_grpc()
+    return _get_or_create(("qdrant", prefer_grpc), lambda: create_qdrant_client(prefer_grpc))
+
+def _neo4j_params() -> Dict[str, Any]:
     user = os.getenv("NEO4J_USERNAME", "neo4j")
     password = os.getenv("NEO4J_PASSWORD", "password") # Default from docker-compose
-    return GraphDatabase.driver(uri, auth=(user, password))
+    return {
+        "uri": os.getenv("NEO4J_URI", "bolt://localhost:7687"),
+        "auth": (user, password),
+        "max_connection_pool_size": int(os.getenv("NEO4J_MAX_POOL_SIZE", "50")),
+        "connection_acquisition_timeout": float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "10")),
+        "max_connection_lifetime": float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600")),
+        "keep_alive": True,
+    }
+
+def neo4j_disabled() -> bool:
+    """NEO4J_URI=disabled turns the graph branch off (offline runs / load tests)"""
+    return os.getenv("NEO4J_URI") == "disabled"
+
+def create_neo4j_driver():
+    """Build a new Neo4j Driver (prefer get_neo4j_driver for the shared one)"""
+    if neo4j_disabled():
+        raise RuntimeError("Neo4j disabled (NEO4J_URI=disabled)")
+    return GraphDatabase.driver(**_neo4j_params())
+
+def get_neo4j_driver():
+    """Get the shared Neo4j Driver"""
+    return _get_or_create("neo4j", create_neo4j_driver)
+
+class _InMemoryAsyncQdrant:
+    """Awaitable view of the shared in-memory QdrantClient (local mode is CPU-only)"""
+
+    def __init__(self, client: QdrantClient):
+        self._client = client
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+        async def call(*args, **kwargs):
+            return attr(*args, **kwargs)
+        return call
+
+# Async clients hold loop-bound connection pools, so they are shared per event loop.
+def get_async_qdrant_client(prefer_grpc: bool = None) -> AsyncQdrantClient:
+    """Get the shared AsyncQdrantClient for the running event loop"""
+    if qdrant_in_memory():
+        # AsyncQdrantClient(":memory:") would be a separate, empty store
+        return _get_or_create(("async_qdrant", ":memory:"), lambda: _InMemoryAsyncQdrant(get_qdrant_client()))
+    if prefer_grpc is None:
+        prefer_grpc = qdrant_prefers_grpc()
+    loop_id = id(asyncio.get_running_loop())
+    return _get_or_create(
+        ("async_qdrant", prefer_grpc, loop_id),
+        lambda: AsyncQdrantClient(**_qdrant_params(prefer_grpc))
+    )
+
+def get_async_neo4j_driver():
+    """Get the shared async Neo4j Driver for the running event loop"""
+    if neo4j_disabled():
+        raise RuntimeError("Neo4j disabled (NEO4J_URI=disabled)")
+    loop_id = id(asyncio.get_running_loop())
+    return _get_or_create(("async_neo4j", loop_id), lambda: AsyncGraphDatabase.driver(**_neo4j_params()))
+
+def get_redis_client():
+    """Get the shared Redis client (REDIS_URL, docker-compose service by default)"""
+    def factory():
+        import redis
+        return redis.Redis.from_url(
+            os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+            socket_timeout=float(os.getenv("REDIS_TIMEOUT", "0.5")),
+            socket_connect_timeout=float(os.getenv("REDIS_TIMEOUT", "0.5"))
+        )
+    return _get_or_create("redis", factory)
+
+def get_chat_model(model: str, temperature: float = 0.0):
+    """Get a shared ChatUpstage client for (model, temperature)"""
+    def factory():
+        if fake_backends_enabled():
+            from ai_engine.database.fakes import FakeChatModel
+            return FakeChatModel(model_name=model, temperature=temperature)
+        from langchain_upstage import ChatUpstage
+        return ChatUpstage(model=model, temperature=temperature)
+    return _get_or_create(("chat", model, temperature), factory)
+
+def get_embeddings(model: str = "solar-embedding-1-large"):
+    """Get a shared UpstageEmbeddings client"""
+    def factory():
+        if fake_backends_enabled():
+            from ai_engine.database.fakes import FakeEmbeddings
+            return FakeEmbeddings(model=model)
+        from langchain_upstage import UpstageEmbeddings
+        return UpstageEmbeddings(model=model)
+    return _get_or_create(("embeddings", model), factory)
+
+async def aclose_clients():
+    """Close async clients (must run on their event loop), then the sync ones"""
+    with _lock:
+        async_keys = [key for key in _clients if isinstance(key, tuple) and str(key[0]).startswith("async_")]
+        async_clients = [_clients.pop(key) for key in async_keys]
+    for client in async_clients:
+        try:
+            await client.close()
+        except Exception as e:
+            print(f"[Connector] Failed to close {type(client).__name__}: {e}")
+    close_clients()
+
+def close_clients():
+    """Close every pooled sync client (app shutdown / interpreter exit)"""
+    with _lock:
+        keys = [key for key in _clients if not (isinstance(key, tuple) and str(key[0]).startswith("async_"))]
+        clients = [_clients.pop(key) for key in keys]
+    for client in clients:
+        try:
+            if hasattr(client, "close"):
+                client.close()
+            elif getattr(client, "root_client", None) is not None:
+                client.root_client.close()
+        except Exception as e:
+            print(f"[Connector] Failed to close {type(client).__name__}: {e}")
+
+atexit.register(close_clients)
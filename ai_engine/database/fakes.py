@@ -0,0 +1,205 @@
+"""
+Offline stand-ins for ChatUpstage and UpstageEmbeddings (AI_FAKE_BACKENDS=1).
+
+Embeddings are deterministic feature-hashed character bigrams, so similar
+texts land close together and retrieval / caching behave realistically.
+Completions are templated from the prompt. Both sleep for a latency drawn
+from a configurable distribution, e.g.
+
+    FAKE_LLM_LATENCY_MS=lognormal:2500:0.4          (median ms, sigma)
+    FAKE_LLM_LATENCY_MS_SOLAR_MINI=lognormal:700:0.3
+    FAKE_EMBEDDING_LATENCY_MS=uniform:60:150
+    FAKE_LLM_TTFT_RATIO=0.25                        (share of latency before the first token)
+"""
+import os
+import json
+import math
+import time
+import random
+import asyncio
+import hashlib
+import threading
+import unicodedata
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+_DEFAULT_LLM_LATENCY = {
+    "solar-mini": "lognormal:700:0.3",
+    "solar-pro3": "lognormal:2500:0.4",
+}
+
+_rng = random.Random(int(os.getenv("FAKE_SEED", "42")))
+_rng_lock = threading.Lock()
+
+class LatencyDistribution:
+    """fixed:MS | uniform:LOW:HIGH | normal:MEAN:STD | lognormal:MEDIAN:SIGMA (milliseconds)"""
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        kind, *params = spec.split(":")
+        self.kind = kind.lower()
+        self.params = [float(p) for p in params]
+        if self.kind not in ("fixed", "uniform", "normal", "lognormal"):
+            raise ValueError(f"Unknown latency distribution '{spec}'")
+
+    def sample(self) -> float:
+        """One latency in seconds"""
+        with _rng_lock:
+            if self.kind == "fixed":
+                ms = self.params[0]
+            elif self.kind == "uniform":
+                ms = _rng.uniform(self.params[0], self.params[1])
+            elif self.kind == "normal":
+                ms = _rng.gauss(self.params[0], self.params[1])
+            else:
+                ms = _rng.lognormvariate(math.log(self.params[0]), self.params[1])
+        return max(ms, 0.0) / 1000
+
+def llm_latency(model: str) -> LatencyDistribution:
+    key = "FAKE_LLM_LATENCY_MS_" + model.upper().replace("-", "_")
+    spec = os.getenv(key) or os.getenv("FAKE_LLM_LATENCY_MS") or _DEFAULT_LLM_LATENCY.get(model, "lognormal:1500:0.4")
+    return LatencyDistribution(spec)
+
+def _digest(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+class FakeEmbeddings(Embeddings):
+    """Deterministic hash-based vectors with the same dimension as solar-embedding-1-large"""
+
+    def __init__(self, model: str = "solar-embedding-1-large", dim: int = 4096, latency: str = None):
+        self.model = model
+        self.dim = dim
+        self.latency = LatencyDistribution(latency or os.getenv("FAKE_EMBEDDING_LATENCY_MS", "lognormal:120:0.3"))
+
+    def _vector(self, text: str) -> List[float]:
+        text = unicodedata.normalize("NFKC", text).casefold()
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for i in range(len(text) - 1):
+            h = _digest(text[i:i + 2])
+            vector[h % self.dim] += 1.0 if (h >> 32) & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            vector = np.random.default_rng(_digest(text)).standard_normal(self.dim).astype(np.float32)
+            norm = np.linalg.norm(vector)
+        return (vector / norm).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        time.sleep(self.latency.sample())
+        return self._vector(text)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        time.sleep(self.latency.sample())
+        return [self._vector(text) for text in texts]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        await asyncio.sleep(self.latency.sample())
+        return self._vector(text)
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        await asyncio.sleep(self.latency.sample())
+        return [self._vector(text) for text in texts]
+
+_PERSONA_SENTENCES = [
+    "본질을 먼저 물어야 합니다. 무엇을 할 수 있는가보다 무엇을 해야 하는가가 중요합니다.",
+    "규모의 법칙이 작동하는 시장에서는 속도보다 방향이 경쟁력을 결정합니다.",
+    "데이터 주권은 곧 디지털 영토의 문제입니다.",
+    "비즈니스 관점에서 보면, 실질적인 가치가 검증되지 않은 기술은 거품이 되기 쉽습니다.",
+    "규제는 혁신의 적이 아니라 신뢰를 만드는 인프라입니다.",
+    "우리가 주목해야 할 점은 기술 자체보다 그것을 운영할 조직의 역량입니다.",
+]
+
+class FakeChatModel(BaseChatModel):
+    """Templated completions with simulated upstream latency (sync, async and streaming)"""
+
+    model_name: str = "solar-pro3"
+    temperature: float = 0.0
+    response_chars: int = int(os.getenv("FAKE_LLM_RESPONSE_CHARS", "600"))
+    ttft_ratio: float = float(os.getenv("FAKE_LLM_TTFT_RATIO", "0.25"))
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-upstage"
+
+    def _complete(self, messages: List[BaseMessage]) -> str:
+        prompt = "\n".join(str(m.content) for m in messages)
+        question = str(messages[-1].content).strip() if messages else ""
+
+        if '"executive_summary"' in prompt:
+            return json.dumps(_fake_briefing(), ensure_ascii=False)
+        if '"entities"' in prompt and '"relations"' in prompt:
+            return json.dumps({"entities": [], "relations": []})
+        if "relevance judge" in prompt:
+            return "0"
+
+        seed = _digest(question)
+        lines = [f"[{self.model_name}] {question.splitlines()[-1][:80] if question else ''}"]
+        i = 0
+        while sum(len(line) for line in lines) < self.response_chars:
+            lines.append(_PERSONA_SENTENCES[(seed + i) % len(_PERSONA_SENTENCES)])
+            i += 1
+        lines.append("이 변화 앞에서 우리는 무엇을 먼저 준비해야 할까요?")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _pieces(text: str, size: int = 4) -> List[str]:
+        return [text[i:i + size] for i in range(0, len(text), size)]
+
+    def _result(self, text: str) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs) -> ChatResult:
+        time.sleep(llm_latency(self.model_name).sample())
+        return self._result(self._complete(messages))
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs) -> ChatResult:
+        await asyncio.sleep(llm_latency(self.model_name).sample())
+        return self._result(self._complete(messages))
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        total = llm_latency(self.model_name).sample()
+        pieces = self._pieces(self._complete(messages))
+        time.sleep(total * self.ttft_ratio)
+        for piece in pieces:
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece))
+            time.sleep(total * (1 - self.ttft_ratio) / len(pieces))
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        total = llm_latency(self.model_name).sample()
+        pieces = self._pieces(self._complete(messages))
+        await asyncio.sleep(total * self.ttft_ratio)
+        for piece in pieces:
+            yield ChatGenerationChunk(message=AIMessageChunk(content=piece))
+            await asyncio.sleep(total * (1 - self.ttft_ratio) / len(pieces))
+
+def _fake_briefing() -> dict:
+    today = date.today().isoformat()
+    return {
+        "date": today,
+        "executive_summary": [{
+            "title": "AI 인프라 투자 가속",
+            "impact": "전력 수요 증가",
+            "urgency": "high",
+            "what": "데이터센터 증설이 이어지고 있습니다.",
+            "so_what": "전력망 확보가 경쟁력이 됩니다.",
+            "now_what": "장기 전력 계약을 검토하십시오."
+        }],
+        "top_news": [{
+            "news_id": "fake_001",
+            "title": "소버린 AI 전략 발표",
+            "source": "Internal Knowledge Base",
+            "published_at": datetime.now().isoformat(),
+            "what": "정부가 소버린 AI 로드맵을 발표했습니다.",
+            "so_what": "국내 모델 생태계가 확대됩니다.",
+            "now_what": "파트너십 기회를 점검하십시오.",
+            "expert_view": {"expert_name": "박태웅", "comment": "본질에 집중해야 할 때입니다."},
+            "relevance_score": 0.9
+        }],
+        "watch_list": [{"title": "AI 기본법 시행령", "summary": "하위 법령 논의가 진행 중입니다."}],
+        "recommendations": [{"type": "report", "title": "AI 규제 동향", "date": today, "url": "https://example.com"}]
+    }
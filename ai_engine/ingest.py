@@ -8,8 +8,10 @@ from dotenv import load_dotenv
 from ai_engine.data_collection.loader import UpstageDocumentLoader
 from ai_engine.data_collection.chunker import ContentChunker
 from ai_engine.data_collection.graph_extractor import GraphExtractor
-from ai_engine.database.connector import get_qdrant_client, get_neo4j_driver
-from langchain_upstage import UpstageEmbeddings
+from ai_engine.database.connector import get_qdrant_client, get_neo4j_driver, get_embeddings
+from ai_engine.database.collections import SPEAKER_COLLECTION, ensure_collection, ensure_speaker_index, get_profile_name
+from ai_engine.rag.sparse_index import SparseIndex
+from ai_engine.rag.response_cache import get_response_cache
 
 # Load env
 load_dotenv()
@@ -65,10 +67,10 @@ async def ingest_document(file_path: str, speaker_name: str = "General"):
     # Initialize Clients
     qdrant = get_qdrant_client()
     neo4j = get_neo4j_driver()
-    embeddings = UpstageEmbeddings(model="solar-embedding-1-large")
+    embeddings = get_embeddings("solar-embedding-1-large")
     graph_extractor = GraphExtractor()
     
-    collection_name = "speaker_knowledge"
+    collection_name = SPEAKER_COLLECTION
     
     # Vector Indexing (Batch)
     print("[Ingest] Indexing Vectors in Qdrant...")
@@ -78,19 +80,16 @@ async def ingest_document(file_path: str, speaker_name: str = "General"):
     import uuid
     from qdrant_client.http import models
     
-    # Ensure collection exists
+    # Ensure collection exists (storage profile from QDRANT_COLLECTION_PROFILE)
     try:
-        qdrant.create_collection(
-            collection_name=collection_name,
-            vectors_config=models.VectorParams(size=4096, distance=models.Distance.COSINE) # Solar Embedding size
-        )
-        print(f"[Ingest] Created collection '{collection_name}'")
-    except Exception as e:
-        # Check if error is 'Collection already exists' (409 Conflict)
-        if "already exists" in str(e) or "409" in str(e):
-            print(f"[Ingest] Collection '{collection_name}' already exists. Proceeding...")
+        if ensure_collection(qdrant, collection_name):
+            print(f"[Ingest] Created collection '{collection_name}' ({get_profile_name()} profile)")
         else:
-            print(f"[Ingest] Warning: Failed to create collection (might exist): {e}")
+            print(f"[Ingest] Collection '{collection_name}' already exists. Proceeding...")
+            # Speaker-scoped searches rely on this index; older collections may lack it
+            ensure_speaker_index(qdrant, collection_name)
+    except Exception as e:
+        print(f"[Ingest] Warning: Failed to create collection (might exist): {e}")
 
     for i, chunk in enumerate(chunks):
         try:
@@ -120,6 +119,25 @@ async def ingest_document(file_path: str, speaker_name: str = "General"):
             points=points
         )
         print(f"[Ingest] Successfully indexed {len(points)} vectors for {speaker_name}.")
+
+        # Sparse Indexing (BM25 over the same chunks, persisted locally)
+        sparse_index = SparseIndex.load() or SparseIndex()
+        sparse_index.add_documents([point.payload for point in points])
+        sparse_index.save()
+        print(f"[Ingest] Sparse index now holds {len(sparse_index)} chunks.")
+
+        # Cached answers for this speaker were built from the old knowledge base.
+        # The sparse index save above bumped the speaker's knowledge-base version, which
+        # is part of every cache entry, so servers skip stale answers on their own;
+        # clearing the shared Redis entries as well just frees them early.
+        response_cache = get_response_cache()
+        if response_cache is not None:
+            if response_cache.backend.name == "redis":
+                response_cache.invalidate_speaker(speaker_name)
+                print(f"[Ingest] Cleared cached answers for {speaker_name} (redis backend).")
+            else:
+                print(f"[Ingest] Response cache is in-memory in this process and cannot reach the server's cache; "
+                      f"stale answers for {speaker_name} are skipped by knowledge-base version instead.")
         
     print("=== Ingestion Complete ===")
 
@@ -127,6 +145,10 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Ingest documents into AI Engine")
     parser.add_argument("--file", type=str, required=True, help="Path to document")
     parser.add_argument("--speaker", type=str, default="General", help="Speaker Name for Metadata filtering")
+    parser.add_argument("--grpc", action="store_true", help="Upsert vectors over gRPC (same as QDRANT_PREFER_GRPC=1)")
     args = parser.parse_args()
+
+    if args.grpc:
+        os.environ["QDRANT_PREFER_GRPC"] = "1"
     
     asyncio.run(ingest_document(args.file, args.speaker))
@@ -0,0 +1,185 @@
+
+import asyncio
+import threading
+from typing import List, Dict
+
+from ai_engine.database.connector import get_async_qdrant_client, get_async_neo4j_driver
+from ai_engine.database.collections import search_params
+from ai_engine.rag.retriever import (
+    HybridRetriever,
+    get_retriever,
+    build_fulltext_query,
+    rrf_fuse,
+    CONCEPT_FULLTEXT_INDEX,
+    GRAPH_SEARCH_CYPHER,
+    VECTOR_TIMEOUT,
+    GRAPH_TIMEOUT,
+    SPARSE_TIMEOUT,
+)
+
+# Rerankers that are pure local arithmetic stay on the event loop;
+# model-backed ones (cross-encoder, LLM judge) are pushed to a thread.
+_INLINE_RERANKERS = ("none", "fusion")
+
+_shared_async_retriever = None
+_shared_async_retriever_lock = threading.Lock()
+
+class AsyncHybridRetriever:
+    """
+    Async twin of HybridRetriever for the FastAPI event loop.
+    Network calls go through AsyncQdrantClient, the async Neo4j driver and
+    async embeddings; local state (concept matcher, BM25 index, embedding
+    cache, offline index, reranker) is shared with the sync retriever.
+    """
+
+    def __init__(self, base: HybridRetriever = None):
+        self.base = base or get_retriever()
+
+    def _qdrant(self):
+        # Clients are bound to the running loop, so resolve them per call
+        if not self.base.qdrant_available:
+            return None
+        try:
+            return get_async_qdrant_client()
+        except Exception as e:
+            print(f"Warning: Async Qdrant not available: {e}")
+            return None
+
+    def _neo4j(self):
+        if not self.base.neo4j_available:
+            return None
+        try:
+            return get_async_neo4j_driver()
+        except Exception as e:
+            print(f"Warning: Async Neo4j not available: {e}")
+            return None
+
+    async def embed_query(self, query: str) -> List[float]:
+        """Embed a query without blocking the loop, sharing the sync embedding cache"""
+        base = self.base
+        vector = base.embedding_cache.get(query, base.embedding_model)
+        if vector is None:
+            vector = await base.embeddings.aembed_query(query)
+            base.embedding_cache.put(query, base.embedding_model, vector)
+        return vector
+
+    async def vector_search(self, query: str, top_k: int = 5, speaker_name: str = None) -> List[Dict]:
+        """Search in Vector DB (AsyncQdrantClient), falling back to the local index if it is down"""
+        base = self.base
+        qdrant = self._qdrant()
+        # The local fallback parses its export on first use and scans by brute force:
+        # everything touching it runs in a thread, never on the loop
+        if qdrant is None and await asyncio.to_thread(base._get_local_index) is None:
+            print("Vector DB unused (Offline Mode)")
+            return []
+
+        try:
+            vector = await self.embed_query(query)
+        except Exception as e:
+            print(f"Embedding failed: {e}")
+            return []
+
+        if qdrant is None:
+            return await asyncio.to_thread(base._local_vector_search, vector, top_k, speaker_name)
+
+        try:
+            results = await qdrant.search(
+                collection_name=base.collection_name,
+                query_vector=vector,
+                query_filter=base._speaker_filter(speaker_name),
+                search_params=search_params(base.collection_profile),
+                limit=top_k
+            )
+        except Exception as e:
+            print(f"Qdrant search failed, using local vector index: {e}")
+            return await asyncio.to_thread(base._local_vector_search, vector, top_k, speaker_name)
+
+        return base._vector_hits(results)
+
+    async def sparse_search(self, query: str, top_k: int = 5, speaker_name: str = None) -> List[Dict]:
+        """
+        BM25 lookup on a loaded index is in-memory and sub-millisecond, so it
+        runs inline; (re)loading the index after an ingest reads it from disk
+        and goes to a thread.
+        """
+        if self.base.sparse_index.needs_reload():
+            return await asyncio.to_thread(self.base.sparse_search, query, top_k, speaker_name)
+        return self.base.sparse_search(query, top_k, speaker_name)
+
+    async def graph_search(self, query: str, top_k: int = 5, speaker_name: str = None) -> List[Dict]:
+        """Search in Knowledge Graph (async Neo4j driver)"""
+        driver = self._neo4j()
+        if driver is None:
+            return []
+
+        keywords = self.base.concept_matcher.match(query)
+        lucene_query = build_fulltext_query(keywords, query)
+        if not lucene_query:
+            return []
+
+        results = []
+        try:
+            async with driver.session() as session:
+                graph_data = await session.run(
+                    GRAPH_SEARCH_CYPHER,
+                    index=CONCEPT_FULLTEXT_INDEX,
+                    lucene_query=lucene_query,
+                    limit=top_k
+                )
+                async for record in graph_data:
+                    results.append(self.base._graph_hit(record))
+        except Exception as e:
+            print(f"Graph search failed (run ai_engine/setup_neo4j.py to create '{CONCEPT_FULLTEXT_INDEX}'): {e}")
+
+        return results
+
+    async def _run_branches(self, branches: Dict[str, tuple]) -> Dict[str, List[Dict]]:
+        """
+        Await retrieval branches concurrently, each with its own deadline.
+        branches: {name: (coroutine, timeout)}. A branch that errors or misses
+        its deadline yields no entry, so it simply drops out of fusion.
+        """
+        names = list(branches)
+        outcomes = await asyncio.gather(
+            *(asyncio.wait_for(coro, timeout) for coro, timeout in branches.values()),
+            return_exceptions=True
+        )
+
+        results = {}
+        for name, outcome in zip(names, outcomes):
+            if isinstance(outcome, asyncio.TimeoutError):
+                print(f"[AsyncRetriever] {name} branch missed {branches[name][1]}s deadline, skipping")
+            elif isinstance(outcome, BaseException):
+                print(f"[AsyncRetriever] {name} branch failed: {outcome}")
+            else:
+                results[name] = outcome
+        return results
+
+    async def hybrid_search(self, query: str, top_k: int = 5, speaker_name: str = None) -> List[Dict]:
+        """Combine Vector, Sparse (BM25) and Graph Search using RRF"""
+        branch_results = await self._run_branches({
+            "vector": (self.vector_search(query, top_k, speaker_name), VECTOR_TIMEOUT),
+            "sparse": (self.sparse_search(query, top_k, speaker_name), SPARSE_TIMEOUT),
+            "graph": (self.graph_search(query, top_k, speaker_name), GRAPH_TIMEOUT),
+        })
+        top_results = rrf_fuse([
+            branch_results.get("vector", []),
+            branch_results.get("sparse", []),
+            branch_results.get("graph", []),
+        ], top_k)
+        return await self.rerank(query, top_results)
+
+    async def rerank(self, query: str, results: List[Dict]) -> List[Dict]:
+        """Rerank results; model-backed rerankers run off the event loop"""
+        if self.base.reranker.name in _INLINE_RERANKERS:
+            return self.base.rerank(query, results)
+        return await asyncio.to_thread(self.base.rerank, query, results)
+
+def get_async_retriever() -> AsyncHybridRetriever:
+    """Get the process-wide AsyncHybridRetriever (created on first use)"""
+    global _shared_async_retriever
+    if _shared_async_retriever is None:
+        with _shared_async_retriever_lock:
+            if _shared_async_retriever is None:
+                _shared_async_retriever = AsyncHybridRetriever()
+    return _shared_async_retriever
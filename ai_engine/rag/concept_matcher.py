@@ -0,0 +1,141 @@
+import os
+import re
+import time
+import threading
+import unicodedata
+from collections import deque
+from typing import Dict, List, Optional
+
+_STRIP_PATTERN = re.compile(r"[\s\W_]+", re.UNICODE)
+
+def normalize_text(text: str) -> str:
+    """
+    Korean-aware normalization for matching.
+    NFKC folds full-width/compatibility jamo, casefold handles Latin terms,
+    and whitespace/punctuation are dropped so '인공 지능' matches '인공지능'.
+    """
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    return _STRIP_PATTERN.sub("", text)
+
+class AhoCorasick:
+    """Minimal Aho-Corasick automaton over normalized strings"""
+
+    def __init__(self, patterns: Dict[str, str]):
+        # patterns: normalized pattern -> original concept name
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[str]] = [[]]
+
+        for pattern, original in patterns.items():
+            node = 0
+            for ch in pattern:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                node = nxt
+            self.output[node].append(original)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self.goto[node].items():
+                queue.append(nxt)
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.output[nxt] = self.output[nxt] + self.output[self.fail[nxt]]
+
+    def find(self, text: str) -> List[str]:
+        node = 0
+        found = []
+        for ch in text:
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            if self.output[node]:
+                found.extend(self.output[node])
+        return found
+
+class ConceptMatcher:
+    """
+    In-memory matcher for Concept node names in the knowledge graph.
+
+    Names are loaded from Neo4j once, compiled into an Aho-Corasick
+    automaton and refreshed in the background, so keyword extraction on
+    the chat path is a local scan with no network call. Concepts are
+    written to the graph outside this process, so new ones are picked up
+    by the periodic refresh (CONCEPT_MATCHER_REFRESH seconds).
+    """
+
+    def __init__(self, driver, refresh_interval: float = None, min_length: int = 2):
+        # A driver, or a callable returning one (resolved per refresh, e.g. get_neo4j_driver)
+        self._driver = driver
+        self.refresh_interval = refresh_interval if refresh_interval is not None else float(
+            os.getenv("CONCEPT_MATCHER_REFRESH", "300")
+        )
+        self.min_length = min_length
+        self._automaton: Optional[AhoCorasick] = None
+        self._names: frozenset = frozenset()
+        self._loaded_at = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    @property
+    def driver(self):
+        return self._driver() if callable(self._driver) else self._driver
+
+    @property
+    def ready(self) -> bool:
+        return self._automaton is not None
+
+    def _fetch_names(self) -> List[str]:
+        with self.driver.session() as session:
+            records = session.run("MATCH (c:Concept) WHERE c.name IS NOT NULL RETURN c.name AS name")
+            return [record["name"] for record in records]
+
+    def refresh(self):
+        """Reload Concept names and rebuild the automaton if they changed"""
+        try:
+            names = frozenset(self._fetch_names())
+            if names != self._names or self._automaton is None:
+                patterns = {}
+                for name in names:
+                    key = normalize_text(name)
+                    if len(key) >= self.min_length:
+                        patterns[key] = name
+                automaton = AhoCorasick(patterns)
+                with self._lock:
+                    self._automaton = automaton
+                    self._names = names
+                print(f"[ConceptMatcher] Loaded {len(patterns)} concept patterns")
+        except Exception as e:
+            print(f"[ConceptMatcher] Refresh failed: {e}")
+        finally:
+            # Failed loads also wait out the interval instead of retrying per query
+            self._loaded_at = time.monotonic()
+            self._refreshing = False
+
+    def refresh_async(self):
+        """Kick off a background refresh unless one is already running"""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self.refresh, name="concept-matcher-refresh", daemon=True).start()
+
+    def match(self, query: str) -> List[str]:
+        """Return concept names found in the query, longest first"""
+        if time.monotonic() - self._loaded_at > self.refresh_interval:
+            self.refresh_async()
+
+        automaton = self._automaton
+        if automaton is None:
+            return []
+
+        found = set(automaton.find(normalize_text(query)))
+        return sorted(found, key=lambda name: len(normalize_text(name)), reverse=True)
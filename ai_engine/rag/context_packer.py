@@ -0,0 +1,187 @@
+import os
+import math
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from ai_engine.rag.reranker import char_ngrams
+
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "2000"))
+# Matches chunk_overlap in ai_engine/data_collection/chunker.py
+CONTEXT_OVERLAP_CHARS = int(os.getenv("CONTEXT_OVERLAP_CHARS", "200"))
+CONTEXT_DUPLICATE_THRESHOLD = float(os.getenv("CONTEXT_DUPLICATE_THRESHOLD", "0.85"))
+
+_HANGUL = re.compile(r"[가-힣]")
+
+def estimate_tokens(text: str) -> int:
+    """Rough Solar token count when the tokenizer is unavailable (Hangul ~1.5 chars/token, Latin ~4)"""
+    hangul = len(_HANGUL.findall(text))
+    return math.ceil(hangul / 1.5 + (len(text) - hangul) / 4)
+
+class TokenCounter:
+    """
+    Counts tokens with the chat model's own tokenizer.
+    The tokenizer is fetched once, in the background (it may have to be
+    downloaded); until it is ready, or if it cannot be loaded, counts are estimated.
+    """
+
+    def __init__(self, llm=None):
+        self.llm = llm
+        self.tokenizer = None
+        self._loading = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            self.tokenizer = self.llm._get_tokenizer()
+        except Exception as e:
+            print(f"[ContextPacker] Tokenizer for {getattr(self.llm, 'model_name', '?')} unavailable, estimating tokens: {e}")
+
+    def __call__(self, text: str) -> int:
+        tokenizer = self.tokenizer
+        if tokenizer is not None:
+            return len(tokenizer.encode(text, add_special_tokens=False).ids)
+        if not self._loading and hasattr(self.llm, "_get_tokenizer"):
+            with self._lock:
+                if not self._loading:
+                    self._loading = True
+                    threading.Thread(target=self._load, daemon=True, name="tokenizer-load").start()
+        return estimate_tokens(text)
+
+_token_counters: Dict[str, TokenCounter] = {}
+
+def get_token_counter(llm=None) -> Callable[[str], int]:
+    """Shared TokenCounter per chat model (ChatUpstage.get_num_tokens reloads its tokenizer on every call)"""
+    key = getattr(llm, "model_name", None) or "estimate"
+    if key not in _token_counters:
+        _token_counters[key] = TokenCounter(llm)
+    return _token_counters[key]
+
+def overlap_length(left: str, right: str, max_chars: int, min_chars: int = 20) -> int:
+    """Length of the longest suffix of `left` that is also a prefix of `right`"""
+    window = left[-max_chars:]
+    probe = right[:min_chars]
+    if len(probe) < min_chars:
+        return 0
+    start = window.find(probe)
+    while start != -1:
+        if right.startswith(window[start:]):
+            return len(window) - start
+        start = window.find(probe, start + 1)
+    return 0
+
+@dataclass
+class PackedContext:
+    docs: List[Dict] = field(default_factory=list)
+    text: str = ""
+    tokens_used: int = 0
+    tokens_original: int = 0
+    duplicates_dropped: int = 0
+    over_budget_dropped: int = 0
+    chars_trimmed: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_original - self.tokens_used
+
+class ContextPacker:
+    """
+    Packs retrieved chunks into a token budget, best first.
+    Near-duplicate chunks (char-bigram coverage) are dropped and the
+    overlap shared with an already packed chunk of the same source is
+    trimmed, so the budget is spent on distinct text.
+    """
+
+    def __init__(
+        self,
+        token_counter: Callable[[str], int] = None,
+        budget: int = CONTEXT_TOKEN_BUDGET,
+        overlap_chars: int = CONTEXT_OVERLAP_CHARS,
+        duplicate_threshold: float = CONTEXT_DUPLICATE_THRESHOLD,
+        separator: str = "\n\n"
+    ):
+        self.count_tokens = token_counter or estimate_tokens
+        self.budget = budget
+        self.overlap_chars = overlap_chars
+        self.duplicate_threshold = duplicate_threshold
+        self.separator = separator
+
+    def _ordered(self, docs: List[Dict]) -> List[Dict]:
+        # Reranked lists carry comparable rerank_score; otherwise trust retrieval (RRF) order,
+        # since raw cosine / BM25 / full-text scores are on different scales
+        if docs and all("rerank_score" in doc for doc in docs):
+            return sorted(docs, key=lambda doc: doc["rerank_score"], reverse=True)
+        return list(docs)
+
+    def _is_duplicate(self, grams: set, kept_grams: List[set]) -> bool:
+        if not grams:
+            return True
+        for other in kept_grams:
+            if len(grams & other) / len(grams) >= self.duplicate_threshold:
+                return True
+        return False
+
+    def _trim_overlap(self, content: str, doc: Dict, kept: List[Dict]) -> str:
+        source = (doc.get("metadata") or {}).get("source")
+        if not source:
+            return content
+        for other in kept:
+            if (other.get("metadata") or {}).get("source") != source:
+                continue
+            # other ... | overlap | ... content  -> drop the repeated head
+            head = overlap_length(other["content"], content, self.overlap_chars)
+            if head:
+                content = content[head:]
+            # content ... | overlap | ... other  -> drop the repeated tail
+            tail = overlap_length(content, other["content"], self.overlap_chars)
+            if tail:
+                content = content[:-tail]
+        return content.strip()
+
+    def pack(self, docs: List[Dict], budget: Optional[int] = None) -> PackedContext:
+        budget = self.budget if budget is None else budget
+        packed = PackedContext()
+        kept_grams: List[set] = []
+        separator_tokens = self.count_tokens(self.separator)
+
+        for doc in self._ordered(docs):
+            content = doc.get("content") or ""
+            tokens = self.count_tokens(content)
+            packed.tokens_original += tokens
+
+            grams = char_ngrams(content)
+            if self._is_duplicate(grams, kept_grams):
+                packed.duplicates_dropped += 1
+                continue
+
+            trimmed = self._trim_overlap(content, doc, packed.docs)
+            if not trimmed:
+                packed.duplicates_dropped += 1
+                continue
+            if len(trimmed) != len(content):
+                packed.chars_trimmed += len(content) - len(trimmed)
+                tokens = self.count_tokens(trimmed)
+
+            cost = tokens + (separator_tokens if packed.docs else 0)
+            if packed.tokens_used + cost > budget:
+                if packed.docs:
+                    # A smaller, lower-ranked chunk may still fit
+                    packed.over_budget_dropped += 1
+                    continue
+                # Even the best chunk is too long: keep its head
+                trimmed = trimmed[:max(1, len(trimmed) * budget // max(tokens, 1))]
+                tokens = self.count_tokens(trimmed)
+                cost = tokens
+
+            packed.docs.append({**doc, "content": trimmed})
+            packed.tokens_used += cost
+            kept_grams.append(grams)
+
+        packed.text = self.separator.join(doc["content"] for doc in packed.docs)
+        print(
+            f"[ContextPacker] {packed.tokens_used}/{packed.tokens_original} tokens "
+            f"({packed.tokens_saved} saved: {packed.duplicates_dropped} duplicates, "
+            f"{packed.over_budget_dropped} over budget, {packed.chars_trimmed} overlap chars trimmed)"
+        )
+        return packed
@@ -0,0 +1,233 @@
+import os
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+from ai_engine.database.connector import get_chat_model
+from ai_engine.rag.context_packer import estimate_tokens
+from ai_engine.rag.model_router import get_site_model
+
+# Turns (user + assistant message) kept verbatim; older ones live in Conversation.summary
+MEMORY_RECENT_TURNS = int(os.getenv("MEMORY_RECENT_TURNS", "3"))
+MEMORY_RECENT_TOKENS = int(os.getenv("MEMORY_RECENT_TOKENS", "700"))
+MEMORY_SUMMARY_TOKENS = int(os.getenv("MEMORY_SUMMARY_TOKENS", "300"))
+# Messages folded into the summary per LLM call
+MEMORY_FOLD_BATCH = int(os.getenv("MEMORY_FOLD_BATCH", "12"))
+
+SUMMARY_PROMPT = """다음은 사용자와 {speaker_name} 사이의 자문 대화입니다.
+[기존 요약]에 [새 대화]의 내용을 반영하여 갱신된 요약을 작성하십시오.
+- 사용자의 관심사, 질문의 맥락, 전문가가 제시한 핵심 주장과 결론을 보존하십시오.
+- {max_chars}자 이내의 한국어 문단으로, 요약문만 출력하십시오.
+
+[기존 요약]
+{summary}
+
+[새 대화]
+{transcript}
+"""
+
+def _truncate(text: str, tokens: int, budget: int) -> str:
+    # Proportional cut, same approach as ContextPacker for an over-long chunk
+    return text[:max(1, len(text) * budget // max(tokens, 1))].rstrip() + "…"
+
+@dataclass
+class MemoryBlock:
+    """What the model sees of a conversation: rolling summary + the latest turns"""
+    speaker_name: str = "전문가"
+    summary: str = ""
+    turns: List[Tuple[str, str]] = field(default_factory=list)  # (role, content), oldest first
+
+    def _label(self, role: str) -> str:
+        return "사용자" if role == "user" else self.speaker_name
+
+    def render(
+        self,
+        count_tokens: Callable[[str], int] = estimate_tokens,
+        summary_budget: int = MEMORY_SUMMARY_TOKENS,
+        recent_budget: int = MEMORY_RECENT_TOKENS
+    ) -> str:
+        """Fixed-size text block: at most summary_budget + recent_budget tokens"""
+        sections = []
+        summary = self.summary.strip()
+        if summary:
+            tokens = count_tokens(summary)
+            if tokens > summary_budget:
+                summary = _truncate(summary, tokens, summary_budget)
+            sections.append(f"[이전 대화 요약]\n{summary}")
+
+        # Newest turns first until the budget runs out; a message that does not fit is cut
+        lines, remaining = [], recent_budget
+        for role, content in reversed(self.turns):
+            line = f"{self._label(role)}: {content.strip()}"
+            tokens = count_tokens(line)
+            if tokens > remaining:
+                if remaining > 20:
+                    lines.append(_truncate(line, tokens, remaining))
+                break
+            lines.append(line)
+            remaining -= tokens
+        if lines:
+            sections.append("[최근 대화]\n" + "\n".join(reversed(lines)))
+
+        return "\n\n".join(sections)
+
+class ConversationMemory:
+    """
+    Bounded memory per conversation.
+    The last MEMORY_RECENT_TURNS turns are read verbatim; everything older is
+    folded into Conversation.summary by a background LLM call, which advances
+    Conversation.summarized_until (the id of the last folded message).
+    Prompt size per turn therefore stays constant however long the chat runs.
+    """
+
+    def __init__(self, recent_turns: int = MEMORY_RECENT_TURNS, fold_batch: int = MEMORY_FOLD_BATCH, workers: int = 2):
+        self.recent_messages = recent_turns * 2
+        self.fold_batch = fold_batch
+        self.model_name = get_site_model("memory_summary", "solar-mini")
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="memory-fold")
+        self._running = set()
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+    def load(self, conversation_id: Optional[str], query: Optional[str] = None) -> Optional[MemoryBlock]:
+        """
+        Memory of a conversation before the current turn, or None if it has no history.
+        If the current question was already saved (newest message, equal to
+        `query`), it is left out.
+        """
+        if not conversation_id:
+            return None
+        # Lazy import to avoid circular dep
+        from backend.database.session import SessionLocal
+        from backend.database.models import Conversation, Message, Speaker
+
+        db = SessionLocal()
+        try:
+            row = db.query(Conversation.summary, Conversation.summarized_until, Speaker.name).outerjoin(
+                Speaker, Conversation.speaker_id == Speaker.id
+            ).filter(Conversation.id == conversation_id).first()
+            if row is None:
+                return None
+            messages = db.query(Message.role, Message.content).filter(
+                Message.conversation_id == conversation_id
+            ).order_by(Message.id.desc()).limit(self.recent_messages + 1).all()
+        finally:
+            db.close()
+
+        messages = list(reversed(messages))
+        if messages and messages[-1].role == "user" and (query is None or messages[-1].content == query):
+            messages = messages[:-1]
+        messages = messages[-self.recent_messages:] if self.recent_messages else []
+
+        # Until the first fold, summary still holds the conversation title
+        summary = row.summary if row.summarized_until is not None else ""
+        if not summary and not messages:
+            return None
+        return MemoryBlock(
+            speaker_name=row.name or "전문가",
+            summary=summary or "",
+            turns=[(m.role, m.content) for m in messages]
+        )
+
+    async def aload(self, conversation_id: Optional[str], query: Optional[str] = None) -> Optional[MemoryBlock]:
+        if not conversation_id:
+            return None
+        return await asyncio.to_thread(self.load, conversation_id, query)
+
+    def schedule_fold(self, conversation_id: str):
+        """Fold turns that fell out of the recent window, in the background (call after saving a reply)"""
+        with self._lock:
+            if conversation_id in self._running:
+                # A fold is in progress; run once more when it finishes
+                self._dirty.add(conversation_id)
+                return
+            self._running.add(conversation_id)
+        self._executor.submit(self._fold_until_clean, conversation_id)
+
+    def _fold_until_clean(self, conversation_id: str):
+        while True:
+            try:
+                while self.fold(conversation_id):
+                    pass
+            except Exception as e:
+                print(f"[Memory] Summary update failed for {conversation_id}: {e}")
+            with self._lock:
+                if conversation_id not in self._dirty:
+                    self._running.discard(conversation_id)
+                    return
+                self._dirty.discard(conversation_id)
+
+    def fold(self, conversation_id: str) -> bool:
+        """Fold one batch of old messages into the summary; False when there was nothing to fold"""
+        from backend.database.session import SessionLocal
+        from backend.database.models import Conversation, Message, Speaker
+
+        # Read, then release the session before the LLM call
+        db = SessionLocal()
+        try:
+            row = db.query(Conversation.summary, Conversation.summarized_until, Speaker.name).outerjoin(
+                Speaker, Conversation.speaker_id == Speaker.id
+            ).filter(Conversation.id == conversation_id).first()
+            if row is None:
+                return False
+            # Runs after a reply is saved, so the newest messages are exactly the next turn's window
+            recent = db.query(Message.id).filter(
+                Message.conversation_id == conversation_id
+            ).order_by(Message.id.desc()).limit(max(self.recent_messages, 1)).all()
+            if not recent or len(recent) < self.recent_messages:
+                return False
+            window_start = recent[-1].id if self.recent_messages else recent[0].id + 1
+            query = db.query(Message.id, Message.role, Message.content).filter(
+                Message.conversation_id == conversation_id,
+                Message.id < window_start
+            )
+            if row.summarized_until is not None:
+                query = query.filter(Message.id > row.summarized_until)
+            pending = query.order_by(Message.id).limit(self.fold_batch).all()
+        finally:
+            db.close()
+
+        if not pending:
+            return False
+
+        speaker_name = row.name or "전문가"
+        previous = row.summary if row.summarized_until is not None else ""
+        transcript = "\n".join(
+            f"{'사용자' if m.role == 'user' else speaker_name}: {m.content.strip()}" for m in pending
+        )
+        prompt = SUMMARY_PROMPT.format(
+            speaker_name=speaker_name,
+            max_chars=int(MEMORY_SUMMARY_TOKENS * 1.5),
+            summary=previous or "(없음)",
+            transcript=transcript
+        )
+        summary = get_chat_model(self.model_name, temperature=0).invoke(prompt).content.strip()
+
+        # Conditional update: a concurrent fold that already moved the watermark wins
+        db = SessionLocal()
+        try:
+            watermark = Conversation.summarized_until
+            updated = db.query(Conversation).filter(
+                Conversation.id == conversation_id,
+                watermark.is_(None) if row.summarized_until is None else watermark == row.summarized_until
+            ).update({Conversation.summary: summary, Conversation.summarized_until: pending[-1].id}, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+        print(f"[Memory] Folded {len(pending)} messages of {conversation_id} into the summary ({len(summary)} chars)")
+        return bool(updated)
+
+_shared_memory = None
+_shared_memory_lock = threading.Lock()
+
+def get_conversation_memory() -> ConversationMemory:
+    """Process-wide conversation memory"""
+    global _shared_memory
+    if _shared_memory is None:
+        with _shared_memory_lock:
+            if _shared_memory is None:
+                _shared_memory = ConversationMemory()
+    return _shared_memory
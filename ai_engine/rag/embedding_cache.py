@@ -0,0 +1,83 @@
+import os
+import re
+import time
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+def normalize_query(text: str) -> str:
+    """Normalize query text so trivially different spellings share a cache slot"""
+    text = unicodedata.normalize("NFC", text or "")
+    return re.sub(r"\s+", " ", text).strip()
+
+class EmbeddingCache:
+    """
+    Bounded LRU + TTL cache for query embeddings.
+
+    Vectors are stored as float32 arrays (4 bytes per dim, ~16 KB for a
+    4096-d Solar embedding) instead of Python float lists (~100 KB).
+    """
+
+    def __init__(self, max_entries: int = 2048, ttl_seconds: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, array]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _key(self, text: str, model: str) -> Tuple[str, str]:
+        return (model, normalize_query(text))
+
+    def get(self, text: str, model: str) -> Optional[List[float]]:
+        key = self._key(text, model)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, vector = entry
+            if now - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return vector.tolist()
+
+    def put(self, text: str, model: str, vector: List[float]):
+        key = self._key(text, model)
+        packed = array("f", vector)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), packed)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits / total) if total else 0.0,
+                "bytes": sum(v.itemsize * len(v) for _, v in self._entries.values()),
+            }
+
+# Process-wide cache shared by every HybridRetriever instance
+query_embedding_cache = EmbeddingCache(
+    max_entries=int(os.getenv("EMBEDDING_CACHE_SIZE", "2048")),
+    ttl_seconds=float(os.getenv("EMBEDDING_CACHE_TTL", "3600")),
+)
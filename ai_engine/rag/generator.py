@@ -1,9 +1,15 @@
 
-from typing import List, Dict
-from langchain_upstage import ChatUpstage
+from typing import List, Dict, AsyncIterator, Optional, Union
+from ai_engine.database.connector import get_chat_model
+from ai_engine.rag.persona_cache import CompiledPersona
+from ai_engine.rag.context_packer import ContextPacker, get_token_counter
+from ai_engine.rag.model_router import ModelRouter
+from ai_engine.rag.conversation_memory import MemoryBlock
 from langchain.prompts import ChatPromptTemplate
+from langchain_core.messages import SystemMessage
 from dataclasses import dataclass
 import os
+import time
 
 @dataclass
 class ExpertPersona:
@@ -22,38 +28,7 @@ class ExpertPersona:
         Core Beliefs: {', '.join(self.core_beliefs)}
         """
 
-class IDRAGGenerator:
-    def __init__(self):
-        # solar-pro or solar-mini
-        self.llm = ChatUpstage(model="solar-pro3", temperature=0.7)
-
-    def get_persona(self, persona_config: Dict) -> ExpertPersona:
-        """Factory method to get expert persona from DB config"""
-        # Default fallback
-        if not persona_config:
-            return ExpertPersona(
-                name="Expert", 
-                core_beliefs=["Providing accurate information"], 
-                speaking_style={"tone": "Professional"}, 
-                key_phrases=[],
-                example_outputs=[]
-            )
-
-        return ExpertPersona(
-            name=persona_config.get("name", "Expert"),
-            core_beliefs=persona_config.get("core_beliefs", []),
-            speaking_style=persona_config.get("speaking_style", {}),
-            key_phrases=persona_config.get("key_phrases", []),
-            example_outputs=persona_config.get("example_outputs", [])
-        )
-
-    def generate_response(self, query: str, context: List[Dict], persona_config: Dict) -> str:
-        persona = self.get_persona(persona_config)
-        
-        context_text = "\n\n".join([item['content'] for item in context])
-        
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """당신은 대한민국의 대표적인 IT 인사이트 리더, **{expert_name}**입니다.
+SYSTEM_TEMPLATE = """당신은 대한민국의 대표적인 IT 인사이트 리더, **{expert_name}**입니다.
             제공된 [Context]를 바탕으로, 당신의 독보적인 통찰력을 담아 질문에 답변하십시오.
 
             ### 페르소나 지침 (반드시 준수)
@@ -73,28 +48,99 @@ class IDRAGGenerator:
             - **출처 기반**: 반드시 아래 [Context]에 있는 내용에 기반하여 답변하십시오. 
             - **페르소나 유지**: 만약 [Context]에 다른 전문가(예: 박태웅, 한상기 등)의 의견이 포함되어 있다면, 이를 당신의 의견인 것처럼 말하지 마십시오. 당신은 오직 **{expert_name}**의 관점에서만 해석하고 답변해야 합니다.
             - **명확성**: 필요하다면 번호 매기기나 불렛포인트를 사용하여 가독성을 높이십시오.
-            """),
-            ("user", """
+            """
+
+USER_TEMPLATE = """
+            {memory}
             [Context]
             {context}
             
             [Question]
             {query}
-            """)
+            """
+
+class IDRAGGenerator:
+    def __init__(self, temperature: float = 0.7):
+        # solar-mini for short / factual questions, solar-pro3 when the router escalates
+        self.router = ModelRouter("persona")
+        self.temperature = temperature
+        self.llm = get_chat_model(self.router.complex_model, temperature=temperature)
+        # Dedupes / trims retrieved chunks into CONTEXT_TOKEN_BUDGET
+        self.packer = ContextPacker(get_token_counter(self.llm))
+
+    def get_persona(self, persona_config: Dict) -> ExpertPersona:
+        """Factory method to get expert persona from DB config"""
+        # Default fallback
+        if not persona_config:
+            return ExpertPersona(
+                name="Expert", 
+                core_beliefs=["Providing accurate information"], 
+                speaking_style={"tone": "Professional"}, 
+                key_phrases=[],
+                example_outputs=[]
+            )
+
+        return ExpertPersona(
+            name=persona_config.get("name", "Expert"),
+            core_beliefs=persona_config.get("core_beliefs", []),
+            speaking_style=persona_config.get("speaking_style", {}),
+            key_phrases=persona_config.get("key_phrases", []),
+            example_outputs=persona_config.get("example_outputs", [])
+        )
+
+    def compile_persona(self, persona_config: Dict) -> ChatPromptTemplate:
+        """Render the persona system message once; the result only needs context and query"""
+        persona = self.get_persona(persona_config)
+        system_message = SYSTEM_TEMPLATE.format(
+            expert_name=persona.name,
+            style_description=persona.style_description,
+            key_phrases=", ".join(persona.key_phrases),
+            core_beliefs=", ".join(persona.core_beliefs),
+            example_outputs="\n".join([f"- {ex}" for ex in persona.example_outputs])
+        )
+        return ChatPromptTemplate.from_messages([
+            SystemMessage(content=system_message),
+            ("user", USER_TEMPLATE)
         ])
-        
-        chain = prompt | self.llm
-        
-        response = chain.invoke({
-            "expert_name": persona.name,
-            "style_description": persona.style_description,
-            "key_phrases": ", ".join(persona.key_phrases),
-            "core_beliefs": ", ".join(persona.core_beliefs),
-            "example_outputs": "\n".join([f"- {ex}" for ex in persona.example_outputs]),
-            "context": context_text,
-            "query": query
-        })
-        
-
-        
+
+    def _render_memory(self, memory: Optional[MemoryBlock]) -> str:
+        # Fixed-size block (summary + latest turns), so prompt growth is bounded per turn
+        if memory is None:
+            return ""
+        text = memory.render(self.packer.count_tokens)
+        return f"{text}\n" if text else ""
+
+    def _build_chain(self, query: str, context: List[Dict], persona: Union[CompiledPersona, Dict], memory: Optional[MemoryBlock] = None):
+        """Prompt | LLM chain plus its inputs, shared by the sync and async paths"""
+        prompt = persona.prompt if isinstance(persona, CompiledPersona) else self.compile_persona(persona)
+        packed = self.packer.pack(context)
+        decision = self.router.route(query)
+        chain = prompt | get_chat_model(decision.model, temperature=self.temperature)
+        return chain, {"memory": self._render_memory(memory), "context": packed.text, "query": query}, decision
+
+    def generate_response(self, query: str, context: List[Dict], persona: Union[CompiledPersona, Dict], memory: Optional[MemoryBlock] = None) -> str:
+        chain, inputs, decision = self._build_chain(query, context, persona, memory)
+        start = time.perf_counter()
+        response = chain.invoke(inputs)
+        self.router.record(decision, time.perf_counter() - start)
         return response.content
+
+    async def agenerate_response(self, query: str, context: List[Dict], persona: Union[CompiledPersona, Dict], memory: Optional[MemoryBlock] = None) -> str:
+        """Same as generate_response, awaiting the LLM instead of blocking"""
+        chain, inputs, decision = self._build_chain(query, context, persona, memory)
+        start = time.perf_counter()
+        response = await chain.ainvoke(inputs)
+        self.router.record(decision, time.perf_counter() - start)
+        return response.content
+
+    async def astream_response(self, query: str, context: List[Dict], persona: Union[CompiledPersona, Dict], memory: Optional[MemoryBlock] = None) -> AsyncIterator[str]:
+        """Yield the answer token by token as the routed model produces it"""
+        chain, inputs, decision = self._build_chain(query, context, persona, memory)
+        start = time.perf_counter()
+        first_token = None
+        async for chunk in chain.astream(inputs):
+            if chunk.content:
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                yield chunk.content
+        self.router.record(decision, time.perf_counter() - start, first_token)
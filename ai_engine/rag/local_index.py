@@ -0,0 +1,191 @@
+import os
+import json
+import time
+import shutil
+import argparse
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+DEFAULT_LOCAL_INDEX_DIR = os.getenv(
+    "LOCAL_VECTOR_INDEX_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "local_vector_index")
+)
+
+def _generation(path: str) -> Optional[str]:
+    """Generation directory the current meta.json points to"""
+    try:
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            return json.load(f).get("generation")
+    except (OSError, ValueError):
+        return None
+
+def export_from_qdrant(client, collection_name: str = "speaker_knowledge", path: str = DEFAULT_LOCAL_INDEX_DIR, batch_size: int = 256) -> int:
+    """
+    Dump a Qdrant collection into a memory-mappable float32 matrix
+    (vectors.f32, rows L2-normalized) plus a payloads.jsonl sidecar.
+    Each export goes into its own gen-<ns> directory and meta.json, swapped
+    in with os.replace, is the single pointer to it: readers never pair
+    vectors and payloads of different exports. The previous generation is
+    kept for readers still loading it, older ones are removed.
+    """
+    os.makedirs(path, exist_ok=True)
+    generation = f"gen-{time.time_ns()}"
+    data_dir = os.path.join(path, generation)
+    os.makedirs(data_dir)
+    count = 0
+    dim = None
+    offset = None
+
+    with open(os.path.join(data_dir, "vectors.f32"), "wb") as vf, \
+         open(os.path.join(data_dir, "payloads.jsonl"), "w", encoding="utf-8") as pf:
+        while True:
+            points, offset = client.scroll(
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True
+            )
+            if not points:
+                break
+
+            matrix = np.asarray([p.vector for p in points], dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix /= np.where(norms == 0, 1.0, norms)
+            dim = matrix.shape[1]
+            matrix.tofile(vf)
+
+            for p in points:
+                pf.write(json.dumps(p.payload or {}, ensure_ascii=False) + "\n")
+            count += len(points)
+
+            if offset is None:
+                break
+
+    previous = _generation(path)
+    with open(os.path.join(path, "meta.json.tmp"), "w", encoding="utf-8") as f:
+        json.dump({"collection": collection_name, "count": count, "dim": dim, "generation": generation}, f)
+    os.replace(os.path.join(path, "meta.json.tmp"), os.path.join(path, "meta.json"))
+
+    for name in os.listdir(path):
+        if name.startswith("gen-") and name not in (generation, previous):
+            shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+
+    print(f"[LocalIndex] Exported {count} vectors from '{collection_name}' to {data_dir}")
+    return count
+
+class LocalVectorIndex:
+    """
+    Embedded brute-force cosine index used when Qdrant is unreachable.
+    Vectors stay memory-mapped; a per-speaker row list keeps filtered
+    searches to that speaker's (small) corpus.
+    """
+
+    def __init__(self, vectors: np.ndarray, payloads: List[Dict]):
+        self.vectors = vectors
+        self.payloads = payloads
+        self.speaker_rows: Dict[str, np.ndarray] = {}
+        rows_by_speaker: Dict[str, List[int]] = {}
+        for row, payload in enumerate(payloads):
+            rows_by_speaker.setdefault(payload.get("speaker_name", ""), []).append(row)
+        for speaker, rows in rows_by_speaker.items():
+            self.speaker_rows[speaker] = np.asarray(rows, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.payloads)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_LOCAL_INDEX_DIR) -> Optional["LocalVectorIndex"]:
+        meta_path = os.path.join(path, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if not meta.get("count"):
+            return None
+
+        # Exports made before generations existed keep their files next to meta.json
+        data_dir = os.path.join(path, meta.get("generation", ""))
+        vectors = np.memmap(
+            os.path.join(data_dir, "vectors.f32"),
+            dtype=np.float32,
+            mode="r",
+            shape=(meta["count"], meta["dim"])
+        )
+        with open(os.path.join(data_dir, "payloads.jsonl"), "r", encoding="utf-8") as f:
+            payloads = [json.loads(line) for line in f if line.strip()]
+        return cls(vectors, payloads)
+
+    def search(self, vector: List[float], top_k: int = 5, speaker_name: str = None) -> List[Dict]:
+        query = np.array(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return []
+        query /= norm
+
+        if speaker_name:
+            rows = self.speaker_rows.get(speaker_name)
+            if rows is None:
+                return []
+            scores = self.vectors[rows] @ query
+        else:
+            rows = None
+            scores = np.asarray(self.vectors @ query)
+
+        k = min(top_k, scores.shape[0])
+        if k == 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        results = []
+        for i in top:
+            row = int(rows[i]) if rows is not None else int(i)
+            payload = self.payloads[row]
+            results.append({
+                "content": payload.get("chunk_text", ""),
+                "metadata": payload,
+                "score": float(scores[i]),
+                "source": "vector"
+            })
+        return results
+
+class LocalVectorIndexReader:
+    """Holds the exported index and reloads it when a new export replaces meta.json"""
+
+    def __init__(self, path: str = DEFAULT_LOCAL_INDEX_DIR):
+        self.path = path
+        self._index: Optional[LocalVectorIndex] = None
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[LocalVectorIndex]:
+        try:
+            mtime = os.stat(os.path.join(self.path, "meta.json")).st_mtime
+        except OSError:
+            return self._index
+        if mtime == self._mtime:
+            return self._index
+        with self._lock:
+            # Concurrent callers wait for one load instead of each parsing payloads.jsonl
+            if mtime != self._mtime:
+                # Recorded before loading so a broken export is retried only once it is rewritten
+                self._mtime = mtime
+                try:
+                    self._index = LocalVectorIndex.load(self.path)
+                    if self._index is not None:
+                        print(f"[LocalIndex] Loaded {len(self._index)} vectors from {self.path}")
+                except Exception as e:
+                    print(f"[LocalIndex] Failed to load index from {self.path}: {e}")
+        return self._index
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export Qdrant vectors to the local fallback index")
+    parser.add_argument("--collection", type=str, default="speaker_knowledge", help="Qdrant collection to export")
+    parser.add_argument("--path", type=str, default=DEFAULT_LOCAL_INDEX_DIR, help="Output directory")
+    args = parser.parse_args()
+
+    from ai_engine.database.connector import get_qdrant_client
+    export_from_qdrant(get_qdrant_client(), args.collection, args.path)
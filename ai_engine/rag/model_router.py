@@ -0,0 +1,119 @@
+import os
+import re
+import threading
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+def get_site_model(site: str, default: str) -> str:
+    """Model for a call site: LLM_MODEL_<SITE> (e.g. LLM_MODEL_GRAPH_EXTRACTOR) overrides the default"""
+    return os.getenv(f"LLM_MODEL_{site.upper()}", default)
+
+ROUTER_MODE = os.getenv("ROUTER_MODE", "auto").lower()  # auto | simple | complex
+ROUTER_COMPLEXITY_THRESHOLD = float(os.getenv("ROUTER_COMPLEXITY_THRESHOLD", "0.5"))
+
+# Questions that ask for reasoning, comparison or strategy need the larger model
+_ANALYTICAL = re.compile(
+    r"왜|어떻게|비교|분석|전략|전망|영향|시사점|의미|장단점|차이|평가|대응|리스크|위험|해석|예측|견해|관점|조언|제언|"
+    r"\b(why|how|compare|analy[sz]e|strategy|implication|impact|trade-?off|evaluate|predict)\b",
+    re.IGNORECASE
+)
+# Lookups and definitions are fine on the small model
+_FACTUAL = re.compile(
+    r"누구|언제|어디|몇|무엇|뭐야|뭔가요|정의|뜻|이름|\b(who|when|where|what is|define|list)\b",
+    re.IGNORECASE
+)
+
+@dataclass
+class RouteDecision:
+    site: str
+    model: str
+    tier: str
+    score: float
+    reasons: List[str] = field(default_factory=list)
+
+def complexity_score(query: str):
+    """Local heuristic in [0, 1]; no model call. Returns (score, reasons)."""
+    reasons = []
+    text = query.strip()
+
+    length = min(len(text) / 200, 1.0) * 0.4
+    score = length
+    reasons.append(f"length={len(text)}")
+
+    analytical = len(_ANALYTICAL.findall(text))
+    if analytical:
+        score += min(analytical, 2) * 0.25
+        reasons.append(f"analytical={analytical}")
+
+    questions = text.count("?") + text.count("？")
+    if questions > 1 or len(re.findall(r"(?m)^\s*(\d+[.)]|[-•])", text)) > 1:
+        score += 0.2
+        reasons.append("multi-part")
+
+    if _FACTUAL.search(text) and not analytical:
+        score -= 0.2
+        reasons.append("factual")
+
+    return max(0.0, min(score, 1.0)), reasons
+
+class ModelRouter:
+    """
+    Cost/latency cascade for one call site: the simple model by default,
+    the complex model when the local complexity heuristic crosses the threshold.
+    Decisions and observed latencies are logged and kept for threshold tuning.
+    """
+
+    def __init__(
+        self,
+        site: str,
+        simple_model: str = "solar-mini",
+        complex_model: str = "solar-pro3",
+        threshold: float = ROUTER_COMPLEXITY_THRESHOLD,
+        mode: str = ROUTER_MODE
+    ):
+        self.site = site
+        self.simple_model = get_site_model(f"{site}_simple", simple_model)
+        self.complex_model = get_site_model(f"{site}_complex", complex_model)
+        self.threshold = threshold
+        self.mode = mode
+        self._latencies: Dict[str, deque] = defaultdict(lambda: deque(maxlen=500))
+        self._counts: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def route(self, query: str) -> RouteDecision:
+        score, reasons = complexity_score(query)
+        if self.mode == "simple":
+            tier = "simple"
+            reasons.append("mode=simple")
+        elif self.mode == "complex":
+            tier = "complex"
+            reasons.append("mode=complex")
+        else:
+            tier = "complex" if score >= self.threshold else "simple"
+
+        model = self.complex_model if tier == "complex" else self.simple_model
+        decision = RouteDecision(self.site, model, tier, score, reasons)
+        with self._lock:
+            self._counts[tier] += 1
+        print(f"[ModelRouter] {self.site}: {tier} -> {model} (score {score:.2f}, threshold {self.threshold}; {', '.join(reasons)})")
+        return decision
+
+    def record(self, decision: RouteDecision, latency: float, first_token: float = None):
+        """Log how long the routed model took (and time-to-first-token when streaming)"""
+        with self._lock:
+            self._latencies[decision.model].append(latency)
+        ttft = f", first token {first_token * 1000:.0f} ms" if first_token is not None else ""
+        print(f"[ModelRouter] {self.site}: {decision.model} answered in {latency * 1000:.0f} ms{ttft} (score {decision.score:.2f})")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            latencies = {}
+            for model, values in self._latencies.items():
+                ordered = sorted(values)
+                latencies[model] = {
+                    "count": len(ordered),
+                    "p50_ms": ordered[len(ordered) // 2] * 1000,
+                    "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+                }
+            return {"site": self.site, "threshold": self.threshold, "routes": dict(self._counts), "latency": latencies}
@@ -0,0 +1,119 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Safety net for changes made by other workers / direct DB edits;
+# in-process edits call invalidate() right after commit.
+PERSONA_CACHE_TTL = float(os.getenv("PERSONA_CACHE_TTL", "300"))
+
+def persona_fingerprint(speaker_name: str, persona_config: Dict) -> str:
+    """Stable hash of everything that goes into the compiled system message"""
+    raw = json.dumps({"name": speaker_name, "persona": persona_config or {}}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+@dataclass(frozen=True)
+class CompiledPersona:
+    speaker_id: str
+    speaker_name: str
+    persona_config: Dict
+    fingerprint: str
+    prompt: Any  # ChatPromptTemplate with the system message already rendered
+
+class PersonaCache:
+    """
+    Per-speaker compiled personas: the Speaker row plus a prompt whose system
+    message is fully rendered, so a turn only formats context and query.
+    loader(speaker_id) -> (speaker_name, persona_config) or None if missing.
+    compiler(persona_config) -> prompt.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], Optional[Tuple[str, Dict]]],
+        compiler: Callable[[Dict], Any],
+        ttl_seconds: float = PERSONA_CACHE_TTL,
+        default_name: str = "Expert"
+    ):
+        self.loader = loader
+        self.compiler = compiler
+        self.ttl_seconds = ttl_seconds
+        self.default_name = default_name
+        self._entries: Dict[str, Tuple[float, CompiledPersona]] = {}
+        self._lock = threading.Lock()
+        self._default: Optional[CompiledPersona] = None
+        self.hits = 0
+        self.misses = 0
+        self.compiles = 0
+
+    def peek(self, speaker_id) -> Optional[CompiledPersona]:
+        """Fresh cached persona or None; never touches the DB"""
+        entry = self._entries.get(str(speaker_id))
+        if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def get(self, speaker_id) -> CompiledPersona:
+        cached = self.peek(speaker_id)
+        if cached is not None:
+            return cached
+
+        key = str(speaker_id)
+        self.misses += 1
+        try:
+            row = self.loader(key)
+        except Exception as e:
+            print(f"[PersonaCache] Speaker lookup failed: {e}")
+            row = None
+        if row is None:
+            # Unknown speaker: not cached, so a speaker created later is picked up
+            return self._default_persona()
+
+        speaker_name, persona_config = row
+        fingerprint = persona_fingerprint(speaker_name, persona_config)
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None and previous[1].fingerprint == fingerprint:
+                # TTL refresh with an unchanged persona: keep the compiled prompt
+                persona = previous[1]
+            else:
+                persona = self._compile(key, speaker_name, persona_config, fingerprint)
+            self._entries[key] = (time.monotonic(), persona)
+        return persona
+
+    def invalidate(self, speaker_id=None):
+        """Drop one speaker (or all) after its persona_model changed"""
+        with self._lock:
+            if speaker_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(speaker_id), None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "compiles": self.compiles,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _compile(self, speaker_id: str, speaker_name: str, persona_config: Dict, fingerprint: str) -> CompiledPersona:
+        self.compiles += 1
+        return CompiledPersona(
+            speaker_id=speaker_id,
+            speaker_name=speaker_name,
+            persona_config=persona_config,
+            fingerprint=fingerprint,
+            prompt=self.compiler(persona_config)
+        )
+
+    def _default_persona(self) -> CompiledPersona:
+        if self._default is None:
+            self._default = self._compile("", self.default_name, {}, persona_fingerprint(self.default_name, {}))
+        return self._default
@@ -0,0 +1,161 @@
+import os
+from collections import defaultdict
+from typing import Dict, List
+
+from ai_engine.rag.concept_matcher import normalize_text
+from ai_engine.rag.model_router import get_site_model
+
+def char_ngrams(text: str, n: int = 2) -> set:
+    """Character n-grams over normalized text (works for Hangul without a tokenizer)"""
+    text = normalize_text(text)
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+class Reranker:
+    """Base reranker interface"""
+    name = "none"
+
+    def rerank(self, query: str, results: List[Dict]) -> List[Dict]:
+        return results
+
+class ScoreFusionReranker(Reranker):
+    """
+    Local CPU reranker.
+    Blends each branch's own score (scaled by the per-source peak, since
+    cosine and BM25 live on different scales), lexical overlap between
+    query and chunk, and the RRF position the candidate arrived in.
+    """
+    name = "fusion"
+
+    def __init__(self, semantic_weight: float = 0.5, lexical_weight: float = 0.3, rank_weight: float = 0.2):
+        self.semantic_weight = semantic_weight
+        self.lexical_weight = lexical_weight
+        self.rank_weight = rank_weight
+
+    def _normalized_scores(self, results: List[Dict]) -> List[float]:
+        peaks = defaultdict(float)
+        for doc in results:
+            source = doc.get("source", "unknown")
+            peaks[source] = max(peaks[source], float(doc.get("score") or 0.0))
+
+        normalized = []
+        for doc in results:
+            peak = peaks[doc.get("source", "unknown")]
+            score = max(float(doc.get("score") or 0.0), 0.0)
+            normalized.append(score / peak if peak > 0 else 0.0)
+        return normalized
+
+    def score(self, query: str, results: List[Dict]) -> List[float]:
+        query_grams = char_ngrams(query)
+        semantic = self._normalized_scores(results)
+        scores = []
+        for rank, doc in enumerate(results):
+            doc_grams = char_ngrams(doc.get("content", ""))
+            lexical = len(query_grams & doc_grams) / len(query_grams) if query_grams else 0.0
+            scores.append(
+                self.semantic_weight * semantic[rank]
+                + self.lexical_weight * lexical
+                + self.rank_weight / (rank + 1)
+            )
+        return scores
+
+    def rerank(self, query: str, results: List[Dict]) -> List[Dict]:
+        if not results:
+            return []
+        scores = self.score(query, results)
+        for doc, score in zip(results, scores):
+            doc["rerank_score"] = round(score, 4)
+        return [doc for _, doc in sorted(zip(scores, results), key=lambda x: x[0], reverse=True)]
+
+class CrossEncoderReranker(Reranker):
+    """Small local cross-encoder (sentence-transformers), loaded lazily on first use"""
+    name = "cross-encoder"
+
+    def __init__(self, model_name: str = None):
+        self.model_name = model_name or os.getenv("RERANKER_MODEL", "BAAI/bge-reranker-base")
+        self._model = None
+
+    def rerank(self, query: str, results: List[Dict]) -> List[Dict]:
+        if not results:
+            return []
+        try:
+            if self._model is None:
+                from sentence_transformers import CrossEncoder
+                self._model = CrossEncoder(self.model_name, max_length=512)
+            scores = self._model.predict([(query, doc["content"][:1000]) for doc in results])
+        except Exception as e:
+            print(f"Cross-encoder reranking failed: {e}")
+            return ScoreFusionReranker().rerank(query, results)
+
+        for doc, score in zip(results, scores):
+            doc["rerank_score"] = round(float(score), 4)
+        return [doc for _, doc in sorted(zip(scores, results), key=lambda x: x[0], reverse=True)]
+
+class LLMJudgeReranker(Reranker):
+    """
+    Opt-in Solar LLM judge.
+    Candidates are first ordered locally; the LLM is only consulted when
+    the local top score does not clearly beat the runner-up.
+    """
+    name = "llm"
+
+    def __init__(self, model: str = None, confidence_margin: float = None):
+        self.model = model or get_site_model("reranker_judge", "solar-mini")
+        self.confidence_margin = confidence_margin if confidence_margin is not None else float(
+            os.getenv("RERANKER_LLM_MARGIN", "0.15")
+        )
+        self.local = ScoreFusionReranker()
+
+    def rerank(self, query: str, results: List[Dict]) -> List[Dict]:
+        if not results:
+            return []
+
+        results = self.local.rerank(query, results)
+        if len(results) < 2:
+            return results
+        margin = results[0]["rerank_score"] - results[1]["rerank_score"]
+        if margin >= self.confidence_margin:
+            return results
+
+        from langchain_core.prompts import ChatPromptTemplate
+        from ai_engine.database.connector import get_chat_model
+
+        try:
+            llm = get_chat_model(self.model, temperature=0)
+
+            candidates = "\n\n".join([f"[{i}] {doc['content'][:200]}..." for i, doc in enumerate(results)])
+
+            prompt = ChatPromptTemplate.from_messages([
+                ("system", """You are a relevance judge. Given a query and a list of document snippets, selects the indices of the documents that are most relevant to the query.
+                Return only the indices (0-indexed) of the relevant documents in order of relevance, separated by commas.
+                If none are relevant, return nothing."""),
+                ("user", "Query: {query}\n\nDocuments:\n{candidates}")
+            ])
+
+            chain = prompt | llm
+            response = chain.invoke({"query": query, "candidates": candidates})
+
+            indices = [int(idx.strip()) for idx in response.content.split(',') if idx.strip().isdigit()]
+            reranked_results = [results[i] for i in dict.fromkeys(indices) if i < len(results)]
+
+            # Keep only what the LLM selected to reduce noise; fall back to local order
+            return reranked_results or results
+        except Exception as e:
+            print(f"Reranking failed: {e}")
+            return results
+
+RERANKERS = {
+    "none": Reranker,
+    "fusion": ScoreFusionReranker,
+    "cross-encoder": CrossEncoderReranker,
+    "llm": LLMJudgeReranker,
+}
+
+def get_reranker(name: str = None) -> Reranker:
+    """Build the reranker selected by name or the RERANKER env var (default: fusion)"""
+    name = (name or os.getenv("RERANKER", "fusion")).lower()
+    if name not in RERANKERS:
+        print(f"Unknown reranker '{name}', using fusion")
+        name = "fusion"
+    return RERANKERS[name]()
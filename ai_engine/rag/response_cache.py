@@ -0,0 +1,279 @@
+import os
+import json
+import time
+import asyncio
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+RESPONSE_CACHE_THRESHOLD = float(os.getenv("RESPONSE_CACHE_THRESHOLD", "0.95"))
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "86400"))
+RESPONSE_CACHE_MAX_PER_SPEAKER = int(os.getenv("RESPONSE_CACHE_MAX_PER_SPEAKER", "500"))
+
+class InMemoryResponseCacheBackend:
+    """Process-local backend (tests, single worker, or Redis unavailable)"""
+    name = "memory"
+    blocking = False
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+        self._vectors: Dict[str, Dict[str, bytes]] = {}
+        self._entries: Dict[Tuple[str, str], Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def version(self, speaker: str) -> int:
+        return self._versions.get(speaker, 0)
+
+    def entry_ids(self, speaker: str) -> List[str]:
+        with self._lock:
+            return list(self._vectors.get(speaker, {}))
+
+    def load_vectors(self, speaker: str, entry_ids: List[str]) -> Dict[str, bytes]:
+        with self._lock:
+            vectors = self._vectors.get(speaker, {})
+            return {entry_id: vectors[entry_id] for entry_id in entry_ids if entry_id in vectors}
+
+    def get_entry(self, speaker: str, entry_id: str) -> Optional[str]:
+        item = self._entries.get((speaker, entry_id))
+        if item is None or item[0] < time.time():
+            return None
+        return item[1]
+
+    def put(self, speaker: str, entry_id: str, vector: bytes, entry: str, ttl: int):
+        with self._lock:
+            self._vectors.setdefault(speaker, {})[entry_id] = vector
+            self._entries[(speaker, entry_id)] = (time.time() + ttl, entry)
+            self._versions[speaker] = self._versions.get(speaker, 0) + 1
+
+    def delete(self, speaker: str, entry_ids: List[str]):
+        with self._lock:
+            vectors = self._vectors.get(speaker, {})
+            for entry_id in entry_ids:
+                vectors.pop(entry_id, None)
+                self._entries.pop((speaker, entry_id), None)
+            self._versions[speaker] = self._versions.get(speaker, 0) + 1
+
+    def clear_speaker(self, speaker: str):
+        with self._lock:
+            for entry_id in self._vectors.pop(speaker, {}):
+                self._entries.pop((speaker, entry_id), None)
+            self._versions[speaker] = self._versions.get(speaker, 0) + 1
+
+class RedisResponseCacheBackend:
+    """
+    Redis layout per speaker:
+      respcache:{speaker}:version   counter bumped on every write / invalidation
+      respcache:{speaker}:vectors   hash entry_id -> float32 query vector
+      respcache:{speaker}:entry:ID  JSON answer + sources, expires after the TTL
+    Vectors carry no TTL; they are dropped lazily once their entry has expired
+    (or when the per-speaker cap evicts the oldest).
+    """
+    name = "redis"
+    blocking = True
+
+    def __init__(self, client, prefix: str = "respcache"):
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, speaker: str, suffix: str) -> str:
+        return f"{self.prefix}:{speaker}:{suffix}"
+
+    def version(self, speaker: str) -> int:
+        return int(self.client.get(self._key(speaker, "version")) or 0)
+
+    def entry_ids(self, speaker: str) -> List[str]:
+        return [key.decode("utf-8") for key in self.client.hkeys(self._key(speaker, "vectors"))]
+
+    def load_vectors(self, speaker: str, entry_ids: List[str]) -> Dict[str, bytes]:
+        if not entry_ids:
+            return {}
+        values = self.client.hmget(self._key(speaker, "vectors"), entry_ids)
+        return {entry_id: value for entry_id, value in zip(entry_ids, values) if value is not None}
+
+    def get_entry(self, speaker: str, entry_id: str) -> Optional[str]:
+        value = self.client.get(self._key(speaker, f"entry:{entry_id}"))
+        return value.decode("utf-8") if value is not None else None
+
+    def put(self, speaker: str, entry_id: str, vector: bytes, entry: str, ttl: int):
+        pipe = self.client.pipeline()
+        pipe.hset(self._key(speaker, "vectors"), entry_id, vector)
+        pipe.set(self._key(speaker, f"entry:{entry_id}"), entry, ex=ttl)
+        pipe.incr(self._key(speaker, "version"))
+        pipe.execute()
+
+    def delete(self, speaker: str, entry_ids: List[str]):
+        if not entry_ids:
+            return
+        pipe = self.client.pipeline()
+        pipe.hdel(self._key(speaker, "vectors"), *entry_ids)
+        pipe.delete(*[self._key(speaker, f"entry:{entry_id}") for entry_id in entry_ids])
+        pipe.incr(self._key(speaker, "version"))
+        pipe.execute()
+
+    def clear_speaker(self, speaker: str):
+        entry_ids = self.entry_ids(speaker)
+        pipe = self.client.pipeline()
+        pipe.delete(self._key(speaker, "vectors"))
+        if entry_ids:
+            pipe.delete(*[self._key(speaker, f"entry:{entry_id}") for entry_id in entry_ids])
+        pipe.incr(self._key(speaker, "version"))
+        pipe.execute()
+
+class SemanticResponseCache:
+    """
+    Answer cache keyed by speaker + query embedding.
+    A lookup hits when the closest cached query of that speaker has cosine
+    similarity >= threshold. Each process mirrors a speaker's cached vectors
+    as one normalized matrix and syncs it only when the backend's version
+    counter moves, so a lookup is one version read, one mat-vec and one entry read.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        threshold: float = RESPONSE_CACHE_THRESHOLD,
+        ttl_seconds: int = RESPONSE_CACHE_TTL,
+        max_per_speaker: int = RESPONSE_CACHE_MAX_PER_SPEAKER
+    ):
+        self.backend = backend or InMemoryResponseCacheBackend()
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_per_speaker = max_per_speaker
+        self._mirrors: Dict[str, Tuple[int, List[str], np.ndarray]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _matrix(self, speaker: str) -> Tuple[List[str], Optional[np.ndarray]]:
+        version = self.backend.version(speaker)
+        mirror = self._mirrors.get(speaker)
+        if mirror is not None and mirror[0] == version:
+            return mirror[1], mirror[2]
+
+        # Incremental sync: only vectors added since the last mirror are fetched.
+        # Entry ids are time-ordered, so the mirror is oldest first.
+        ids = sorted(self.backend.entry_ids(speaker))
+        known = dict(zip(mirror[1], mirror[2])) if mirror is not None and mirror[2] is not None else {}
+        fetched = self.backend.load_vectors(speaker, [i for i in ids if i not in known])
+        for entry_id, raw in fetched.items():
+            known[entry_id] = np.frombuffer(raw, dtype=np.float32)
+        ids = [i for i in ids if i in known]
+        matrix = np.vstack([known[i] for i in ids]) if ids else None
+        with self._lock:
+            self._mirrors[speaker] = (version, ids, matrix)
+        return ids, matrix
+
+    @staticmethod
+    def _normalize(vector) -> Optional[np.ndarray]:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else None
+
+    def lookup(self, speaker: str, vector, kb_version: int = 0) -> Optional[Dict]:
+        """
+        Cached {"query", "response", "sources", "similarity"} or None.
+        Entries stored under another kb_version (the speaker's knowledge base
+        changed since) are stale: they miss and are dropped. This holds even
+        when the invalidation by ingest could not reach this process.
+        """
+        query = self._normalize(vector)
+        try:
+            ids, matrix = self._matrix(speaker)
+            if query is None or matrix is None or matrix.shape[1] != query.shape[0]:
+                self.misses += 1
+                return None
+
+            scores = matrix @ query
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                self.misses += 1
+                return None
+
+            raw = self.backend.get_entry(speaker, ids[best])
+            entry = json.loads(raw) if raw is not None else None
+            if entry is None or entry.get("kb_version", 0) != kb_version:
+                # Expired or built from an older knowledge base: drop it so the mirror stops matching it
+                self.backend.delete(speaker, [ids[best]])
+                self.misses += 1
+                return None
+        except Exception as e:
+            print(f"[ResponseCache] Lookup failed: {e}")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        entry["similarity"] = float(scores[best])
+        return entry
+
+    def store(self, speaker: str, query: str, vector, response: str, sources: List[Dict], kb_version: int = 0):
+        normalized = self._normalize(vector)
+        if normalized is None:
+            return
+        entry_id = f"{time.time_ns():020d}"
+        entry = json.dumps(
+            {"query": query, "response": response, "sources": sources, "kb_version": kb_version, "created_at": time.time()},
+            ensure_ascii=False,
+            default=str
+        )
+        try:
+            self.backend.put(speaker, entry_id, normalized.tobytes(), entry, self.ttl_seconds)
+            ids = sorted(self.backend.entry_ids(speaker))
+            if len(ids) > self.max_per_speaker:
+                self.backend.delete(speaker, ids[:len(ids) - self.max_per_speaker])
+        except Exception as e:
+            print(f"[ResponseCache] Store failed: {e}")
+
+    def invalidate_speaker(self, speaker: str):
+        """Forget every cached answer of a speaker (its knowledge base changed)"""
+        try:
+            self.backend.clear_speaker(speaker)
+        except Exception as e:
+            print(f"[ResponseCache] Invalidation failed for {speaker}: {e}")
+        with self._lock:
+            self._mirrors.pop(speaker, None)
+
+    async def alookup(self, speaker: str, vector, kb_version: int = 0) -> Optional[Dict]:
+        if self.backend.blocking:
+            return await asyncio.to_thread(self.lookup, speaker, vector, kb_version)
+        return self.lookup(speaker, vector, kb_version)
+
+    async def astore(self, speaker: str, query: str, vector, response: str, sources: List[Dict], kb_version: int = 0):
+        if self.backend.blocking:
+            return await asyncio.to_thread(self.store, speaker, query, vector, response, sources, kb_version)
+        return self.store(speaker, query, vector, response, sources, kb_version)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+def _create_backend():
+    name = os.getenv("RESPONSE_CACHE_BACKEND", "redis").lower()
+    if name == "redis":
+        try:
+            from ai_engine.database.connector import get_redis_client
+            client = get_redis_client()
+            client.ping()
+            return RedisResponseCacheBackend(client)
+        except Exception as e:
+            print(f"[ResponseCache] Redis unavailable ({e}), using in-memory backend.")
+    return InMemoryResponseCacheBackend()
+
+def get_response_cache() -> Optional[SemanticResponseCache]:
+    """Process-wide response cache, or None when RESPONSE_CACHE_BACKEND=off"""
+    global _shared_cache
+    if os.getenv("RESPONSE_CACHE_BACKEND", "redis").lower() == "off":
+        return None
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = SemanticResponseCache(_create_backend())
+    return _shared_cache
@@ -1,62 +1,239 @@
 
+import os
+import re
+import math
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from typing import List, Dict, Any
-from ai_engine.database.connector import get_qdrant_client, get_neo4j_driver
-from langchain_upstage import UpstageEmbeddings
+from neo4j import Query
+from ai_engine.database.connector import get_qdrant_client, get_neo4j_driver, get_embeddings
+from ai_engine.database.collections import SPEAKER_COLLECTION, get_profile_name, search_params
+from ai_engine.rag.embedding_cache import query_embedding_cache
+from ai_engine.rag.concept_matcher import ConceptMatcher
+from ai_engine.rag.reranker import Reranker, get_reranker
+from ai_engine.rag.sparse_index import SparseIndexReader
+from ai_engine.rag.local_index import LocalVectorIndexReader
+
+# Per-branch deadlines (seconds) for concurrent hybrid search
+VECTOR_TIMEOUT = float(os.getenv("RETRIEVER_VECTOR_TIMEOUT", "3.0"))
+GRAPH_TIMEOUT = float(os.getenv("RETRIEVER_GRAPH_TIMEOUT", "2.0"))
+SPARSE_TIMEOUT = float(os.getenv("RETRIEVER_SPARSE_TIMEOUT", "0.5"))
+
+RETRIEVER_MAX_WORKERS = int(os.getenv("RETRIEVER_MAX_WORKERS", "8"))
+# Calls in flight per branch (backend); beyond this a branch is skipped instead of queued,
+# so one slow backend cannot occupy the whole pool
+BRANCH_MAX_INFLIGHT = int(os.getenv("RETRIEVER_BRANCH_MAX_INFLIGHT", str(max(1, RETRIEVER_MAX_WORKERS // 2))))
+
+def _create_branch_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=RETRIEVER_MAX_WORKERS, thread_name_prefix="retriever")
+
+# Shared pool so branches fan out without spawning threads per request
+_branch_executor = _create_branch_executor()
+_branch_slots: Dict[str, threading.BoundedSemaphore] = {}
+_branch_slots_lock = threading.Lock()
+
+def _branch_slot(name: str) -> threading.BoundedSemaphore:
+    slot = _branch_slots.get(name)
+    if slot is None:
+        with _branch_slots_lock:
+            slot = _branch_slots.setdefault(name, threading.BoundedSemaphore(BRANCH_MAX_INFLIGHT))
+    return slot
+
+# Process-wide retriever shared by the orchestrator and BriefingService
+_shared_retriever = None
+_shared_retriever_lock = threading.Lock()
+
+def _reset_after_fork():
+    """Worker threads and pooled clients do not survive fork; rebuild lazily in the child."""
+    global _branch_executor, _branch_slots_lock, _shared_retriever, _shared_retriever_lock
+    _branch_executor = _create_branch_executor()
+    _branch_slots.clear()
+    _branch_slots_lock = threading.Lock()
+    _shared_retriever = None
+    _shared_retriever_lock = threading.Lock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+# Full-text index created by ai_engine/setup_neo4j.py
+CONCEPT_FULLTEXT_INDEX = "concept_fulltext"
+
+_LUCENE_SPECIAL = re.compile(r'([+\-!(){}\[\]^"~*?:\\/]|&&|\|\|)')
+
+def lucene_escape(text: str) -> str:
+    """Escape Lucene query syntax characters"""
+    return _LUCENE_SPECIAL.sub(r"\\\1", text)
+
+def build_fulltext_query(keywords: List[str], query: str) -> str:
+    """Phrase-match matched concept names (boosted on name), else the raw query terms"""
+    if keywords:
+        clauses = []
+        for keyword in keywords:
+            phrase = f'"{lucene_escape(keyword)}"'
+            clauses.append(f"name:{phrase}^2 OR definition:{phrase}")
+        return " OR ".join(f"({clause})" for clause in clauses)
+    # Lowercased so a term like AND/OR/NOT is searched for, not parsed as an operator
+    terms = [lucene_escape(term.lower()) for term in query.split() if len(term) > 1]
+    return " OR ".join(terms)
+
+def _qdrant_timeout(deadline: float = None):
+    # Qdrant takes whole seconds; never send 0, which would mean "no limit"
+    return max(1, math.ceil(deadline - time.monotonic())) if deadline is not None else None
+
+def _cypher(text: str, timeout: float = None) -> Query:
+    """Cypher with a server-side transaction timeout, so Neo4j stops work nobody waits for"""
+    return Query(text, timeout=timeout) if timeout is not None else Query(text)
+
+GRAPH_SEARCH_CYPHER = """
+CALL db.index.fulltext.queryNodes($index, $lucene_query, {limit: $limit})
+YIELD node, score
+RETURN node.name as name, node.definition as definition, score
+"""
+
+def rrf_fuse(result_lists: List[List[Dict]], top_k: int, k: int = 60) -> List[Dict]:
+    """Reciprocal Rank Fusion over any number of ranked result lists"""
+    scores = {}
+    for results in result_lists:
+        for rank, doc in enumerate(results):
+            content = doc['content']
+            if content not in scores:
+                scores[content] = {"doc": doc, "score": 0}
+            scores[content]["score"] += 1.0 / (k + rank + 1)
+
+    combined_results = sorted(scores.values(), key=lambda x: x["score"], reverse=True)
+    return [item["doc"] for item in combined_results[:top_k]]
 
 class HybridRetriever:
-    def __init__(self):
+    def __init__(self, reranker: Reranker = None):
+        # Clients are only probed here; the properties below resolve them from the
+        # connector registry on each use, so a forked worker gets its own sockets
         try:
-            self.qdrant = get_qdrant_client()
+            get_qdrant_client()
             self.qdrant_available = True
         except Exception as e:
             print(f"Warning: Qdrant not available: {e}")
-            self.qdrant = None
             self.qdrant_available = False
 
         try:
-            self.neo4j = get_neo4j_driver()
+            get_neo4j_driver()
             self.neo4j_available = True
         except Exception as e:
             print(f"Warning: Neo4j not available: {e}")
-            self.neo4j = None
             self.neo4j_available = False
 
+        # Local concept matcher replaces the per-query LLM keyword hop
+        self.concept_matcher = ConceptMatcher(get_neo4j_driver) if self.neo4j_available else None
+        if self.concept_matcher:
+            self.concept_matcher.refresh_async()
+
         # solar-embedding-1-large
-        self.embeddings = UpstageEmbeddings(model="solar-embedding-1-large")
-        self.collection_name = "speaker_knowledge"
+        self.embedding_model = "solar-embedding-1-large"
+        get_embeddings(self.embedding_model)
+        self.embedding_cache = query_embedding_cache
+        self.collection_name = SPEAKER_COLLECTION
+        self.collection_profile = get_profile_name()
 
-    def vector_search(self, query: str, top_k: int = 5, speaker_name: str = None) -> List[Dict]:
-        """Search in Vector DB (Qdrant)"""
-        if not self.qdrant_available:
+        # Offline fallback for vector search, loaded on first Qdrant failure and after re-exports
+        self.local_index = LocalVectorIndexReader()
+
+        # BM25 index over the same chunks, built by ai_engine/ingest.py
+        self.sparse_index = SparseIndexReader()
+
+        # Local score-fusion reranker unless RERANKER selects another mode
+        self.reranker = reranker or get_reranker()
+
+    @property
+    def qdrant(self):
+        return get_qdrant_client() if self.qdrant_available else None
+
+    @property
+    def neo4j(self):
+        return get_neo4j_driver() if self.neo4j_available else None
+
+    @property
+    def embeddings(self):
+        return get_embeddings(self.embedding_model)
+
+    def embed_query(self, query: str) -> List[float]:
+        """Embed a query, reusing cached vectors for repeated questions"""
+        vector = self.embedding_cache.get(query, self.embedding_model)
+        if vector is None:
+            vector = self.embeddings.embed_query(query)
+            self.embedding_cache.put(query, self.embedding_model, vector)
+        return vector
+
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Embed many queries with one embeddings request (cache hits are skipped)"""
+        vectors = [self.embedding_cache.get(q, self.embedding_model) for q in queries]
+        missing = list(dict.fromkeys(q for q, v in zip(queries, vectors) if v is None))
+        if missing:
+            fresh = dict(zip(missing, self._embed_query_batch(missing)))
+            for text, vector in fresh.items():
+                self.embedding_cache.put(text, self.embedding_model, vector)
+            vectors = [v if v is not None else fresh[q] for q, v in zip(queries, vectors)]
+        return vectors
+
+    def _embed_query_batch(self, texts: List[str]) -> List[List[float]]:
+        # UpstageEmbeddings.embed_documents would use the -passage model, so the
+        # batch goes straight to the client with the same -query model embed_query uses
+        if not hasattr(self.embeddings, "_invocation_params"):
+            # Offline stand-ins (AI_FAKE_BACKENDS) have no raw client
+            return self.embeddings.embed_documents(texts)
+        try:
+            params = self.embeddings._invocation_params
+            params["model"] = params["model"] + "-query"
+            data = self.embeddings.client.create(input=texts, **params).data
+            return [item.embedding for item in sorted(data, key=lambda item: item.index)]
+        except Exception as e:
+            print(f"Batch embedding failed, embedding one by one: {e}")
+            return [self.embeddings.embed_query(text) for text in texts]
+
+    def vector_search(self, query: str, top_k: int = 5, speaker_name: str = None, timeout: float = None) -> List[Dict]:
+        """Search in Vector DB (Qdrant), falling back to the local index if it is down"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        if not self.qdrant_available and self._get_local_index() is None:
             print("Vector DB unused (Offline Mode)")
             return []
 
         try:
-            vector = self.embeddings.embed_query(query)
+            vector = self.embed_query(query)
         except Exception as e:
             print(f"Embedding failed: {e}")
             return []
-        
-        search_params = {"limit": top_k}
-        from qdrant_client.http import models
-        filter = None
-        if speaker_name:
-            filter = models.Filter(
-                must=[
-                    models.FieldCondition(
-                        key="speaker_name",
-                        match=models.MatchValue(value=speaker_name)
-                    )
-                ]
+
+        if not self.qdrant_available:
+            return self._local_vector_search(vector, top_k, speaker_name)
+
+        try:
+            results = self.qdrant.search(
+                collection_name=self.collection_name,
+                query_vector=vector,
+                query_filter=self._speaker_filter(speaker_name),
+                search_params=search_params(self.collection_profile),
+                limit=top_k,
+                timeout=_qdrant_timeout(deadline)
             )
+        except Exception as e:
+            print(f"Qdrant search failed, using local vector index: {e}")
+            return self._local_vector_search(vector, top_k, speaker_name)
+        
+        return self._vector_hits(results)
 
-        results = self.qdrant.search(
-            collection_name=self.collection_name,
-            query_vector=vector,
-            query_filter=filter,
-            limit=top_k
+    def _speaker_filter(self, speaker_name: str = None):
+        if not speaker_name:
+            return None
+        from qdrant_client.http import models
+        return models.Filter(
+            must=[
+                models.FieldCondition(
+                    key="speaker_name",
+                    match=models.MatchValue(value=speaker_name)
+                )
+            ]
         )
-        
+
+    def _vector_hits(self, results) -> List[Dict]:
         return [
             {
                 "content": hit.payload.get("chunk_text", ""),
@@ -67,122 +244,237 @@ class HybridRetriever:
             for hit in results
         ]
 
-    def graph_search(self, query: str, top_k: int = 5, speaker_name: str = None) -> List[Dict]:
+    def _vector_search_many(self, queries: List[str], speaker_names: List[str], top_k: int, timeout: float = None) -> List[List[Dict]]:
+        """One embeddings request plus one Qdrant batch search for all queries"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        if not self.qdrant_available and self._get_local_index() is None:
+            return [[] for _ in queries]
+
+        vectors = self.embed_queries(queries)
+        if self.qdrant_available:
+            from qdrant_client.http import models
+            requests = [
+                models.SearchRequest(
+                    vector=vector,
+                    filter=self._speaker_filter(speaker_name),
+                    params=search_params(self.collection_profile),
+                    limit=top_k,
+                    with_payload=True
+                )
+                for vector, speaker_name in zip(vectors, speaker_names)
+            ]
+            try:
+                batch = self.qdrant.search_batch(
+                    collection_name=self.collection_name, requests=requests, timeout=_qdrant_timeout(deadline)
+                )
+                return [self._vector_hits(results) for results in batch]
+            except Exception as e:
+                print(f"Qdrant batch search failed, using local vector index: {e}")
+
+        return [
+            self._local_vector_search(vector, top_k, speaker_name)
+            for vector, speaker_name in zip(vectors, speaker_names)
+        ]
+
+    def _get_local_index(self):
+        """Exported NumPy index (python -m ai_engine.rag.local_index), reloaded when re-exported"""
+        return self.local_index.get()
+
+    def _local_vector_search(self, vector: List[float], top_k: int, speaker_name: str = None) -> List[Dict]:
+        index = self._get_local_index()
+        if index is None:
+            return []
+        return index.search(vector, top_k, speaker_name)
+
+    def sparse_search(self, query: str, top_k: int = 5, speaker_name: str = None, timeout: float = None) -> List[Dict]:
+        """Search the local BM25 index (exact phrase / keyword matches)"""
+        index = self.sparse_index.get()
+        if index is None:
+            return []
+        return index.search(query, top_k, speaker_name)
+
+    def _sparse_search_many(self, queries: List[str], speaker_names: List[str], top_k: int, timeout: float = None) -> List[List[Dict]]:
+        index = self.sparse_index.get()
+        if index is None:
+            return [[] for _ in queries]
+        return [index.search(query, top_k, speaker_name) for query, speaker_name in zip(queries, speaker_names)]
+
+    def graph_search(self, query: str, top_k: int = 5, speaker_name: str = None, timeout: float = None) -> List[Dict]:
         """Search in Knowledge Graph (Neo4j)"""
         if not self.neo4j_available:
             return []
 
-        # 1. Extract Keywords/Entities using LLM (simple implementation)
-        # Ideally, use a smaller model or specific extraction chain
-        from langchain_upstage import ChatUpstage
-        from langchain_core.prompts import ChatPromptTemplate
-        
+        # 1. Match known Concept names locally (no network call)
+        keywords = self.concept_matcher.match(query)
+        lucene_query = build_fulltext_query(keywords, query)
+        if not lucene_query:
+            return []
+
+        # 2. Full-text index lookup with real relevance scores
+        results = []
         try:
-            llm = ChatUpstage(model="solar-mini", temperature=0)
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", "Extract important keywords or entities from the user query for a knowledge graph search. Return only comma-separated keywords."),
-                ("user", query)
-            ])
-            chain = prompt | llm
-            response = chain.invoke({})
-            keywords = [k.strip() for k in response.content.split(',')]
+            with self.neo4j.session() as session:
+                graph_data = session.run(
+                    _cypher(GRAPH_SEARCH_CYPHER, timeout),
+                    index=CONCEPT_FULLTEXT_INDEX,
+                    lucene_query=lucene_query,
+                    limit=top_k
+                )
+                for record in graph_data:
+                    results.append(self._graph_hit(record))
         except Exception as e:
-            print(f"Entity extraction failed: {e}")
-            keywords = [query] # Fallback to using the whole query
+            print(f"Graph search failed (run ai_engine/setup_neo4j.py to create '{CONCEPT_FULLTEXT_INDEX}'): {e}")
+            
+        return results
+
+    def _graph_hit(self, record) -> Dict:
+        return {
+            "content": f"{record['name']}: {record['definition']}",
+            "metadata": {"source": "graph", "name": record['name']},
+            "score": record['score'],
+            "source": "graph"
+        }
+
+    def _graph_search_many(self, queries: List[str], top_k: int, timeout: float = None) -> List[List[Dict]]:
+        """All full-text lookups in a single Cypher round trip"""
+        results = [[] for _ in queries]
+        if not self.neo4j_available:
+            return results
+
+        requests = []
+        for idx, query in enumerate(queries):
+            lucene_query = build_fulltext_query(self.concept_matcher.match(query), query)
+            if lucene_query:
+                requests.append({"idx": idx, "lucene_query": lucene_query})
+        if not requests:
+            return results
 
-        # 2. Construct Cypher Query
-        # Search for nodes with names matching keywords
         cypher_query = """
-        MATCH (c:Concept)
-        WHERE any(keyword IN $keywords WHERE c.name CONTAINS keyword)
-        RETURN c.name as name, c.definition as definition
-        LIMIT $limit
+        UNWIND $requests AS req
+        CALL {
+            WITH req
+            CALL db.index.fulltext.queryNodes($index, req.lucene_query, {limit: $limit})
+            YIELD node, score
+            RETURN node, score
+        }
+        RETURN req.idx as idx, node.name as name, node.definition as definition, score
+        ORDER BY idx, score DESC
         """
-        
-        results = []
         try:
             with self.neo4j.session() as session:
-                graph_data = session.run(cypher_query, keywords=keywords, limit=top_k)
-                for record in graph_data:
-                    results.append({
-                        "content": f"{record['name']}: {record['definition']}",
-                        "metadata": {"source": "graph", "name": record['name']},
-                        "score": 1.0, # Default score for graph match
-                        "source": "graph"
-                    })
+                for record in session.run(_cypher(cypher_query, timeout), requests=requests, index=CONCEPT_FULLTEXT_INDEX, limit=top_k):
+                    results[record['idx']].append(self._graph_hit(record))
         except Exception as e:
-            print(f"Graph search failed: {e}")
-            
+            print(f"Batched graph search failed: {e}")
         return results
 
-    def hybrid_search(self, query: str, top_k: int = 5, speaker_name: str = None) -> List[Dict]:
-        """Combine Vector and Graph Search using RRF"""
-        # 1. Get results from both sources
-        vector_results = self.vector_search(query, top_k, speaker_name)
-        graph_results = self.graph_search(query, top_k, speaker_name)
-        
-        # 2. RRF (Reciprocal Rank Fusion)
-        k = 60 # Constant for RRF
-        scores = {}
-        
-        # Process Vector Results
-        for rank, doc in enumerate(vector_results):
-            content = doc['content']
-            if content not in scores:
-                scores[content] = {"doc": doc, "score": 0}
-            scores[content]["score"] += 1.0 / (k + rank + 1)
-            
-        # Process Graph Results
-        for rank, doc in enumerate(graph_results):
-            content = doc['content']
-            if content not in scores:
-                scores[content] = {"doc": doc, "score": 0}
-            scores[content]["score"] += 1.0 / (k + rank + 1)
-            
-        # 3. Sort by combined score
-        combined_results = sorted(scores.values(), key=lambda x: x["score"], reverse=True)
-        top_results = [item["doc"] for item in combined_results[:top_k]]
-        
-        # 4. Rerank (Optional but recommended for Advanced RAG)
+    def _run_branches(self, branches: Dict[str, tuple]) -> Dict[str, List[Dict]]:
+        """
+        Run retrieval branches concurrently, each with its own deadline.
+        branches: {name: (fn, args, timeout)}. A branch that errors or misses
+        its deadline yields no entry, so it simply drops out of fusion.
+        Each fn gets the time left as `timeout=` and hands it to its backend,
+        so a late call is stopped there instead of holding a pool worker; a
+        branch whose backend already has BRANCH_MAX_INFLIGHT calls running
+        is skipped without queueing.
+        """
+        start = time.monotonic()
+        futures = {}
+        for name, (fn, args, timeout) in branches.items():
+            slot = _branch_slot(name)
+            if not slot.acquire(blocking=False):
+                print(f"[Retriever] {name} branch has {BRANCH_MAX_INFLIGHT} calls in flight, skipping")
+                continue
+            deadline = start + timeout
+            futures[name] = (_branch_executor.submit(self._run_branch, slot, fn, args, deadline), timeout)
+
+        results = {}
+        for name, (future, timeout) in futures.items():
+            # Each branch gets its own absolute deadline measured from fan-out
+            remaining = max(0.0, start + timeout - time.monotonic())
+            try:
+                results[name] = future.result(timeout=remaining)
+            except FuturesTimeoutError:
+                # Not cancelled: a queued branch returns at once past its deadline and frees its slot
+                print(f"[Retriever] {name} branch missed {timeout}s deadline, skipping")
+            except Exception as e:
+                print(f"[Retriever] {name} branch failed: {e}")
+        return results
+
+    @staticmethod
+    def _run_branch(slot: threading.BoundedSemaphore, fn, args: tuple, deadline: float):
+        try:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # Waited in the queue past the deadline; nobody is waiting for the result
+                raise FuturesTimeoutError()
+            return fn(*args, timeout=remaining)
+        finally:
+            slot.release()
+
+    def hybrid_search(self, query: str, top_k: int = 5, speaker_name: str = None, concurrent: bool = True) -> List[Dict]:
+        """Combine Vector, Sparse (BM25) and Graph Search using RRF"""
+        # 1. Get results from all sources
+        if concurrent:
+            branch_results = self._run_branches({
+                "vector": (self.vector_search, (query, top_k, speaker_name), VECTOR_TIMEOUT),
+                "sparse": (self.sparse_search, (query, top_k, speaker_name), SPARSE_TIMEOUT),
+                "graph": (self.graph_search, (query, top_k, speaker_name), GRAPH_TIMEOUT),
+            })
+            vector_results = branch_results.get("vector", [])
+            sparse_results = branch_results.get("sparse", [])
+            graph_results = branch_results.get("graph", [])
+        else:
+            vector_results = self.vector_search(query, top_k, speaker_name)
+            sparse_results = self.sparse_search(query, top_k, speaker_name)
+            graph_results = self.graph_search(query, top_k, speaker_name)
+
+        # 2. RRF (Reciprocal Rank Fusion) over whichever branches returned
+        top_results = rrf_fuse([vector_results, sparse_results, graph_results], top_k)
+
+        # 3. Rerank (Optional but recommended for Advanced RAG)
         return self.rerank(query, top_results)
 
-    def rerank(self, query: str, results: List[Dict]) -> List[Dict]:
-        """Rerank results using Solar LLM as a judge"""
-        if not results:
+    def search_many(self, queries: List[str], speaker_names: List[str] = None, top_k: int = 5) -> List[List[Dict]]:
+        """
+        Hybrid search for many queries at once.
+        Embeds all queries in one request, sends one Qdrant batch search and
+        one Neo4j query, and returns reranked results aligned with `queries`.
+        Like hybrid_search, a failing branch only drops out of fusion.
+        speaker_names may be None, a single name for all queries, or one per query.
+        """
+        if not queries:
             return []
-            
-        from langchain_upstage import ChatUpstage
-        from langchain_core.prompts import ChatPromptTemplate
-        
-        try:
-            # Use solar-mini for speed in reranking
-            llm = ChatUpstage(model="solar-mini", temperature=0)
-            
-            candidates = "\n\n".join([f"[{i}] {doc['content'][:200]}..." for i, doc in enumerate(results)])
-            
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", """You are a relevance judge. Given a query and a list of document snippets, selects the indices of the documents that are most relevant to the query.
-                Return only the indices (0-indexed) of the relevant documents in order of relevance, separated by commas.
-                If none are relevant, return nothing."""),
-                ("user", f"Query: {query}\n\nDocuments:\n{candidates}")
-            ])
-            
-            chain = prompt | llm
-            response = chain.invoke({})
-            
-            try:
-                indices = [int(idx.strip()) for idx in response.content.split(',') if idx.strip().isdigit()]
-                reranked_results = [results[i] for i in indices if i < len(results)]
-                
-                # Append any missing docs at the end (or discard if strict)
-                # For now, let's keep only what LLM selected to reduce noise
-                if not reranked_results:
-                     return results # Fallback if LLM returns nothing
-                     
-                return reranked_results
-            except ValueError:
-                return results # Fallback on parsing error
-                
-        except Exception as e:
-            print(f"Reranking failed: {e}")
-            return results
+        if speaker_names is None or isinstance(speaker_names, str):
+            speaker_names = [speaker_names] * len(queries)
+        if len(speaker_names) != len(queries):
+            raise ValueError("speaker_names must align with queries")
+
+        branch_results = self._run_branches({
+            "vector": (self._vector_search_many, (queries, speaker_names, top_k), VECTOR_TIMEOUT),
+            "sparse": (self._sparse_search_many, (queries, speaker_names, top_k), SPARSE_TIMEOUT),
+            "graph": (self._graph_search_many, (queries, top_k), GRAPH_TIMEOUT),
+        })
+        empty = [[] for _ in queries]
+        vector_batches = branch_results.get("vector", empty)
+        sparse_batches = branch_results.get("sparse", empty)
+        graph_batches = branch_results.get("graph", empty)
+
+        combined = []
+        for i, query in enumerate(queries):
+            top_results = rrf_fuse([vector_batches[i], sparse_batches[i], graph_batches[i]], top_k)
+            combined.append(self.rerank(query, top_results))
+        return combined
+
+    def rerank(self, query: str, results: List[Dict]) -> List[Dict]:
+        """Rerank results with the configured reranker (local by default)"""
+        return self.reranker.rerank(query, results)
+
+def get_retriever() -> HybridRetriever:
+    """Get the process-wide HybridRetriever (created on first use)"""
+    global _shared_retriever
+    if _shared_retriever is None:
+        with _shared_retriever_lock:
+            if _shared_retriever is None:
+                _shared_retriever = HybridRetriever()
+    return _shared_retriever
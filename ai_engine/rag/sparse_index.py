@@ -0,0 +1,251 @@
+import os
+import re
+import json
+import math
+import time
+import heapq
+import shutil
+import threading
+import unicodedata
+from array import array
+from collections import Counter
+from typing import Dict, List, Optional
+
+DEFAULT_INDEX_DIR = os.getenv(
+    "SPARSE_INDEX_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "sparse_index")
+)
+
+_WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+_HANGUL_PATTERN = re.compile(r"[가-힣ㄱ-ㆎ]")
+
+def tokenize(text: str) -> List[str]:
+    """
+    Korean-friendly tokenization without a morphological analyzer.
+    Hangul words become character bigrams (so '경제안보' matches '경제 안보는'),
+    other words are kept whole.
+    """
+    text = unicodedata.normalize("NFKC", text or "").casefold()
+    terms = []
+    for word in _WORD_PATTERN.findall(text):
+        if _HANGUL_PATTERN.search(word):
+            if len(word) == 1:
+                terms.append(word)
+            else:
+                terms.extend(word[i:i + 2] for i in range(len(word) - 1))
+        elif len(word) > 1:
+            terms.append(word)
+    return terms
+
+class SparseIndex:
+    """
+    In-process BM25 index over chunk_text.
+
+    Postings live in flat typed arrays (uint32 doc ids, uint16 term
+    frequencies) addressed by a term -> (offset, length) vocabulary, and the
+    whole index is persisted next to the payloads it was built from.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.docs: List[Dict] = []
+        self.vocab: Dict[str, List[int]] = {}
+        self.postings = array("I")
+        self.tfs = array("H")
+        self.doc_lengths = array("I")
+        self.doc_speakers = array("H")
+        self.speakers: List[str] = []
+        self.avgdl = 0.0
+        # Per-speaker knowledge-base version, bumped whenever a speaker's chunks change
+        self.kb_versions: Dict[str, int] = {}
+
+    def __len__(self):
+        return len(self.docs)
+
+    def add_documents(self, docs: List[Dict]):
+        """
+        Add payloads ({chunk_text, speaker_name, source, ...}) and rebuild.
+        Chunks previously indexed for the same (speaker_name, source) are
+        replaced, so re-ingesting a file does not double its weight.
+        """
+        replaced = {(d.get("speaker_name"), d.get("source")) for d in docs}
+        kept = [d for d in self.docs if (d.get("speaker_name"), d.get("source")) not in replaced]
+        self.build(kept + list(docs))
+        # Timestamps rather than counters, so a rebuilt index never reuses an old version
+        version = time.time_ns()
+        for speaker in {d.get("speaker_name") or "" for d in docs}:
+            self.kb_versions[speaker] = version
+
+    def kb_version(self, speaker_name: str) -> int:
+        """Changes whenever the speaker's chunks do (0 if never ingested through add_documents)"""
+        return self.kb_versions.get(speaker_name or "", 0)
+
+    def build(self, docs: List[Dict]):
+        self.docs = list(docs)
+        term_postings: Dict[str, List[tuple]] = {}
+        speaker_codes = {}
+        self.doc_lengths = array("I")
+        self.doc_speakers = array("H")
+
+        for doc_id, doc in enumerate(self.docs):
+            terms = tokenize(doc.get("chunk_text", ""))
+            self.doc_lengths.append(len(terms))
+            speaker = doc.get("speaker_name") or ""
+            if speaker not in speaker_codes:
+                speaker_codes[speaker] = len(speaker_codes)
+            self.doc_speakers.append(speaker_codes[speaker])
+            for term, tf in Counter(terms).items():
+                term_postings.setdefault(term, []).append((doc_id, min(tf, 65535)))
+
+        self.speakers = list(speaker_codes)
+        self.vocab = {}
+        self.postings = array("I")
+        self.tfs = array("H")
+        for term, entries in term_postings.items():
+            self.vocab[term] = [len(self.postings), len(entries)]
+            for doc_id, tf in entries:
+                self.postings.append(doc_id)
+                self.tfs.append(tf)
+
+        total = sum(self.doc_lengths)
+        self.avgdl = total / len(self.docs) if self.docs else 0.0
+
+    def search(self, query: str, top_k: int = 5, speaker_name: str = None) -> List[Dict]:
+        if not self.docs:
+            return []
+
+        speaker_code = None
+        if speaker_name:
+            if speaker_name not in self.speakers:
+                return []
+            speaker_code = self.speakers.index(speaker_name)
+
+        n_docs = len(self.docs)
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            entry = self.vocab.get(term)
+            if entry is None:
+                continue
+            offset, length = entry
+            idf = math.log(1 + (n_docs - length + 0.5) / (length + 0.5))
+            for i in range(offset, offset + length):
+                doc_id = self.postings[i]
+                if speaker_code is not None and self.doc_speakers[doc_id] != speaker_code:
+                    continue
+                tf = self.tfs[i]
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / self.avgdl)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        top = heapq.nlargest(top_k, scores.items(), key=lambda x: x[1])
+        return [
+            {
+                "content": self.docs[doc_id].get("chunk_text", ""),
+                "metadata": self.docs[doc_id],
+                "score": score,
+                "source": "sparse"
+            }
+            for doc_id, score in top
+        ]
+
+    def save(self, path: str = DEFAULT_INDEX_DIR):
+        """
+        Write the data files into a fresh generation directory, then swap
+        meta.json (which names the generation) in with os.replace. Readers
+        always see one complete file set; the previous generation is kept
+        for readers that are still loading it, older ones are removed.
+        """
+        os.makedirs(path, exist_ok=True)
+        generation = f"gen-{time.time_ns()}"
+        data_dir = os.path.join(path, generation)
+        os.makedirs(data_dir)
+        with open(os.path.join(data_dir, "docs.jsonl"), "w", encoding="utf-8") as f:
+            for doc in self.docs:
+                f.write(json.dumps(doc, ensure_ascii=False) + "\n")
+        for name in ("postings", "tfs", "doc_lengths", "doc_speakers"):
+            with open(os.path.join(data_dir, f"{name}.bin"), "wb") as f:
+                getattr(self, name).tofile(f)
+
+        previous = _generation(path)
+        tmp_path = os.path.join(path, "meta.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "k1": self.k1,
+                "b": self.b,
+                "avgdl": self.avgdl,
+                "speakers": self.speakers,
+                "vocab": self.vocab,
+                "kb_versions": self.kb_versions,
+                "generation": generation,
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, os.path.join(path, "meta.json"))
+
+        for name in os.listdir(path):
+            if name.startswith("gen-") and name not in (generation, previous):
+                shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_INDEX_DIR) -> Optional["SparseIndex"]:
+        """Load a persisted index, or None if none has been built yet"""
+        meta_path = os.path.join(path, "meta.json")
+        if not os.path.exists(meta_path):
+            return None
+
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        index = cls(k1=meta["k1"], b=meta["b"])
+        index.avgdl = meta["avgdl"]
+        index.speakers = meta["speakers"]
+        index.vocab = meta["vocab"]
+        index.kb_versions = meta.get("kb_versions", {})
+        # Indexes saved before generations existed keep their files next to meta.json
+        data_dir = os.path.join(path, meta.get("generation", ""))
+        with open(os.path.join(data_dir, "docs.jsonl"), "r", encoding="utf-8") as f:
+            index.docs = [json.loads(line) for line in f if line.strip()]
+        for name in ("postings", "tfs", "doc_lengths", "doc_speakers"):
+            arr = getattr(index, name)
+            with open(os.path.join(data_dir, f"{name}.bin"), "rb") as f:
+                arr.frombytes(f.read())
+        return index
+
+def _generation(path: str) -> Optional[str]:
+    """Generation directory the current meta.json points to"""
+    try:
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            return json.load(f).get("generation")
+    except (OSError, ValueError):
+        return None
+
+class SparseIndexReader:
+    """Holds the on-disk index and reloads it when ingest rewrites it"""
+
+    def __init__(self, path: str = DEFAULT_INDEX_DIR):
+        self.path = path
+        self._index: Optional[SparseIndex] = None
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def _meta_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(os.path.join(self.path, "meta.json")).st_mtime
+        except OSError:
+            return None
+
+    def needs_reload(self) -> bool:
+        """True if get() would read the index from disk (async callers run it in a thread then)"""
+        mtime = self._meta_mtime()
+        return mtime is not None and mtime != self._mtime
+
+    def get(self) -> Optional[SparseIndex]:
+        mtime = self._meta_mtime()
+        if mtime is None or mtime == self._mtime:
+            return self._index
+        with self._lock:
+            # Concurrent callers wait for one load instead of each reading the files
+            if mtime != self._mtime:
+                try:
+                    self._index = SparseIndex.load(self.path)
+                    self._mtime = mtime
+                except Exception as e:
+                    print(f"[SparseIndex] Failed to load index from {self.path}: {e}")
+        return self._index
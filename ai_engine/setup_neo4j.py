@@ -16,12 +16,23 @@ def create_constraints(tx):
     # Document ID uniqueness
     tx.run("CREATE CONSTRAINT IF NOT EXISTS FOR (d:Document) REQUIRE d.doc_id IS UNIQUE")
 
+def create_fulltext_indexes(tx):
+    """Create full-text indexes used by HybridRetriever.graph_search."""
+    # CJK analyzer tokenizes Hangul into bigrams so Korean terms are searchable
+    tx.run("""
+    CREATE FULLTEXT INDEX concept_fulltext IF NOT EXISTS
+    FOR (c:Concept) ON EACH [c.name, c.definition]
+    OPTIONS {indexConfig: {`fulltext.analyzer`: 'cjk'}}
+    """)
+
 def setup_graph():
     driver = GraphDatabase.driver(URI, auth=AUTH)
     try:
         with driver.session() as session:
             session.execute_write(create_constraints)
             print("✅ Neo4j constraints created successfully.")
+            session.execute_write(create_fulltext_indexes)
+            print("✅ Neo4j full-text indexes created successfully.")
     except Exception as e:
         print(f"Failed to setup Neo4j: {e}")
     finally:
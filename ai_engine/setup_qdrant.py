@@ -1,32 +1,39 @@
+import argparse
+from ai_engine.database.connector import get_qdrant_client
+from ai_engine.database.collections import (
+    SPEAKER_COLLECTION, COLLECTION_PROFILES, ensure_collection, rebuild_collection, get_profile_name,
+    migrate_speaker_partitioning
+)
 
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams
+# Initialize Qdrant Client (QDRANT_URL / QDRANT_API_KEY, defaults to localhost:6333;
+# QDRANT_PREFER_GRPC=1 switches to gRPC on QDRANT_GRPC_PORT)
+client = get_qdrant_client()
 
-# Initialize Qdrant Client
-# Note: Ensure Qdrant is running on localhost:6333
-client = QdrantClient(host="localhost", port=6333)
-
-def setup_collection():
-    collection_name = "speaker_knowledge"
+def setup_collection(profile: str = None):
+    collection_name = SPEAKER_COLLECTION
     
-    # Check if collection exists
-    collections = client.get_collections()
-    if any(c.name == collection_name for c in collections.collections):
+    # Create Collection if missing
+    if not ensure_collection(client, collection_name, profile):
         print(f"Collection '{collection_name}' already exists.")
         return
 
-    # Create Collection
-    client.create_collection(
-        collection_name=collection_name,
-        vectors_config=VectorParams(
-            size=3072,  # text-embedding-3-large dimension
-            distance=Distance.COSINE
-        )
-    )
-    print(f"✅ Qdrant collection '{collection_name}' created successfully.")
+    print(f"✅ Qdrant collection '{collection_name}' created successfully ({get_profile_name(profile)} profile).")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create or rebuild the speaker_knowledge collection")
+    parser.add_argument("--profile", type=str, choices=list(COLLECTION_PROFILES), default=None,
+                        help="Storage profile (default: QDRANT_COLLECTION_PROFILE or 'scalar')")
+    parser.add_argument("--rebuild", action="store_true", help="Convert an existing collection to the profile")
+    parser.add_argument("--migrate-tenants", action="store_true",
+                        help="Index speaker_name as tenant key and backfill legacy points")
+    args = parser.parse_args()
+
     try:
-        setup_collection()
+        if args.migrate_tenants:
+            migrate_speaker_partitioning(client, SPEAKER_COLLECTION)
+        elif args.rebuild:
+            rebuild_collection(client, SPEAKER_COLLECTION, args.profile)
+        else:
+            setup_collection(args.profile)
     except Exception as e:
         print(f"Failed to setup Qdrant: {e}")
@@ -1,14 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, Query, status, BackgroundTasks
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import List, Optional
 import uuid
 import time
+import json
+import asyncio
 
 from backend.database.session import get_db, SessionLocal
 from backend.database.models import User, Conversation, Message, Speaker
 from backend.api.auth import get_current_user
 from backend.services.ai_service import AIService
+from backend.services.message_store import ChatTurn, get_message_store
+from ai_engine.rag.conversation_memory import get_conversation_memory
+
+conversation_memory = get_conversation_memory()
+# Question + answer written together after generation (group commit with MESSAGE_WRITE_BEHIND=1)
+message_store = get_message_store()
 
 router = APIRouter()
 
@@ -23,6 +33,40 @@ class ChatResponse(BaseModel):
     response: str
     sources: list
 
+def _prepare_turn(request: ChatRequest, db: Session, current_user: User) -> ChatTurn:
+    """
+    Validate speaker and conversation ownership (reads only).
+    Nothing is written yet: the whole turn is persisted after generation,
+    and the request session's connection is released before the LLM call.
+    """
+    try:
+        # 1. Validate Speaker
+        speaker = db.query(Speaker.id, Speaker.name).filter(Speaker.id == request.speaker_id).first()
+        if not speaker:
+            raise HTTPException(status_code=404, detail="Speaker not found")
+
+        # 2. Existing conversation must belong to the user; otherwise a new one is created on save
+        turn = ChatTurn(
+            conversation_id=request.conversation_id,
+            user_id=current_user.id,
+            speaker_id=speaker.id,
+            user_message=request.message
+        )
+        if not request.conversation_id:
+            turn.conversation_id = str(uuid.uuid4())
+            turn.new_conversation = True
+            turn.title = f"Chat with {speaker.name}"
+        else:
+            exists = db.query(Conversation.id).filter(
+                Conversation.id == request.conversation_id,
+                Conversation.user_id == current_user.id
+            ).first()
+            if not exists:
+                raise HTTPException(status_code=404, detail="Conversation not found")
+        return turn
+    finally:
+        db.close()
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat(
     request: ChatRequest, 
@@ -30,107 +74,195 @@ async def chat(
     current_user: User = Depends(get_current_user)
 ):
     """Real-time AI Advisory Chat with Persistence"""
+    turn = _prepare_turn(request, db, current_user)
     
-    # 1. Validate Speaker
-    speaker = db.query(Speaker).filter(Speaker.id == request.speaker_id).first()
-    if not speaker:
-        raise HTTPException(status_code=404, detail="Speaker not found")
-
-    # 2. Get or Create Conversation
-    conversation_id = request.conversation_id
-    if not conversation_id:
-        conversation_id = str(uuid.uuid4())
-        conversation = Conversation(
-            id=conversation_id,
-            user_id=current_user.id,
-            speaker_id=speaker.id,
-            summary=f"Chat with {speaker.name}"
-        )
-        db.add(conversation)
-        db.commit()
-    else:
-        # Verify ownership
-        conversation = db.query(Conversation).filter(
-            Conversation.id == conversation_id,
-            Conversation.user_id == current_user.id
-        ).first()
-        if not conversation:
-            raise HTTPException(status_code=404, detail="Conversation not found")
-
-    # 3. Save User Message
-    user_msg = Message(
-        conversation_id=conversation_id,
-        role="user",
-        content=request.message
-    )
-    db.add(user_msg)
-    db.commit()
-    
-    # 4. Generate AI Response
+    # 3. Generate AI Response (no DB connection held meanwhile)
     ai_service = AIService()
-    response_data = ai_service.generate_response(
+    response_data = await ai_service.agenerate_response(
         speaker_id=str(request.speaker_id),
-        user_id=current_user.id,
+        user_id=turn.user_id,
         message=request.message,
-        conversation_id=conversation_id
-    )
-    
-    # 5. Save AI Message
-    ai_msg = Message(
-        conversation_id=conversation_id,
-        role="assistant",
-        content=response_data["response"],
-        sources=response_data["sources"]
+        conversation_id=turn.conversation_id
     )
-    db.add(ai_msg)
-    db.commit()
     
-    # 6. Update Conversation Timestamp
-    conversation.updated_at = ai_msg.created_at
-    db.commit()
+    # 4. Save conversation, question and answer in one transaction
+    turn.assistant_message = response_data["response"]
+    turn.sources = response_data["sources"] or []
+    message_id = await message_store.asave_turn(turn)
+
+    # 5. Fold turns that left the recent window into the summary (background)
+    conversation_memory.schedule_fold(turn.conversation_id)
     
     return ChatResponse(
-        conversation_id=conversation_id,
-        message_id=str(ai_msg.id), # DB ID
-        response=ai_msg.content,
-        sources=ai_msg.sources or []
+        conversation_id=turn.conversation_id,
+        message_id=str(message_id), # DB ID
+        response=turn.assistant_message,
+        sources=turn.sources
+    )
+
+# Saves started by streams; referenced until done so they outlive a cancelled request
+_pending_saves = set()
+
+def _on_save_done(save: asyncio.Future):
+    _pending_saves.discard(save)
+    if not save.cancelled() and save.exception() is not None:
+        print(f"[Advisory] Failed to save streamed turn: {save.exception()}")
+
+def _start_save(turn: ChatTurn) -> asyncio.Future:
+    """Persist a turn off the event loop; it completes even if the stream is cancelled"""
+    save = asyncio.ensure_future(message_store.asave_turn(turn))
+    _pending_saves.add(save)
+    save.add_done_callback(_on_save_done)
+    return save
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+@router.post("/chat/stream")
+async def chat_stream(
+    request: ChatRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Streaming AI Advisory Chat (Server-Sent Events).
+    Emits `sources` (retrieved documents) first, then `token` chunks,
+    then `done` with the saved message id, or `error` if generation failed
+    (the partial answer is still saved, without the error text).
+    """
+    turn = _prepare_turn(request, db, current_user)
+    conversation_id = turn.conversation_id
+
+    async def event_stream():
+        ai_service = AIService()
+        chunks = []
+        save = None
+        error = None
+        try:
+            async for event, data in ai_service.astream_response(
+                speaker_id=str(request.speaker_id),
+                user_id=turn.user_id,
+                message=request.message,
+                conversation_id=conversation_id
+            ):
+                if event == "sources":
+                    turn.sources = data
+                    yield _sse("sources", {"conversation_id": conversation_id, "sources": data})
+                elif event == "error":
+                    error = data
+                else:
+                    chunks.append(data)
+                    yield _sse("token", {"content": data})
+
+            # Claimed before awaiting: a cancellation from here on must not save the turn twice
+            turn.assistant_message = "".join(chunks) if chunks or error is None else None
+            save = _start_save(turn)
+            message_id = await asyncio.shield(save)
+            conversation_memory.schedule_fold(conversation_id)
+            if error is not None:
+                yield _sse("error", {"conversation_id": conversation_id, "message": error})
+            else:
+                yield _sse("done", {"conversation_id": conversation_id, "message_id": str(message_id)})
+        finally:
+            # Client went away mid-stream: keep the question and what was generated so far
+            if save is None:
+                turn.assistant_message = "".join(chunks) if chunks else None
+                _start_save(turn)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
+MAX_PAGE_SIZE = 200
+
 @router.get("/conversations/{conversation_id}")
 async def get_conversation(
     conversation_id: str,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    after: Optional[int] = None,
+    before: Optional[int] = None,
+    latest: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    include_sources: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get Conversation History"""
-    conversation = db.query(Conversation).options(
-        joinedload(Conversation.messages),
-        joinedload(Conversation.speaker)
-    ).filter(
+    """
+    Get Conversation History, oldest message first.
+    Keyset pagination over (created_at, id), served by ix_messages_conversation_created:
+      latest=N               the newest N messages
+      after=ID&limit=N       N messages following message ID (e.g. polling for new ones)
+      before=ID&limit=N      N messages preceding message ID (scrolling back)
+      limit=N                the first N messages
+    Without any of these, every message is returned. Sources are only
+    loaded with include_sources=true.
+    """
+    conversation = db.query(
+        Conversation.id, Conversation.summary, Conversation.updated_at, Speaker.id.label("speaker_id"), Speaker.name
+    ).outerjoin(Speaker, Conversation.speaker_id == Speaker.id).filter(
         Conversation.id == conversation_id,
         Conversation.user_id == current_user.id
     ).first()
     
     if not conversation:
         raise HTTPException(status_code=404, detail="Conversation not found")
-        
+
+    columns = [Message.id, Message.role, Message.content, Message.created_at]
+    if include_sources:
+        columns.append(Message.sources)
+    query = db.query(*columns).filter(Message.conversation_id == conversation_id)
+    position = tuple_(Message.created_at, Message.id)
+
+    def anchor(message_id: int):
+        # Compare against the stored timestamp of the cursor message itself
+        created_at = select(Message.created_at).where(Message.id == message_id).scalar_subquery()
+        return tuple_(created_at, message_id)
+
+    backwards = latest is not None or before is not None
+    page_size = latest or limit
+    if after is not None:
+        query = query.filter(position > anchor(after))
+    if before is not None:
+        query = query.filter(position < anchor(before))
+    if backwards:
+        query = query.order_by(Message.created_at.desc(), Message.id.desc())
+    else:
+        query = query.order_by(Message.created_at, Message.id)
+
+    rows = query.limit(page_size + 1).all() if page_size else query.all()
+    has_more = bool(page_size) and len(rows) > page_size
+    rows = rows[:page_size] if page_size else rows
+    if backwards:
+        rows.reverse()
+
+    messages = []
+    for msg in rows:
+        item = {
+            "message_id": str(msg.id),
+            "role": msg.role,
+            "content": msg.content,
+            "created_at": msg.created_at
+        }
+        if include_sources:
+            item["sources"] = msg.sources
+        messages.append(item)
+
     return {
         "conversation_id": conversation.id,
         "speaker": {
-            "speaker_id": conversation.speaker.id,
-            "name": conversation.speaker.name
+            "speaker_id": conversation.speaker_id,
+            "name": conversation.name
         },
-        "messages": [
-            {
-                "message_id": str(msg.id),
-                "role": msg.role,
-                "content": msg.content,
-                "sources": msg.sources,
-                "created_at": msg.created_at
-            } for msg in conversation.messages
-        ],
+        "messages": messages,
         "summary": conversation.summary,
-        "updated_at": conversation.updated_at
+        "updated_at": conversation.updated_at,
+        "page": {
+            "has_more": has_more,
+            # Older page: before=prev_cursor; newer messages: after=next_cursor
+            "prev_cursor": messages[0]["message_id"] if messages else (str(before) if before is not None else None),
+            "next_cursor": messages[-1]["message_id"] if messages else (str(after) if after is not None else None)
+        }
     }
 
 class PreAdvisoryRequest(BaseModel):
@@ -158,7 +290,6 @@ class DebateRequest(BaseModel):
     speaker_id_2: int
 
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 
 async def run_debate_process(conversation_id: str, topic: str, speaker_id_1: int, speaker_id_2: int, user_id: int):
     """
@@ -189,22 +320,21 @@ async def run_debate_process(conversation_id: str, topic: str, speaker_id_1: int
         prompt_1 = f"Topic: {topic}\n\nPlease provide your core perspective on this topic based on your philosophy. **Keep it concise (max 3 bullets)**."
         prompt_2 = f"Topic: {topic}\n\nPlease provide your core perspective on this topic based on your philosophy. **Keep it concise (max 3 bullets)**."
 
-        # Helper for blocking calls
-        def generate_sync(s_id, prompt):
+        async def generate(s_id, prompt):
             try:
-                return ai_service.generate_response(str(s_id), user_id, prompt, conversation_id)
+                # Debate prompts quote the earlier statements themselves
+                return await ai_service.agenerate_response(str(s_id), user_id, prompt, conversation_id, use_memory=False)
             except Exception as e:
                 print(f"Gen Error {s_id}: {e}")
                 return {"response": f"(Error generating response for Speaker {s_id})"}
 
         # 1. Parallel Execution
-        loop = asyncio.get_event_loop()
         print(f"[Debate] Requesting parallel statements...")
         
-        future1 = loop.run_in_executor(None, generate_sync, speaker_id_1, prompt_1)
-        future2 = loop.run_in_executor(None, generate_sync, speaker_id_2, prompt_2)
-        
-        resp_1, resp_2 = await asyncio.gather(future1, future2)
+        resp_1, resp_2 = await asyncio.gather(
+            generate(speaker_id_1, prompt_1),
+            generate(speaker_id_2, prompt_2)
+        )
         
         content_1 = resp_1['response']
         content_2 = resp_2['response']
@@ -244,7 +374,7 @@ async def run_debate_process(conversation_id: str, topic: str, speaker_id_1: int
         
         # Use Speaker 2 (or a neutral persona if ID 0 existed) as Mod
         # We'll just use Speaker 2 for now, or maybe Speaker 1. Let's use Speaker 1 to balance.
-        resp_mod = await loop.run_in_executor(None, generate_sync, speaker_id_1, prompt_mod)
+        resp_mod = await generate(speaker_id_1, prompt_mod)
         content_mod = resp_mod['response']
 
         msg_mod = Message(
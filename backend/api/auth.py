@@ -4,12 +4,17 @@ from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
+from collections import OrderedDict
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import make_transient_to_detached
 import os
+import time
+import threading
 
 from backend.database.session import get_db
 from backend.database.models import User
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 router = APIRouter()
 
@@ -59,6 +64,79 @@ def create_refresh_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+class PrincipalCache:
+    """
+    TTL + LRU cache of authenticated users keyed by token subject (email),
+    holding column snapshots rather than ORM instances (those belong to one session).
+    Entries are invalidated when a user is changed or deleted; in a
+    multi-worker deployment other workers converge within the TTL.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so a lookup that raced with it is not cached
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, subject: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[subject]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(subject)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, subject: str, snapshot: Dict, generation: int):
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[subject] = (time.monotonic() + self.ttl_seconds, snapshot)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *subjects: str):
+        with self._lock:
+            self.generation += 1
+            for subject in subjects:
+                if subject:
+                    self._entries.pop(subject, None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+principal_cache = PrincipalCache(
+    max_entries=int(os.getenv("PRINCIPAL_CACHE_SIZE", "1024")),
+    ttl_seconds=float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+)
+
+# The password hash never enters the cache; it stays unloaded on cached principals
+# (a handler that reads it triggers a normal lazy load)
+_USER_COLUMNS = [attr.key for attr in sa_inspect(User).column_attrs if attr.key != "password_hash"]
+
+def invalidate_principal(*emails: str):
+    """Drop cached principals after a user's row changed (old and new email on renames)"""
+    principal_cache.invalidate(*emails)
+
 async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -75,9 +153,19 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
             raise credentials_exception
     except JWTError:
         raise credentials_exception
+
+    snapshot = principal_cache.get(email)
+    if snapshot is not None:
+        # Rebuild the row without a SELECT and attach it, so handlers can still modify it
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    generation = principal_cache.generation
     user = db.query(User).filter(User.email == email).first()
     if user is None:
         raise credentials_exception
+    principal_cache.put(email, {key: getattr(user, key) for key in _USER_COLUMNS}, generation)
     return user
 
 async def require_admin(current_user: User = Depends(get_current_user)):
@@ -88,6 +176,11 @@ async def require_admin(current_user: User = Depends(get_current_user)):
         )
     return current_user
 
+@router.get("/principal-cache")
+async def principal_cache_stats(current_admin: User = Depends(require_admin)):
+    """Hit rate of the authenticated-user cache"""
+    return principal_cache.stats()
+
 @router.post("/register", response_model=Token)
 def register(user: UserCreate, db: Session = Depends(get_db)):
     db_user = db.query(User).filter(User.email == user.email).first()
@@ -1,15 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 from pydantic import BaseModel
 
 from backend.database.session import get_db
 from backend.database.models import Booking, User, Speaker
 from backend.api.auth import get_current_user, require_admin
+from backend.services.availability_service import (
+    AVAILABILITY_MAX_DAYS,
+    BOOKING_DURATION,
+    find_availability,
+    find_conflict,
+    to_storage_time,
+)
 
 router = APIRouter()
 
+MAX_PAGE_SIZE = 500
+
 # Schemas
 class BookingCreate(BaseModel):
     speaker_id: int
@@ -18,6 +28,7 @@ class BookingCreate(BaseModel):
 
 class BookingResponse(BaseModel):
     id: int
+    speaker_id: Optional[int] = None
     speaker_name: str
     booking_time: datetime
     status: str
@@ -28,15 +39,28 @@ class BookingResponse(BaseModel):
 
 @router.post("/", response_model=BookingResponse)
 def create_booking(booking: BookingCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    # Verify speaker exists
-    speaker = db.query(Speaker).filter(Speaker.id == booking.speaker_id).first()
+    # Verify speaker exists; the row lock serializes concurrent bookings of one speaker (Postgres)
+    speaker = db.query(Speaker).filter(Speaker.id == booking.speaker_id).with_for_update().first()
     if not speaker:
         raise HTTPException(status_code=404, detail="Speaker not found")
 
+    # One canonical value for the conflict check, the insert and the response
+    booking_time = to_storage_time(booking.booking_time)
+
+    # Conflict check in the same transaction as the insert
+    conflict = find_conflict(db, booking.speaker_id, booking_time)
+    if conflict:
+        db.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail=f"{speaker.name} is already booked at {conflict.booking_time.isoformat()} "
+                   f"({int(BOOKING_DURATION.total_seconds() // 60)} min sessions)"
+        )
+
     new_booking = Booking(
         user_id=current_user.id,
         speaker_id=booking.speaker_id,
-        booking_time=booking.booking_time,
+        booking_time=booking_time,
         notes=booking.notes,
         status="confirmed" # Auto-confirm for demo
     )
@@ -46,28 +70,112 @@ def create_booking(booking: BookingCreate, db: Session = Depends(get_db), curren
     
     return BookingResponse(
         id=new_booking.id,
+        speaker_id=speaker.id,
         speaker_name=speaker.name,
         booking_time=new_booking.booking_time,
         status=new_booking.status,
         notes=new_booking.notes
     )
 
+def _booking_page(
+    db: Session,
+    response: Response,
+    limit: int,
+    cursor: Optional[int] = None,
+    user_id: Optional[int] = None,
+    speaker_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    status: Optional[str] = None,
+    skip: int = 0
+) -> List[BookingResponse]:
+    """
+    One joined query for the listed columns, ordered by (booking_time, id).
+    Keyset pagination: pass the X-Next-Cursor header of a page as `cursor`
+    to get the next one. Speaker / user filters are served by the
+    (speaker_id, booking_time) / (user_id, booking_time) indexes.
+    """
+    query = db.query(
+        Booking.id,
+        Booking.speaker_id,
+        func.coalesce(Speaker.name, "Unknown Speaker").label("speaker_name"),
+        Booking.booking_time,
+        Booking.status,
+        Booking.notes
+    ).outerjoin(Speaker, Booking.speaker_id == Speaker.id)
+
+    if user_id is not None:
+        query = query.filter(Booking.user_id == user_id)
+    if speaker_id is not None:
+        query = query.filter(Booking.speaker_id == speaker_id)
+    if date_from is not None:
+        query = query.filter(Booking.booking_time >= to_storage_time(date_from))
+    if date_to is not None:
+        query = query.filter(Booking.booking_time < to_storage_time(date_to))
+    if status is not None:
+        query = query.filter(Booking.status == status)
+    if cursor is not None:
+        # Compare against the stored booking_time of the cursor row itself
+        cursor_time = select(Booking.booking_time).where(Booking.id == cursor).scalar_subquery()
+        query = query.filter(tuple_(Booking.booking_time, Booking.id) > tuple_(cursor_time, cursor))
+
+    query = query.order_by(Booking.booking_time, Booking.id)
+    if skip and cursor is None:
+        query = query.offset(skip)
+    rows = query.limit(limit + 1).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = str(rows[-1].id)
+    return [BookingResponse(**row._mapping) for row in rows]
+
 @router.get("/", response_model=List[BookingResponse])
-def list_bookings(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    # Share all bookings globally across users as requested
-    bookings = db.query(Booking).all()
-    
-    response = []
-    for b in bookings:
-        speaker = db.query(Speaker).filter(Speaker.id == b.speaker_id).first()
-        response.append(BookingResponse(
-            id=b.id,
-            speaker_name=speaker.name if speaker else "Unknown Speaker",
-            booking_time=b.booking_time,
-            status=b.status,
-            notes=b.notes
-        ))
-    return response
+def list_bookings(
+    response: Response,
+    speaker_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    status: Optional[str] = None,
+    mine: bool = False,
+    cursor: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Share all bookings globally across users as requested (mine=true: only the caller's)
+    return _booking_page(
+        db, response, limit, cursor,
+        user_id=current_user.id if mine else None,
+        speaker_id=speaker_id, date_from=date_from, date_to=date_to, status=status
+    )
+
+@router.get("/availability")
+def get_availability(
+    date_from: datetime,
+    date_to: datetime,
+    speaker_id: Optional[List[int]] = Query(None),
+    min_minutes: Optional[int] = Query(None, ge=1),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Free windows of one or many speakers (?speaker_id=1&speaker_id=2; all
+    active speakers if omitted) within working hours, between date_from and
+    date_to. Each window fits at least one booking (or min_minutes).
+    """
+    date_from, date_to = to_storage_time(date_from), to_storage_time(date_to)
+    if date_to <= date_from:
+        raise HTTPException(status_code=400, detail="date_to must be after date_from")
+    if date_to - date_from > timedelta(days=AVAILABILITY_MAX_DAYS):
+        raise HTTPException(status_code=400, detail=f"Range is limited to {AVAILABILITY_MAX_DAYS} days")
+
+    min_length = timedelta(minutes=min_minutes) if min_minutes else None
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "booking_minutes": int(BOOKING_DURATION.total_seconds() // 60),
+        "speakers": find_availability(db, date_from, date_to, speaker_id, min_length)
+    }
 
 @router.delete("/{booking_id}")
 def delete_booking(booking_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
@@ -81,20 +189,24 @@ def delete_booking(booking_id: int, db: Session = Depends(get_db), current_user:
 
 # Admin Routes
 @router.get("/all", response_model=List[BookingResponse])
-def list_all_bookings(skip: int = 0, limit: int = 100, db: Session = Depends(get_db), current_admin: User = Depends(require_admin)):
-    bookings = db.query(Booking).offset(skip).limit(limit).all()
-    
-    response = []
-    for b in bookings:
-        speaker = db.query(Speaker).filter(Speaker.id == b.speaker_id).first()
-        response.append(BookingResponse(
-            id=b.id,
-            speaker_name=speaker.name if speaker else "Unknown Speaker",
-            booking_time=b.booking_time,
-            status=b.status,
-            notes=b.notes
-        ))
-    return response
+def list_all_bookings(
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[int] = None,
+    user_id: Optional[int] = None,
+    speaker_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    status: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_admin: User = Depends(require_admin)
+):
+    # skip (offset) is kept for old clients; cursor pages do not slow down with depth
+    return _booking_page(
+        db, response, limit, cursor,
+        user_id=user_id, speaker_id=speaker_id, date_from=date_from, date_to=date_to, status=status, skip=skip
+    )
 
 @router.delete("/admin/{booking_id}")
 def admin_delete_booking(booking_id: int, db: Session = Depends(get_db), current_admin: User = Depends(require_admin)):
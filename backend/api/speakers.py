@@ -25,6 +25,12 @@ class SpeakerResponse(BaseModel):
     class Config:
         from_attributes = True
 
+def invalidate_persona_cache(speaker_id: int = None):
+    """Drop this worker's compiled persona(s); other workers refresh within PERSONA_CACHE_TTL"""
+    # Lazy import: the orchestrator pulls in the whole AI engine
+    from ai_engine.agents.orchestrator import persona_cache
+    persona_cache.invalidate(speaker_id)
+
 @router.get("/", response_model=List[SpeakerResponse])
 def list_speakers(db: Session = Depends(get_db)):
     speakers = db.query(Speaker).all()
@@ -154,6 +160,8 @@ def cleanup_speakers(db: Session = Depends(get_db)):
             db.delete(y)
 
     db.commit()
+    # Names / persona_model changed: drop compiled personas so the next turn recompiles
+    invalidate_persona_cache()
     return {"status": "cleaned", "details": "Merged duplicates for Park, Han, and Yoon."}
 
     # Remove duplicates
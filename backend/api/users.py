@@ -5,7 +5,7 @@ from typing import Optional, List
 
 from backend.database.session import get_db
 from backend.database.models import User, Booking, Briefing, Keyword, Conversation, Message
-from backend.api.auth import get_current_user, require_admin, get_password_hash
+from backend.api.auth import get_current_user, require_admin, get_password_hash, invalidate_principal
 
 router = APIRouter()
 
@@ -40,6 +40,7 @@ def get_me(current_user: User = Depends(get_current_user)):
 
 @router.put("/me", response_model=UserResponse)
 def update_me(user_update: UserUpdate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    old_email = current_user.email
     if user_update.name:
         current_user.name = user_update.name
     if user_update.email:
@@ -50,6 +51,7 @@ def update_me(user_update: UserUpdate, db: Session = Depends(get_db), current_us
         current_user.email = user_update.email
     
     db.commit()
+    invalidate_principal(old_email, current_user.email)
     db.refresh(current_user)
     return current_user
 
@@ -78,6 +80,7 @@ def update_user_admin(user_id: int, user_update: AdminUserUpdate, db: Session =
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
         
+    old_email = user.email
     if user_update.name:
         user.name = user_update.name
     if user_update.role:
@@ -89,6 +92,7 @@ def update_user_admin(user_id: int, user_update: AdminUserUpdate, db: Session =
         user.email = user_update.email
         
     db.commit()
+    invalidate_principal(old_email, user.email)
     db.refresh(user)
     return user
 
@@ -113,6 +117,8 @@ def delete_user(user_id: int, db: Session = Depends(get_db), current_admin: User
         db.query(Message).filter(Message.conversation_id.in_(conversation_ids)).delete(synchronize_session=False)
         db.query(Conversation).filter(Conversation.user_id == user_id).delete(synchronize_session=False)
         
+    email = user.email
     db.delete(user)
     db.commit()
+    invalidate_principal(email)
     return {"status": "success", "message": f"User {user_id} deleted"}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, Text, DateTime, ForeignKey, Date, JSON
+from sqlalchemy import Column, Integer, String, Boolean, Text, DateTime, ForeignKey, Date, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from backend.database.session import Base
@@ -43,6 +43,13 @@ class Booking(Base):
     user = relationship("User", back_populates="bookings")
     speaker = relationship("Speaker", back_populates="bookings")
 
+    __table_args__ = (
+        # Listings: per speaker / per user ordered by time, and the shared timeline
+        Index("ix_bookings_speaker_time", "speaker_id", "booking_time"),
+        Index("ix_bookings_user_time", "user_id", "booking_time"),
+        Index("ix_bookings_time", "booking_time", "id"),
+    )
+
 class Briefing(Base):
     __tablename__ = "briefings"
     
@@ -61,7 +68,8 @@ class Conversation(Base):
     id = Column(String(36), primary_key=True, index=True) # UUID
     user_id = Column(Integer, ForeignKey("users.id"))
     speaker_id = Column(Integer, ForeignKey("speakers.id"))
-    summary = Column(Text)
+    summary = Column(Text) # Title until the first turns are folded, then the rolling memory summary
+    summarized_until = Column(Integer) # Last message id folded into summary (None: nothing folded yet)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -81,6 +89,11 @@ class Message(Base):
     
     conversation = relationship("Conversation", back_populates="messages")
 
+    __table_args__ = (
+        # History pages: WHERE conversation_id = ? ORDER BY created_at, id (keyset)
+        Index("ix_messages_conversation_created", "conversation_id", "created_at", "id"),
+    )
+
 class Keyword(Base):
     __tablename__ = "keywords"
     
@@ -0,0 +1,32 @@
+from sqlalchemy import inspect
+from sqlalchemy.schema import CreateIndex
+
+def upgrade_schema(engine, metadata):
+    """
+    Bring an existing database up to the models.
+    create_all only creates missing tables, so columns and indexes added to
+    existing tables later are applied here. Added columns must be nullable
+    (or carry a server default); nothing is ever dropped or altered.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    with engine.begin() as conn:
+        for table in metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+
+            columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in columns:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                print(f"[Schema] Adding column {table.name}.{column.name} ({column_type})")
+                conn.exec_driver_sql(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}')
+
+            indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name in indexes:
+                    continue
+                print(f"[Schema] Creating index {index.name} on {table.name}")
+                conn.execute(CreateIndex(index))
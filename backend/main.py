@@ -11,9 +11,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from backend.api import auth, users, speakers, bookings, advisory, briefings, keywords
 from backend.database.session import engine, Base
 from backend.database import models
+from backend.database.upgrade import upgrade_schema
 
 # Create Tables
 Base.metadata.create_all(bind=engine)
+# Add columns / indexes introduced after the tables were created
+upgrade_schema(engine, Base.metadata)
 
 app = FastAPI(
     title="Boardroom Club API",
@@ -38,6 +41,17 @@ def startup_db_seed():
     finally:
         db.close()
 
+@app.on_event("shutdown")
+async def shutdown_ai_clients():
+    from ai_engine.database.connector import aclose_clients
+    await aclose_clients()
+
+@app.on_event("shutdown")
+def flush_message_store():
+    # Commit chat turns still queued by the write-behind store
+    from backend.services.message_store import get_message_store
+    get_message_store().close()
+
 # CORS Config
 app.add_middleware(
     CORSMiddleware,
@@ -48,6 +62,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Keyset cursor of paginated list endpoints
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Register Routers
@@ -1,40 +1,40 @@
 
 import uuid
-from ai_engine.agents.orchestrator import app as orchestrator
+from ai_engine.agents.orchestrator import (
+    app as orchestrator,
+    async_app as async_orchestrator,
+    concierge_agent,
+    operations_agent,
+    aretrieve_context,
+    aremember_answer,
+    conversation_memory,
+    generator,
+)
 from langchain_core.messages import HumanMessage
 
 class AIService:
-    def generate_response(self, speaker_id: str, user_id: int, message: str, conversation_id: str = None):
-        """
-        Connects to the AI Engine (RAG/Agents) to generate a response.
-        """
-        if not conversation_id:
-            conversation_id = str(uuid.uuid4())
-            
-        print(f"[AIService] Generating response for Speaker {speaker_id}, User {user_id}: {message}")
-        
-        # 1. Prepare State for LangGraph
-        initial_state = {
+    def _initial_state(self, speaker_id: str, user_id: int, message: str, conversation_id: str, memory=None) -> dict:
+        """Prepare State for LangGraph"""
+        return {
             "user_query": message,
             "speaker_id": speaker_id,
             "messages": [HumanMessage(content=message)],
-            "context": {"user_id": user_id, "conversation_id": conversation_id},
+            # memory: bounded history of the conversation (None for its first question)
+            "context": {"user_id": user_id, "conversation_id": conversation_id, "memory": memory},
             "intent": "",
             "response": "",
             "next_agent": ""
         }
-        
-        # 2. Run Workflow
-        try:
-            # invoke the orchestrator
-            result = orchestrator.invoke(initial_state)
-            response_text = result.get("response", "AI 처리 중 오류가 발생했습니다.")
-            sources = result.get("sources", [])
-        except Exception as e:
-            print(f"AI Engine Error: {e}")
+
+    def _response_payload(self, conversation_id: str, result: dict = None, error: Exception = None) -> dict:
+        if error is not None:
+            print(f"AI Engine Error: {error}")
             # Fallback for pilot if LLM/DB fails
-            response_text = f"죄송합니다. AI 엔진에 연결할 수 없습니다. (Error: {str(e)})"
+            response_text = f"죄송합니다. AI 엔진에 연결할 수 없습니다. (Error: {str(error)})"
             sources = []
+        else:
+            response_text = result.get("response", "AI 처리 중 오류가 발생했습니다.")
+            sources = result.get("sources", [])
 
         return {
             "conversation_id": conversation_id,
@@ -43,6 +43,85 @@ class AIService:
             "sources": sources
         }
 
+    def generate_response(self, speaker_id: str, user_id: int, message: str, conversation_id: str = None, use_memory: bool = True):
+        """
+        Connects to the AI Engine (RAG/Agents) to generate a response.
+        With use_memory, earlier turns of the conversation are part of the prompt.
+        """
+        if not conversation_id:
+            conversation_id = str(uuid.uuid4())
+            
+        print(f"[AIService] Generating response for Speaker {speaker_id}, User {user_id}: {message}")
+        
+        try:
+            memory = conversation_memory.load(conversation_id, message) if use_memory else None
+            initial_state = self._initial_state(speaker_id, user_id, message, conversation_id, memory)
+            # invoke the orchestrator
+            result = orchestrator.invoke(initial_state)
+        except Exception as e:
+            return self._response_payload(conversation_id, error=e)
+        return self._response_payload(conversation_id, result)
+
+    async def agenerate_response(self, speaker_id: str, user_id: int, message: str, conversation_id: str = None, use_memory: bool = True):
+        """
+        Async variant for request handlers: runs the graph with ainvoke so
+        retrieval and LLM calls yield to the event loop.
+        """
+        if not conversation_id:
+            conversation_id = str(uuid.uuid4())
+
+        print(f"[AIService] Generating response (async) for Speaker {speaker_id}, User {user_id}: {message}")
+
+        try:
+            memory = await conversation_memory.aload(conversation_id, message) if use_memory else None
+            initial_state = self._initial_state(speaker_id, user_id, message, conversation_id, memory)
+            result = await async_orchestrator.ainvoke(initial_state)
+        except Exception as e:
+            return self._response_payload(conversation_id, error=e)
+        return self._response_payload(conversation_id, result)
+
+    async def astream_response(self, speaker_id: str, user_id: int, message: str, conversation_id: str = None):
+        """
+        Streaming variant: yields ("sources", docs) once retrieval is done,
+        then ("token", text) chunks as the LLM generates them. A failure ends
+        the stream with ("error", message) instead, so callers can tell a
+        broken answer from a complete one.
+        Follows the same concierge routing as the graph.
+        """
+        print(f"[AIService] Streaming response for Speaker {speaker_id}, User {user_id}: {message}")
+
+        state = self._initial_state(speaker_id, user_id, message, conversation_id)
+        if concierge_agent(state)["next_agent"] == "operations":
+            yield "sources", []
+            yield "token", operations_agent(state)["response"]
+            return
+
+        try:
+            memory = await conversation_memory.aload(conversation_id, message)
+            persona, sources, cached = await aretrieve_context(message, speaker_id, memory)
+        except Exception as e:
+            print(f"AI Engine Error: {e}")
+            yield "sources", []
+            yield "error", f"죄송합니다. AI 엔진에 연결할 수 없습니다. (Error: {str(e)})"
+            return
+
+        yield "sources", sources
+        if cached:
+            yield "token", cached["response"]
+            return
+
+        tokens = []
+        try:
+            async for token in generator.astream_response(message, sources, persona, memory):
+                tokens.append(token)
+                yield "token", token
+        except Exception as e:
+            print(f"AI Engine Error: {e}")
+            yield "error", f"응답 생성이 중단되었습니다: {str(e)}"
+            return
+        if memory is None:
+            await aremember_answer(message, persona, sources, "".join(tokens))
+
     def generate_debate_session(self, topic: str, speaker_id_1: int, speaker_id_2: int):
         """
         Orchestrates a multi-turn debate between two experts.
@@ -53,7 +132,7 @@ class AIService:
         
         # Turn 1: Speaker 1 (Opening)
         prompt_1 = f"Topic: {topic}\n\nPlease provide your core perspective on this topic based on your philosophy."
-        response_1 = self.generate_response(str(speaker_id_1), 1, prompt_1) # User ID 1 is system/admin
+        response_1 = self.generate_response(str(speaker_id_1), 1, prompt_1, use_memory=False) # User ID 1 is system/admin
         debate_log.append({
             "turn": 1,
             "speaker_id": speaker_id_1,
@@ -62,7 +141,7 @@ class AIService:
         
         # Turn 2: Speaker 2 (Critique)
         prompt_2 = f"The previous speaker said: \"{response_1['response']}\"\n\nPlease critique this view from your perspective. What are the risks or missing points?"
-        response_2 = self.generate_response(str(speaker_id_2), 1, prompt_2)
+        response_2 = self.generate_response(str(speaker_id_2), 1, prompt_2, use_memory=False)
         debate_log.append({
             "turn": 2,
             "speaker_id": speaker_id_2,
@@ -71,7 +150,7 @@ class AIService:
         
         # Turn 3: Speaker 1 (Rebuttal/Synthesis)
         prompt_3 = f"The critic said: \"{response_2['response']}\"\n\nPlease provide a closing rebuttal or synthesis of the discussion."
-        response_3 = self.generate_response(str(speaker_id_1), 1, prompt_3)
+        response_3 = self.generate_response(str(speaker_id_1), 1, prompt_3, use_memory=False)
         debate_log.append({
             "turn": 3,
             "speaker_id": speaker_id_1,
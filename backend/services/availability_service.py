@@ -0,0 +1,140 @@
+import os
+from bisect import bisect_right
+from datetime import datetime, time, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from backend.database.models import Booking, Speaker
+
+# Every booking blocks the speaker for a fixed length of time
+BOOKING_DURATION = timedelta(minutes=int(os.getenv("BOOKING_DURATION_MINUTES", "60")))
+AVAILABILITY_DAY_START = time(int(os.getenv("AVAILABILITY_DAY_START_HOUR", "9")))
+AVAILABILITY_DAY_END = time(int(os.getenv("AVAILABILITY_DAY_END_HOUR", "18")))
+AVAILABILITY_INCLUDE_WEEKENDS = os.getenv("AVAILABILITY_INCLUDE_WEEKENDS", "0").lower() in ("1", "true", "yes")
+AVAILABILITY_MAX_DAYS = int(os.getenv("AVAILABILITY_MAX_DAYS", "62"))
+
+Interval = Tuple[datetime, datetime]
+
+def to_storage_time(value: datetime) -> datetime:
+    """
+    Canonical form of a booking time: naive UTC. Aware values are converted,
+    naive ones are taken as UTC already. Everything stored, compared or
+    returned goes through here once, so +09:00 and Z inputs land on one clock.
+    """
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def active_bookings(db: Session):
+    return db.query(Booking).filter(Booking.status != "cancelled")
+
+class SpeakerSchedule:
+    """
+    Busy intervals of one speaker, merged and sorted by start.
+    Ends are non-decreasing after merging, so the first interval that ends
+    after a given instant is found by bisection: overlap checks are
+    O(log n) and free-window scans only touch the intervals they return.
+    """
+
+    def __init__(self, starts: Iterable[datetime], duration: timedelta = BOOKING_DURATION):
+        self.duration = duration
+        self.busy: List[Interval] = []
+        for start in sorted(starts):
+            end = start + duration
+            if self.busy and start <= self.busy[-1][1]:
+                self.busy[-1] = (self.busy[-1][0], max(self.busy[-1][1], end))
+            else:
+                self.busy.append((start, end))
+        self._ends = [end for _, end in self.busy]
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        i = bisect_right(self._ends, start)
+        return i < len(self.busy) and self.busy[i][0] < end
+
+    def free_windows(self, start: datetime, end: datetime, min_length: Optional[timedelta] = None) -> List[Interval]:
+        """Free parts of [start, end) that are at least min_length (default: one booking) long"""
+        min_length = min_length or self.duration
+        windows = []
+        cursor = start
+        i = bisect_right(self._ends, start)
+        while i < len(self.busy) and self.busy[i][0] < end:
+            busy_start, busy_end = self.busy[i]
+            if busy_start - cursor >= min_length:
+                windows.append((cursor, busy_start))
+            cursor = max(cursor, busy_end)
+            i += 1
+        if end - cursor >= min_length:
+            windows.append((cursor, end))
+        return windows
+
+def working_windows(date_from: datetime, date_to: datetime) -> List[Interval]:
+    """Bookable hours of each day in [date_from, date_to)"""
+    date_from, date_to = to_storage_time(date_from), to_storage_time(date_to)
+    windows = []
+    day = date_from.date()
+    while day <= date_to.date():
+        if AVAILABILITY_INCLUDE_WEEKENDS or day.weekday() < 5:
+            start = max(datetime.combine(day, AVAILABILITY_DAY_START), date_from)
+            end = min(datetime.combine(day, AVAILABILITY_DAY_END), date_to)
+            if start < end:
+                windows.append((start, end))
+        day += timedelta(days=1)
+    return windows
+
+def load_schedules(db: Session, speaker_ids: List[int], date_from: datetime, date_to: datetime) -> Dict[int, SpeakerSchedule]:
+    """
+    One range query for all speakers, walking the (speaker_id, booking_time)
+    index; bookings that start up to one duration before the range still block it.
+    """
+    rows = active_bookings(db).with_entities(Booking.speaker_id, Booking.booking_time).filter(
+        Booking.speaker_id.in_(speaker_ids),
+        Booking.booking_time > date_from - BOOKING_DURATION,
+        Booking.booking_time < date_to
+    ).order_by(Booking.speaker_id, Booking.booking_time).all()
+
+    starts: Dict[int, List[datetime]] = {speaker_id: [] for speaker_id in speaker_ids}
+    for speaker_id, booking_time in rows:
+        starts[speaker_id].append(to_storage_time(booking_time))
+    return {speaker_id: SpeakerSchedule(times) for speaker_id, times in starts.items()}
+
+def find_availability(
+    db: Session,
+    date_from: datetime,
+    date_to: datetime,
+    speaker_ids: Optional[List[int]] = None,
+    min_length: Optional[timedelta] = None
+) -> List[Dict]:
+    """Free windows per speaker (all active speakers when speaker_ids is empty)"""
+    date_from, date_to = to_storage_time(date_from), to_storage_time(date_to)
+    query = db.query(Speaker.id, Speaker.name).filter(Speaker.is_active == True)
+    if speaker_ids:
+        query = query.filter(Speaker.id.in_(speaker_ids))
+    speakers = query.order_by(Speaker.id).all()
+    if not speakers:
+        return []
+
+    schedules = load_schedules(db, [speaker.id for speaker in speakers], date_from, date_to)
+    days = working_windows(date_from, date_to)
+
+    result = []
+    for speaker in speakers:
+        schedule = schedules[speaker.id]
+        free = []
+        for start, end in days:
+            free.extend(schedule.free_windows(start, end, min_length))
+        result.append({
+            "speaker_id": speaker.id,
+            "speaker_name": speaker.name,
+            "free": [{"start": start, "end": end} for start, end in free]
+        })
+    return result
+
+def find_conflict(db: Session, speaker_id: int, booking_time: datetime) -> Optional[Booking]:
+    """An active booking of the speaker that overlaps a new one starting at booking_time"""
+    booking_time = to_storage_time(booking_time)
+    return active_bookings(db).filter(
+        Booking.speaker_id == speaker_id,
+        Booking.booking_time > booking_time - BOOKING_DURATION,
+        Booking.booking_time < booking_time + BOOKING_DURATION
+    ).order_by(Booking.booking_time).first()
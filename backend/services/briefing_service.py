@@ -1,24 +1,33 @@
 from datetime import date, datetime
 from typing import List, Dict
 import json
+import os
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
-from langchain_upstage import ChatUpstage
 from langchain_community.tools.ddg_search.tool import DuckDuckGoSearchResults
 
-from ai_engine.rag.retriever import HybridRetriever
+from ai_engine.rag.retriever import get_retriever
+from ai_engine.database.connector import get_chat_model
+from ai_engine.rag.model_router import get_site_model
+from ai_engine.rag.context_packer import ContextPacker, get_token_counter
 from backend.schemas.briefing import BriefingResponse, BriefingItem, NewsItem, WatchListItem, RecommendationItem
 
 class BriefingService:
     def __init__(self):
-        self.retriever = HybridRetriever()
-        self.llm = ChatUpstage(model="solar-pro3", temperature=0.7)
-        # k=3 for top 3 results
-        try:
-            self.search_tool = DuckDuckGoSearchResults(max_results=3)
-        except Exception as e:
-            print(f"Warning: DuckDuckGo Search not available: {e}")
-            self.search_tool = None
+        self.retriever = get_retriever()
+        self.llm = get_chat_model(get_site_model("briefing_service", "solar-pro3"), temperature=0.7)
+        # Several keyword queries feed one prompt, so the briefing gets a larger budget
+        self.packer = ContextPacker(
+            get_token_counter(self.llm),
+            budget=int(os.getenv("BRIEFING_CONTEXT_TOKEN_BUDGET", "4000"))
+        )
+        # k=3 for top 3 results; BRIEFING_WEB_SEARCH=0 keeps briefings offline (load tests)
+        self.search_tool = None
+        if os.getenv("BRIEFING_WEB_SEARCH", "1").lower() not in ("0", "false", "no"):
+            try:
+                self.search_tool = DuckDuckGoSearchResults(max_results=3)
+            except Exception as e:
+                print(f"Warning: DuckDuckGo Search not available: {e}")
 
     async def generate_briefing(self) -> BriefingResponse:
         # 0. Fetch Keywords
@@ -55,14 +64,22 @@ class BriefingService:
 
         # 2. Retrieve Internal Context
         query = "Strategic risks, compliance requirements, and future trends in power systems and AI"
-        
+        # One retrieval per active keyword, batched into a single round trip
+        queries = [query] + [f"Strategic implications and risks of {word}" for word in valuable_keywords]
+
         try:
-            retrieved_docs = self.retriever.vector_search(query, top_k=5)
+            retrieved_docs = []
+            seen = set()
+            for results in self.retriever.search_many(queries, top_k=5):
+                for doc in results:
+                    if doc['content'] not in seen:
+                        seen.add(doc['content'])
+                        retrieved_docs.append(doc)
         except Exception as e:
             print(f"Vector search failed: {e}")
             retrieved_docs = []
         
-        vector_context = "\n\n".join([doc['content'] for doc in retrieved_docs])
+        vector_context = self.packer.pack(retrieved_docs).text
         
         # Combine Contexts
         context_text = f"""
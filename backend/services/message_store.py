@@ -0,0 +1,168 @@
+import os
+import time
+import queue
+import asyncio
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from sqlalchemy import func
+
+from backend.database.session import SessionLocal
+from backend.database.models import Conversation, Message
+
+# MESSAGE_WRITE_BEHIND=1: turns from concurrent chats are queued and committed together
+MESSAGE_WRITE_BEHIND = os.getenv("MESSAGE_WRITE_BEHIND", "0").lower() in ("1", "true", "yes")
+MESSAGE_GROUP_COMMIT_MAX = int(os.getenv("MESSAGE_GROUP_COMMIT_MAX", "64"))
+MESSAGE_GROUP_COMMIT_WAIT_MS = float(os.getenv("MESSAGE_GROUP_COMMIT_WAIT_MS", "10"))
+
+@dataclass
+class ChatTurn:
+    """One question/answer exchange to persist (the conversation row too, if it is new)"""
+    conversation_id: str
+    user_id: int
+    speaker_id: int
+    user_message: str
+    assistant_message: Optional[str] = None  # None: question only (e.g. client left before any token)
+    sources: list = field(default_factory=list)
+    new_conversation: bool = False
+    title: Optional[str] = None
+
+class MessageStore:
+    """
+    Persists chat turns after generation, in one short transaction per
+    turn (or per batch of turns), instead of committing each row as it is
+    produced and keeping a session open across the LLM call.
+    """
+
+    def write(self, turns: List[ChatTurn]) -> List[Optional[int]]:
+        """Write turns in a single transaction; returns each turn's assistant message id"""
+        db = SessionLocal()
+        try:
+            replies = []
+            for turn in turns:
+                if turn.new_conversation:
+                    db.add(Conversation(
+                        id=turn.conversation_id,
+                        user_id=turn.user_id,
+                        speaker_id=turn.speaker_id,
+                        summary=turn.title
+                    ))
+                db.add(Message(conversation_id=turn.conversation_id, role="user", content=turn.user_message))
+                reply = None
+                if turn.assistant_message is not None:
+                    reply = Message(
+                        conversation_id=turn.conversation_id,
+                        role="assistant",
+                        content=turn.assistant_message,
+                        sources=turn.sources
+                    )
+                    db.add(reply)
+                replies.append(reply)
+
+            # Flush assigns the message ids; one UPDATE touches every conversation of the batch
+            db.flush()
+            conversation_ids = list({turn.conversation_id for turn in turns})
+            db.query(Conversation).filter(Conversation.id.in_(conversation_ids)).update(
+                {Conversation.updated_at: func.now()}, synchronize_session=False
+            )
+            db.commit()
+            return [reply.id if reply is not None else None for reply in replies]
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def save_turn(self, turn: ChatTurn) -> Optional[int]:
+        return self.write([turn])[0]
+
+    async def asave_turn(self, turn: ChatTurn) -> Optional[int]:
+        return await asyncio.to_thread(self.save_turn, turn)
+
+    def close(self):
+        pass
+
+class WriteBehindMessageStore(MessageStore):
+    """
+    Group commit: a writer thread drains queued turns and commits up to
+    MESSAGE_GROUP_COMMIT_MAX of them per transaction, waiting at most
+    MESSAGE_GROUP_COMMIT_WAIT_MS for company. Callers get a Future that
+    resolves once their turn is durable, so ids are still returned.
+    """
+
+    _STOP = object()
+
+    def __init__(self, max_batch: int = MESSAGE_GROUP_COMMIT_MAX, max_wait_ms: float = MESSAGE_GROUP_COMMIT_WAIT_MS):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="message-writer")
+        self._thread.start()
+
+    def submit(self, turn: ChatTurn) -> Future:
+        future = Future()
+        self._queue.put((turn, future))
+        return future
+
+    def save_turn(self, turn: ChatTurn) -> Optional[int]:
+        return self.submit(turn).result()
+
+    async def asave_turn(self, turn: ChatTurn) -> Optional[int]:
+        return await asyncio.wrap_future(self.submit(turn))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+            if stop:
+                return
+
+    def _flush(self, batch):
+        try:
+            ids = self.write([turn for turn, _ in batch])
+            for (_, future), message_id in zip(batch, ids):
+                future.set_result(message_id)
+            if len(batch) > 1:
+                print(f"[MessageStore] Group commit of {len(batch)} turns")
+        except Exception as e:
+            # One bad turn must not fail the others: retry them one by one
+            print(f"[MessageStore] Group commit failed ({e}), writing {len(batch)} turns individually")
+            for turn, future in batch:
+                try:
+                    future.set_result(self.write([turn])[0])
+                except Exception as error:
+                    future.set_exception(error)
+
+    def close(self):
+        """Flush whatever is queued and stop the writer"""
+        self._queue.put(self._STOP)
+        self._thread.join(timeout=10)
+
+_shared_store = None
+_shared_store_lock = threading.Lock()
+
+def get_message_store() -> MessageStore:
+    """Process-wide message store (write-behind when MESSAGE_WRITE_BEHIND=1)"""
+    global _shared_store
+    if _shared_store is None:
+        with _shared_store_lock:
+            if _shared_store is None:
+                _shared_store = WriteBehindMessageStore() if MESSAGE_WRITE_BEHIND else MessageStore()
+    return _shared_store
@@ -43,6 +43,8 @@ export const Chat: React.FC<{ speakerId?: string }> = ({ speakerId = "1" }) => {
 
     const [input, setInput] = useState('');
     const [isLoading, setIsLoading] = useState(false);
+    // Assistant reply while it streams in; moved into the history when the stream ends
+    const [streaming, setStreaming] = useState<Message | null>(null);
     const [conversationId, setConversationId] = useState<string | null>(null);
     const messagesEndRef = useRef<HTMLDivElement>(null);
 
@@ -60,7 +62,7 @@ export const Chat: React.FC<{ speakerId?: string }> = ({ speakerId = "1" }) => {
 
             if (savedId) {
                 try {
-                    const response = await chatAPI.getConversation(savedId);
+                    const response = await chatAPI.getConversation(savedId, { latest: 50, include_sources: true });
                     const history = response.data.messages.map((msg: any) => ({
                         id: msg.message_id,
                         role: msg.role,
@@ -83,7 +85,7 @@ export const Chat: React.FC<{ speakerId?: string }> = ({ speakerId = "1" }) => {
         messagesEndRef.current?.scrollIntoView({ behavior: "smooth" });
     };
 
-    useEffect(scrollToBottom, [messages]);
+    useEffect(scrollToBottom, [messages, streaming]);
 
     const handleSend = async () => {
         if (!input.trim()) return;
@@ -94,31 +96,46 @@ export const Chat: React.FC<{ speakerId?: string }> = ({ speakerId = "1" }) => {
         setInput('');
         setIsLoading(true);
 
+        let reply: Message = { id: Date.now().toString(), role: 'assistant', content: '', sources: [] };
+        let failed = false;
         try {
-            const response = await chatAPI.sendMessage({
-                speaker_id: speakerId,
-                message: input,
-                conversation_id: conversationId || undefined
-            });
-
-            // Save conversation ID if new
-            if (response.data.conversation_id && response.data.conversation_id !== conversationId) {
-                setConversationId(response.data.conversation_id);
-                localStorage.setItem(`chat_session_${speakerId}`, response.data.conversation_id);
-            }
-
-            const assistantMsg: Message = {
-                id: response.data.message_id,
-                role: 'assistant',
-                content: response.data.response,
-                sources: response.data.sources
-            };
-            addChatMessage(speakerId, assistantMsg);
+            await chatAPI.streamMessage(
+                {
+                    speaker_id: speakerId,
+                    message: input,
+                    conversation_id: conversationId || undefined
+                },
+                (event, payload) => {
+                    if (event === 'sources') {
+                        // Save conversation ID if new
+                        if (payload.conversation_id && payload.conversation_id !== conversationId) {
+                            setConversationId(payload.conversation_id);
+                            localStorage.setItem(`chat_session_${speakerId}`, payload.conversation_id);
+                        }
+                        reply = { ...reply, sources: payload.sources };
+                    } else if (event === 'token') {
+                        reply = { ...reply, content: reply.content + payload.content };
+                        setIsLoading(false);
+                        setStreaming(reply);
+                    } else if (event === 'done') {
+                        reply = { ...reply, id: payload.message_id };
+                    } else if (event === 'error') {
+                        console.error("Stream failed:", payload.message);
+                        failed = true;
+                    }
+                },
+            );
         } catch (error) {
             console.error("Failed to send message", error);
-            const errorMsg: Message = { id: Date.now().toString(), role: 'assistant', content: "⚠️ Connecting to AI Engine failed. Please try again." };
-            addChatMessage(speakerId, errorMsg);
+            failed = true;
         } finally {
+            if (failed) {
+                // Keep what was generated, marked as interrupted
+                const notice = "⚠️ Connecting to AI Engine failed. Please try again.";
+                reply = { ...reply, content: reply.content ? `${reply.content}\n\n${notice}` : notice };
+            }
+            addChatMessage(speakerId, reply);
+            setStreaming(null);
             setIsLoading(false);
         }
     };
@@ -218,6 +235,21 @@ export const Chat: React.FC<{ speakerId?: string }> = ({ speakerId = "1" }) => {
                     </div>
                 ))}
 
+                {streaming && (
+                    <div className="flex justify-start w-full animate-fadeIn">
+                        <div className="w-8 h-8 rounded-full bg-slate-800 flex items-center justify-center text-white text-xs mr-3 mt-1 shadow-md flex-shrink-0 gradient-mask-b-0">
+                            AI
+                        </div>
+                        <div className="max-w-[85%] rounded-2xl px-5 py-3.5 shadow-sm text-sm leading-relaxed bg-white text-slate-700 border border-slate-100 rounded-bl-none">
+                            <div className="markdown-body text-slate-700">
+                                <ReactMarkdown remarkPlugins={[remarkGfm]} components={ChatMarkdownComponents}>
+                                    {streaming.content}
+                                </ReactMarkdown>
+                            </div>
+                        </div>
+                    </div>
+                )}
+
                 {isLoading && (
                     <div className="flex justify-start animate-pulse">
                         <div className="w-8 h-8 rounded-full bg-slate-800 flex items-center justify-center text-white text-xs mr-3 mt-1 shadow-sm flex-shrink-0">
@@ -243,11 +275,11 @@ export const Chat: React.FC<{ speakerId?: string }> = ({ speakerId = "1" }) => {
                         onKeyPress={(e) => e.key === 'Enter' && handleSend()}
                         className="w-full bg-slate-50 border border-slate-200 text-slate-700 rounded-2xl pl-5 pr-24 py-4 focus:outline-none focus:ring-2 focus:ring-slate-200 focus:bg-white transition-all shadow-inner placeholder-slate-400"
                         placeholder="Type your strategic query..."
-                        disabled={isLoading}
+                        disabled={isLoading || streaming !== null}
                     />
                     <button
                         onClick={handleSend}
-                        disabled={isLoading || !input.trim()}
+                        disabled={isLoading || streaming !== null || !input.trim()}
                         className="absolute right-2 bg-slate-900 text-white px-5 py-2.5 rounded-xl text-sm font-semibold hover:bg-black disabled:opacity-50 disabled:cursor-not-allowed transition-all shadow-lg hover:shadow-xl transform active:scale-95"
                     >
                         Send
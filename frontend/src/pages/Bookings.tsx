@@ -12,7 +12,7 @@ export const Bookings: React.FC = () => {
             if (isBookingsLoaded) return;
 
             try {
-                const response = await bookingsAPI.list();
+                const response = await bookingsAPI.listAll();
                 setBookings(response.data);
             } catch (error) {
                 console.error("Failed to fetch bookings:", error);
@@ -28,7 +28,7 @@ export const Speakers: React.FC = () => {
 
             // Load Bookings for valid duplication check
             try {
-                const response = await bookingsAPI.list();
+                const response = await bookingsAPI.listAll();
                 setBookings(response.data);
                 console.log("Loaded bookings for duplication check:", response.data);
             } catch (error) {
@@ -78,7 +78,7 @@ export const Speakers: React.FC = () => {
             // 2. Update Global State
             // If backend returns the created booking, append it. Otherwise fetch list.
             try {
-                const updatedList = await bookingsAPI.list();
+                const updatedList = await bookingsAPI.listAll();
                 setBookings(updatedList.data);
             } catch (e) {
                 // Fallback: Optimistic update if list fetch fails
@@ -95,8 +95,13 @@ export const Speakers: React.FC = () => {
 
             alert(`✅ Request Sent! \nYour advisory session with ${selectedSpeaker.name} has been requested.`);
             closeBookingModal();
-        } catch (error) {
+        } catch (error: any) {
             console.error(error);
+            if (error.response?.status === 409) {
+                // Slot overlaps an existing session of this speaker
+                alert(`⚠️ ${error.response.data.detail}`);
+                return;
+            }
             alert("❌ Failed to request advisory. Please check your login status.");
         }
     };
@@ -123,11 +123,31 @@ export const authAPI = {
     getMe: () => api.get('/users/me'),
 };
 
+// Follows X-Next-Cursor until the last page; resolves like a single response ({ data: all rows })
+const getAllPages = async (url: string, params: Record<string, any> = {}) => {
+    const data: any[] = [];
+    let cursor: string | undefined;
+    do {
+        const response = await api.get(url, { params: { ...params, ...(cursor ? { cursor } : {}) } });
+        data.push(...response.data);
+        cursor = response.headers['x-next-cursor'];
+    } while (cursor);
+    return { data };
+};
+
 export const bookingsAPI = {
     create: (data: { speaker_id: number; booking_time: string; notes?: string }) =>
         api.post('/bookings', data),
-    list: () => api.get('/bookings'),
+    // Keyset pages: the X-Next-Cursor response header is the `cursor` of the next page
+    list: (params?: { speaker_id?: number; date_from?: string; date_to?: string; status?: string; mine?: boolean; cursor?: string; limit?: number }) =>
+        api.get('/bookings', { params }),
+    // Every matching booking, across all pages
+    listAll: (params?: { speaker_id?: number; date_from?: string; date_to?: string; status?: string; mine?: boolean }) =>
+        getAllPages('/bookings', params),
     delete: (id: number) => api.delete(`/bookings/${id}`),
+    // Free windows per speaker; speaker_ids omitted = all active speakers
+    availability: (params: { date_from: string; date_to: string; speaker_id?: number[]; min_minutes?: number }) =>
+        api.get('/bookings/availability', { params, paramsSerializer: { indexes: null } }),
 };
 
 export const speakersAPI = {
@@ -138,8 +158,46 @@ export const chatAPI = {
     sendMessage: (data: { speaker_id: string; message: string; conversation_id?: string }) =>
         api.post('/advisory/chat', data),
 
-    getConversation: (conversationId: string) =>
-        api.get(`/advisory/conversations/${conversationId}`),
+    // latest: newest N messages; after / before: message-id cursors (keyset pages)
+    getConversation: (
+        conversationId: string,
+        params?: { latest?: number; limit?: number; after?: string; before?: string; include_sources?: boolean },
+    ) => api.get(`/advisory/conversations/${conversationId}`, { params }),
+
+    // SSE stream: onEvent('sources' | 'token' | 'done' | 'error', payload); 'error' ends a failed answer
+    streamMessage: async (
+        data: { speaker_id: string; message: string; conversation_id?: string },
+        onEvent: (event: string, payload: any) => void,
+    ) => {
+        const token = localStorage.getItem('accessToken');
+        const response = await fetch(`${API_BASE_URL}/advisory/chat/stream`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                ...(token ? { Authorization: `Bearer ${token}` } : {}),
+            },
+            body: JSON.stringify(data),
+        });
+        if (!response.ok || !response.body) {
+            throw new Error(`Stream failed: ${response.status}`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            const frames = buffer.split('\n\n');
+            buffer = frames.pop() || '';
+            for (const frame of frames) {
+                const event = frame.match(/^event: (.*)$/m)?.[1];
+                const payload = frame.match(/^data: (.*)$/m)?.[1];
+                if (event && payload) onEvent(event, JSON.parse(payload));
+            }
+        }
+    },
 };
 
 export const briefingAPI = {
@@ -160,7 +218,7 @@ export const adminAPI = {
     getUsers: () => api.get('/users'),
     createUser: (data: any) => api.post('/users', data),
     deleteUser: (id: number) => api.delete(`/users/${id}`),
-    getAllBookings: () => api.get('/bookings/all'),
+    getAllBookings: () => getAllPages('/bookings/all'),
     deleteBooking: (id: number) => api.delete(`/bookings/admin/${id}`),
 };
 
@@ -0,0 +1,105 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from qdrant_client import grpc
+from qdrant_client.http import models
+from qdrant_client.conversions.conversion import RestToGrpc
+from ai_engine.database.connector import create_qdrant_client
+from ai_engine.database.collections import EMBEDDING_DIM
+
+def make_points(count: int, dim: int, start: int = 0):
+    rng = random.Random(42 + start)
+    return [
+        models.PointStruct(
+            id=start + i,
+            vector=[rng.uniform(-1, 1) for _ in range(dim)],
+            payload={"chunk_text": f"bench chunk {start + i} " + "가나다라" * 50, "speaker_name": f"speaker_{i % 3}"}
+        )
+        for i in range(count)
+    ]
+
+def payload_sizes(points, collection_name: str):
+    """Bytes on the wire for one upsert body: REST JSON vs gRPC protobuf"""
+    rest_body = json.dumps({"points": [p.model_dump(exclude_none=True) for p in points]}).encode("utf-8")
+    grpc_body = grpc.UpsertPoints(
+        collection_name=collection_name,
+        points=[RestToGrpc.convert_point_struct(p) for p in points]
+    ).ByteSize()
+    return len(rest_body), grpc_body
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+def bench_transport(prefer_grpc: bool, args):
+    label = "gRPC" if prefer_grpc else "REST"
+    client = create_qdrant_client(prefer_grpc=prefer_grpc)
+    collection_name = f"bench_transport_{label.lower()}"
+
+    if client.collection_exists(collection_name):
+        client.delete_collection(collection_name)
+    client.create_collection(
+        collection_name=collection_name,
+        vectors_config=models.VectorParams(size=args.dim, distance=models.Distance.COSINE)
+    )
+
+    try:
+        # Bulk upsert
+        upsert_times = []
+        for start in range(0, args.points, args.batch):
+            batch = make_points(min(args.batch, args.points - start), args.dim, start)
+            t0 = time.perf_counter()
+            client.upsert(collection_name=collection_name, points=batch, wait=True)
+            upsert_times.append(time.perf_counter() - t0)
+
+        # Filtered search
+        rng = random.Random(7)
+        search_times = []
+        for i in range(args.queries):
+            vector = [rng.uniform(-1, 1) for _ in range(args.dim)]
+            t0 = time.perf_counter()
+            client.search(
+                collection_name=collection_name,
+                query_vector=vector,
+                query_filter=models.Filter(must=[models.FieldCondition(
+                    key="speaker_name", match=models.MatchValue(value=f"speaker_{i % 3}")
+                )]),
+                limit=5
+            )
+            search_times.append(time.perf_counter() - t0)
+    finally:
+        client.delete_collection(collection_name)
+        client.close()
+
+    total_upsert = sum(upsert_times)
+    print(f"\n--- {label} ---")
+    print(f"Upsert: {args.points} points in {total_upsert:.2f}s ({args.points / total_upsert:.0f} pts/s)")
+    print(f"Search: p50 {statistics.median(search_times) * 1000:.1f} ms, "
+          f"p95 {percentile(search_times, 0.95) * 1000:.1f} ms over {args.queries} queries")
+    return total_upsert, search_times
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare Qdrant REST vs gRPC for bulk upsert and search")
+    parser.add_argument("--points", type=int, default=1000, help="Points to upsert")
+    parser.add_argument("--batch", type=int, default=64, help="Upsert batch size")
+    parser.add_argument("--queries", type=int, default=200, help="Searches to run")
+    parser.add_argument("--dim", type=int, default=EMBEDDING_DIM, help="Vector dimension")
+    args = parser.parse_args()
+
+    rest_bytes, grpc_bytes = payload_sizes(make_points(args.batch, args.dim), "bench")
+    print(f"Upsert body for {args.batch} x {args.dim}-d points: "
+          f"REST/JSON {rest_bytes / 1024:.0f} KB vs gRPC {grpc_bytes / 1024:.0f} KB "
+          f"({rest_bytes / grpc_bytes:.1f}x)")
+
+    rest = bench_transport(False, args)
+    grpc_result = bench_transport(True, args)
+    print(f"\nUpsert speedup (REST/gRPC): {rest[0] / grpc_result[0]:.2f}x")
+    print(f"Search p50 speedup (REST/gRPC): {statistics.median(rest[1]) / statistics.median(grpc_result[1]):.2f}x")
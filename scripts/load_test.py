@@ -0,0 +1,242 @@
+"""
+Offline load test of the full stack: FastAPI + LangGraph + hybrid retrieval,
+with fake Upstage chat/embeddings (simulated latency), embedded in-memory
+Qdrant and a throwaway SQLite database. No network or API keys needed.
+
+    python scripts/load_test.py --endpoint chat --requests 200 --concurrency 20
+    python scripts/load_test.py --endpoint stream --llm-latency lognormal:2500:0.4
+    python scripts/load_test.py --endpoint all --cache
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+import tempfile
+import threading
+import statistics
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# Add project root to path
+sys.path.append(str(PROJECT_ROOT))
+
+# Resolved from the project root so the script runs from any working directory
+PERSONA_KB = {
+    "박태웅": PROJECT_ROOT / "data" / "personas" / "park_kb.json",
+    "한상기": PROJECT_ROOT / "data" / "personas" / "han_kb.json",
+    "윤대균": PROJECT_ROOT / "data" / "personas" / "yoon_kb.json",
+}
+
+# A debate runs as a background task; poll its conversation until the moderator concludes
+ROUND_TABLE_POLL_INTERVAL = 0.5
+ROUND_TABLE_DONE_MARKERS = ("Strategic Conclusion", "Moderator Synthesis")
+ROUND_TABLE_FAILED_MARKER = "The session was interrupted"
+
+QUESTIONS = [
+    "AI 주권이 뭐야?",
+    "생성형 AI가 국내 반도체 산업에 미치는 영향과 우리 회사의 대응 전략을 분석해 주세요.",
+    "거대언어모델의 규모의 법칙은 무엇인가요?",
+    "EU AI법과 한국 AI 기본법을 비교하면? 그리고 리스크는?",
+    "플랫폼 경제에서 데이터 주권은 왜 중요한가요?",
+    "AI 안전과 신뢰성을 위해 이사회가 점검해야 할 것은?",
+]
+
+def configure_environment(args, workdir: str):
+    """Must run before any backend / ai_engine import"""
+    os.environ.update({
+        "AI_FAKE_BACKENDS": "1",
+        "UPSTAGE_API_KEY": os.getenv("UPSTAGE_API_KEY", "offline"),
+        "QDRANT_URL": ":memory:",
+        "NEO4J_URI": "disabled",
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'loadtest.db')}",
+        "SPARSE_INDEX_DIR": os.path.join(workdir, "sparse_index"),
+        "LOCAL_VECTOR_INDEX_DIR": os.path.join(workdir, "local_vector_index"),
+        "RESPONSE_CACHE_BACKEND": "memory" if args.cache else "off",
+        "BRIEFING_WEB_SEARCH": "0",
+        "FAKE_LLM_RESPONSE_CHARS": str(args.response_chars),
+        "HF_HUB_OFFLINE": "1",
+    })
+    if args.llm_latency:
+        os.environ["FAKE_LLM_LATENCY_MS"] = args.llm_latency
+    if args.embedding_latency:
+        os.environ["FAKE_EMBEDDING_LATENCY_MS"] = args.embedding_latency
+
+def seed_knowledge_base():
+    """Chunk, embed (fake) and index the persona KBs into in-memory Qdrant + BM25"""
+    from qdrant_client.http import models
+    from langchain_core.documents import Document
+    from ai_engine.data_collection.chunker import ContentChunker
+    from ai_engine.database.connector import get_qdrant_client, get_embeddings
+    from ai_engine.database.collections import SPEAKER_COLLECTION, ensure_collection
+    from ai_engine.rag.sparse_index import SparseIndex
+
+    client = get_qdrant_client()
+    ensure_collection(client, SPEAKER_COLLECTION)
+    embeddings = get_embeddings("solar-embedding-1-large")
+    sparse_index = SparseIndex()
+
+    points = []
+    for speaker_name, path in PERSONA_KB.items():
+        with open(path, "r", encoding="utf-8") as f:
+            items = json.load(f)
+        source = str(path.relative_to(PROJECT_ROOT))
+        docs = [Document(page_content=item["content"], metadata={"source": source}) for item in items if item.get("content")]
+        chunks = ContentChunker().chunk_documents(docs)
+        vectors = embeddings.embed_documents([chunk.page_content for chunk in chunks])
+        for i, (chunk, vector) in enumerate(zip(chunks, vectors)):
+            points.append(models.PointStruct(
+                id=str(uuid.uuid4()),
+                vector=vector,
+                payload={"source": source, "chunk_text": chunk.page_content, "chunk_index": i, "speaker_name": speaker_name}
+            ))
+
+    client.upsert(collection_name=SPEAKER_COLLECTION, points=points)
+    sparse_index.add_documents([p.payload for p in points])
+    sparse_index.save()
+    print(f"[LoadTest] Seeded {len(points)} chunks for {len(PERSONA_KB)} speakers")
+
+def start_server(port: int):
+    import uvicorn
+    from backend.main import app
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True, name="uvicorn")
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError(f"Server failed to start on port {port} (in use? try --port)")
+        time.sleep(0.05)
+    return server, thread
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+async def login(client) -> dict:
+    response = await client.post(
+        "/api/v1/auth/login",
+        data={"username": "admin@boardroomclub.com", "password": "admin123"}
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+async def chat_once(client, headers, rng):
+    payload = {"speaker_id": rng.choice([1, 2, 3]), "message": rng.choice(QUESTIONS)}
+    start = time.perf_counter()
+    response = await client.post("/api/v1/advisory/chat", json=payload, headers=headers)
+    response.raise_for_status()
+    return time.perf_counter() - start, None
+
+async def stream_once(client, headers, rng):
+    payload = {"speaker_id": rng.choice([1, 2, 3]), "message": rng.choice(QUESTIONS)}
+    start = time.perf_counter()
+    first_token = None
+    async with client.stream("POST", "/api/v1/advisory/chat/stream", json=payload, headers=headers) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if first_token is None and line.startswith("event: token"):
+                first_token = time.perf_counter() - start
+    return time.perf_counter() - start, first_token
+
+async def round_table_once(client, headers, rng):
+    """Time from starting a debate until its conclusion is saved (as RoundTable.tsx polls for it)"""
+    payload = {"topic": rng.choice(QUESTIONS), "speaker_id_1": 1, "speaker_id_2": 3}
+    start = time.perf_counter()
+    response = await client.post("/api/v1/advisory/round-table", json=payload, headers=headers)
+    response.raise_for_status()
+    conversation_id = response.json()["conversation_id"]
+
+    deadline = start + client.timeout.read
+    while time.perf_counter() < deadline:
+        await asyncio.sleep(ROUND_TABLE_POLL_INTERVAL)
+        response = await client.get(
+            f"/api/v1/advisory/conversations/{conversation_id}", params={"latest": 2}, headers=headers
+        )
+        response.raise_for_status()
+        contents = [m["content"] for m in response.json()["messages"] if m["role"] == "assistant"]
+        if any(marker in content for content in contents for marker in ROUND_TABLE_DONE_MARKERS):
+            return time.perf_counter() - start, None
+        if any(ROUND_TABLE_FAILED_MARKER in content for content in contents):
+            raise RuntimeError(f"Debate {conversation_id} was interrupted")
+    raise TimeoutError(f"Debate {conversation_id} did not conclude within {client.timeout.read:.0f}s")
+
+async def briefing_once(client, headers, rng):
+    start = time.perf_counter()
+    response = await client.get("/api/v1/briefings/today", headers=headers)
+    response.raise_for_status()
+    return time.perf_counter() - start, None
+
+SCENARIOS = {
+    "chat": chat_once,
+    "stream": stream_once,
+    "round-table": round_table_once,
+    "briefing": briefing_once,
+}
+
+async def run_scenario(name, base_url, args):
+    import httpx
+
+    rng = random.Random(args.seed)
+    latencies, first_tokens, errors = [], [], 0
+    semaphore = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        headers = await login(client)
+        await client.post("/api/v1/speakers/cleanup", headers=headers)
+
+        async def one():
+            nonlocal errors
+            async with semaphore:
+                try:
+                    latency, first_token = await SCENARIOS[name](client, headers, rng)
+                    latencies.append(latency)
+                    if first_token is not None:
+                        first_tokens.append(first_token)
+                except Exception as e:
+                    errors += 1
+                    print(f"[LoadTest] {name} request failed: {e!r}")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(args.requests)))
+        elapsed = time.perf_counter() - start
+
+    print(f"\n--- {name}: {args.requests} requests, concurrency {args.concurrency} ---")
+    if latencies:
+        print(f"Throughput: {len(latencies) / elapsed:.1f} req/s over {elapsed:.1f}s, errors {errors}")
+        print(f"Latency: p50 {statistics.median(latencies) * 1000:.0f} ms, "
+              f"p95 {percentile(latencies, 0.95) * 1000:.0f} ms, max {max(latencies) * 1000:.0f} ms")
+    if first_tokens:
+        print(f"First token: p50 {statistics.median(first_tokens) * 1000:.0f} ms, "
+              f"p95 {percentile(first_tokens, 0.95) * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline load test with fake Upstage backends and in-memory Qdrant")
+    parser.add_argument("--endpoint", choices=list(SCENARIOS) + ["all"], default="chat")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=20, help="Requests in flight")
+    parser.add_argument("--llm-latency", type=str, default=None, help="e.g. lognormal:2500:0.4 (ms; default per model)")
+    parser.add_argument("--embedding-latency", type=str, default=None, help="e.g. uniform:60:150 (ms)")
+    parser.add_argument("--response-chars", type=int, default=600, help="Length of fake completions")
+    parser.add_argument("--cache", action="store_true", help="Enable the semantic response cache (in-memory)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="kankl_loadtest_")
+    configure_environment(args, workdir)
+    seed_knowledge_base()
+    server, _ = start_server(args.port)
+
+    try:
+        names = list(SCENARIOS) if args.endpoint == "all" else [args.endpoint]
+        for name in names:
+            asyncio.run(run_scenario(name, f"http://127.0.0.1:{args.port}", args))
+    finally:
+        server.should_exit = True
@@ -0,0 +1,55 @@
+import os
+import tempfile
+
+# Throwaway database and offline AI backends; must be set before importing the app
+workdir = tempfile.mkdtemp(prefix="kankl_booking_test_")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'bookings.db')}",
+    "UPSTAGE_API_KEY": os.getenv("UPSTAGE_API_KEY", "offline"),
+    "AI_FAKE_BACKENDS": "1",
+    "QDRANT_URL": ":memory:",
+    "NEO4J_URI": "disabled",
+    "RESPONSE_CACHE_BACKEND": "off",
+})
+
+from fastapi.testclient import TestClient
+from backend.main import app
+
+def check(response, expected, label):
+    print(f"{label}: {response.status_code}")
+    if response.status_code != expected:
+        print(f"Expected {expected}: {response.text}")
+        exit(1)
+    return response.json()
+
+with TestClient(app) as client:
+    print("Logging in as Admin...")
+    res = client.post("/api/v1/auth/login", data={"username": "admin@boardroomclub.com", "password": "admin123"})
+    headers = {"Authorization": f"Bearer {check(res, 200, 'Login')['access_token']}"}
+    client.post("/api/v1/speakers/cleanup", headers=headers)
+
+    # 2026-10-20 10:00 KST is 01:00 UTC
+    booking = {"speaker_id": 1, "booking_time": "2026-10-20T10:00:00+09:00"}
+    first = check(client.post("/api/v1/bookings/", json=booking, headers=headers), 200, "Aware booking")
+    if not first["booking_time"].startswith("2026-10-20T01:00:00"):
+        print(f"Booking time not stored as UTC: {first['booking_time']}")
+        exit(1)
+
+    check(client.post("/api/v1/bookings/", json=booking, headers=headers), 409, "Same aware booking again")
+    check(client.post("/api/v1/bookings/", json={"speaker_id": 1, "booking_time": "2026-10-20T01:30:00Z"},
+                      headers=headers), 409, "Overlapping UTC booking")
+    check(client.post("/api/v1/bookings/", json={"speaker_id": 1, "booking_time": "2026-10-20T01:30:00"},
+                      headers=headers), 409, "Overlapping naive booking")
+    # The KST wall-clock time read as UTC is nine hours later, and free
+    check(client.post("/api/v1/bookings/", json={"speaker_id": 1, "booking_time": "2026-10-20T10:30:00"},
+                      headers=headers), 200, "Naive booking nine hours later")
+
+    res = client.get("/api/v1/bookings/availability", headers=headers, params={
+        "date_from": "2026-10-20T00:00:00Z", "date_to": "2026-10-21T00:00:00Z", "speaker_id": 1
+    })
+    free = check(res, 200, "Availability")["speakers"][0]["free"]
+    if any(w["start"] < "2026-10-20T02:00:00" and w["end"] > "2026-10-20T01:00:00" for w in free):
+        print(f"Booked hour reported as free: {free}")
+        exit(1)
+
+print("Booking conflict checks passed!")